@@ -0,0 +1,475 @@
+"""Many independent headless matches stepped in lockstep, for training bots.
+
+BatchEnv keeps K matches' player state in (players, K) NumPy arrays and each match's
+holes and platforms in padded (K, rects) arrays, then advances every match with one
+step() call. Player slots are processed one after another, each as a single batch over
+all K matches, which keeps Player.update's order of attacks: player i sees earlier
+players' new state and later players' old state. Seeded the same way, every match
+follows the scalar Match tick for tick; `python batchenv.py verify` checks that.
+
+The interface follows the Gym vector-environment conventions without depending on Gym:
+
+    env = BatchEnv(num_envs=1024, num_players=2, seed=0)
+    observations, info = env.reset()
+    observations, rewards, terminated, truncated, info = env.step(actions)  # actions: (K, players, 6) bools
+
+A finished round pays 1 to its winner, and that match moves straight on to the next
+round (the round-end countdown only exists for people watching), so the observations
+returned alongside terminated or truncated are already the new round's. Observation
+arrays are reused between steps; copy them to keep them.
+
+Terrain layouts are pure Python and cost about 0.35 ms each; at K=4096 about 30 matches
+morph or start a round every step, so they are still the largest single cost of a step.
+
+    python batchenv.py verify --envs 8 --players 2 3 --frames 3000
+    python batchenv.py bench --envs 64 256 1024 4096
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from dreamrunner import (ACTIONS, HEIGHT, WIDTH, Match, ScriptedInput, TerrainSystem, make_rng, spawn_positions,
+                         stream_key)
+from dreamrunner.constants import MAX_ROUND_TICKS  # Rounds running this long are cut off as truncated
+from dreamrunner.constants import PUNCH_RANGE, TAG_RANGE, THROW_RANGE
+from swarm import (GRAVITY, JUMP, JUMP_POWER, LEFT, PLAYER_HEIGHT, PLAYER_WIDTH, PUNCH, PUNCH_COOLDOWN,
+                   PUNCH_FORCE, RIGHT, SPEED, STUN_DURATION, TAG, TAG_COOLDOWN, THROW, THROW_COOLDOWN,
+                   THROW_FORCE_X, THROW_FORCE_Y)
+
+# Morph timing, read from a default TerrainSystem so both paths share one source
+_DEFAULTS = TerrainSystem(2, make_rng(0, 'defaults'))
+BASE_MORPH_INTERVAL = _DEFAULTS.base_morph_interval
+MORPH_DURATION = _DEFAULTS.morph_duration
+del _DEFAULTS
+
+# Terrain observations: a coarse grid of the stage, one byte per cell
+GRID_CELL = 40
+GRID_ROWS = HEIGHT // GRID_CELL
+GRID_COLUMNS = WIDTH // GRID_CELL
+EMPTY, PLATFORM, HOLE = 0, 1, 2
+
+# Per-player observation features, each scaled to roughly [-1, 1]
+PLAYER_FEATURES = ('x', 'y', 'vel_x', 'vel_y', 'on_ground', 'is_dead', 'is_stunned',
+                   'tag_cooldown', 'punch_cooldown', 'throw_cooldown')
+VELOCITY_SCALE = 20.0
+
+class BatchEnv:
+    """K independent matches with the same player count, advanced together"""
+
+    def __init__(self, num_envs, num_players=2, seed=0, max_round_ticks=MAX_ROUND_TICKS):
+        self.num_envs = num_envs
+        self.num_players = num_players
+        self.max_round_ticks = max_round_ticks  # Same limit as Match.max_round_ticks; None lets rounds run forever
+        self.seed(seed)
+
+        shape = (num_players, num_envs)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.vel_x = np.zeros(shape)
+        self.vel_y = np.zeros(shape)
+        self.on_ground = np.zeros(shape, dtype=bool)
+        self.is_dead = np.zeros(shape, dtype=bool)
+        self.death_timer = np.zeros(shape, dtype=np.int64)
+        self.is_stunned = np.zeros(shape, dtype=bool)
+        self.stun_timer = np.zeros(shape, dtype=np.int64)
+        self.tag_cooldown = np.zeros(shape, dtype=np.int64)
+        self.punch_cooldown = np.zeros(shape, dtype=np.int64)
+        self.throw_cooldown = np.zeros(shape, dtype=np.int64)
+
+        # Match and TerrainSystem bookkeeping, one entry per match
+        self.round_index = np.zeros(num_envs, dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.wins = np.zeros((num_envs, num_players), dtype=np.int64)
+        self.morph_timer = np.zeros(num_envs, dtype=np.int64)
+        self.morph_interval = np.full(num_envs, BASE_MORPH_INTERVAL, dtype=np.int64)
+        self.is_morphing = np.zeros(num_envs, dtype=bool)
+        self.morph_progress = np.zeros(num_envs, dtype=np.int64)
+        # TerrainSystem objects only generate layouts; the arrays below are what the physics reads
+        self.terrains = [None] * num_envs
+        self.hole_count = 0
+        self.platform_count = 0
+        self.allocate_terrain(5, 9)
+
+        self.player_obs = np.zeros((num_envs, num_players, len(PLAYER_FEATURES)), dtype=np.float32)
+        self.morph_obs = np.zeros((num_envs, 2), dtype=np.float32)
+        self.grid = np.zeros((num_envs, GRID_ROWS, GRID_COLUMNS), dtype=np.uint8)
+
+    def seed(self, seed):
+        """Derive one match seed per environment; match k plays like Match(seed=self.seeds[k])"""
+        self.seeds = [make_rng(seed, 'batch', k).randrange(2 ** 32) for k in range(self.num_envs)]
+
+    def allocate_terrain(self, holes, platforms):
+        """Padded rect arrays, holes first and then platforms; padding rects overlap nothing"""
+        self.hole_count, self.platform_count = holes, platforms
+        shape = (self.num_envs, holes + platforms)
+        self.rect_left = np.full(shape, np.inf)
+        self.rect_top = np.full(shape, np.inf)
+        self.rect_right = np.full(shape, np.inf)
+        self.rect_bottom = np.full(shape, np.inf)
+        self.hole_left, self.platform_left = self.rect_left[:, :holes], self.rect_left[:, holes:]
+        self.hole_top, self.platform_top = self.rect_top[:, :holes], self.rect_top[:, holes:]
+        self.hole_right, self.platform_right = self.rect_right[:, :holes], self.rect_right[:, holes:]
+        self.platform_bottom = self.rect_bottom[:, holes:]
+        # cuts[k, h, p]: in match k, hole h removes part of platform p
+        self.cuts = np.zeros((self.num_envs, holes, platforms), dtype=bool)
+        for k, terrain in enumerate(self.terrains):
+            if terrain is not None:
+                self.load_terrain(k)
+
+    def load_terrain(self, k):
+        """Copy match k's TerrainSystem geometry into the arrays and the observation grid"""
+        terrain = self.terrains[k]
+        holes, platforms = terrain.holes, terrain.platforms
+        if len(holes) > self.hole_count or len(platforms) > self.platform_count:
+            self.allocate_terrain(max(len(holes), self.hole_count), max(len(platforms), self.platform_count))
+            return
+        platform_rects, hole_rects = terrain.geometry()
+        padding = (np.inf, np.inf, 0, 0)  # Its edges all come out infinite
+        rects = np.array(hole_rects + (padding,) * (self.hole_count - len(holes))
+                         + platform_rects + (padding,) * (self.platform_count - len(platforms)), dtype=np.float64)
+        self.rect_left[k], self.rect_top[k] = rects[:, 0], rects[:, 1]
+        self.rect_right[k], self.rect_bottom[k] = rects[:, 0] + rects[:, 2], rects[:, 1] + rects[:, 3]
+        self.cuts[k] = False
+        for h, hole in enumerate(holes):
+            self.cuts[k, h, :len(platforms)] = [hole.x < platform.right and hole.right > platform.x
+                                                and hole.y == platform.y for platform in platforms]
+
+        grid = self.grid[k]
+        grid[:] = EMPTY
+        for rects, value in ((platforms, PLATFORM), (holes, HOLE)):
+            for rect in rects:
+                grid[rect.top // GRID_CELL:-(-rect.bottom // GRID_CELL),
+                     rect.left // GRID_CELL:-(-rect.right // GRID_CELL)] = value
+
+    def reset(self, seed=None):
+        """Start every match from its first round; returns (observations, info)"""
+        if seed is not None:
+            self.seed(seed)
+        self.round_index[:] = 0
+        self.wins[:] = 0
+        self.next_round(np.arange(self.num_envs))
+        return self.observe(), {}
+
+    def next_round(self, envs):
+        """Match.init_game for the given matches: players back at the spawn points, fresh terrain"""
+        self.round_index[envs] += 1
+        self.x[:, envs] = np.array(spawn_positions(self.num_players), dtype=np.float64)[:, None]
+        self.y[:, envs] = HEIGHT - 150
+        for field in (self.vel_x, self.vel_y, self.on_ground, self.is_dead, self.death_timer, self.is_stunned,
+                      self.stun_timer, self.tag_cooldown, self.punch_cooldown, self.throw_cooldown):
+            field[:, envs] = 0
+        self.score[envs] = 0
+        self.morph_timer[envs] = 0
+        self.morph_interval[envs] = BASE_MORPH_INTERVAL
+        self.is_morphing[envs] = False
+        self.morph_progress[envs] = 0
+        for k in envs.tolist():
+            rng = make_rng(self.seeds[k], 'terrain', self.round_index[k].item())  # As Match.init_game seeds it
+            self.terrains[k] = TerrainSystem(self.num_players, rng)
+            self.load_terrain(k)
+
+    def attach_telemetry(self, telemetry):
+        raise NotImplementedError("BatchEnv does not record telemetry; run the match as a Match or SwarmGame instead")
+
+    def step(self, actions):
+        """Advance every match one tick; actions is a (K, players, 6) array of ACTIONS bits.
+
+        Returns (observations, rewards, terminated, truncated, info). info["winner"] is the
+        winning slot of each match whose round ended this tick, or -1.
+        """
+        actions = np.asarray(actions, dtype=bool).transpose(1, 2, 0)  # (players, 6, K)
+        self.update_terrain()
+        for index in range(self.num_players):
+            self.update_player(index, actions[index])
+
+        # Match.update's round logic; finished matches skip the round-end countdown
+        alive = ~self.is_dead
+        alive_count = alive.sum(axis=0)
+        terminated = alive_count <= 1
+        winner = np.where(terminated & (alive_count == 1), alive.argmax(axis=0), -1)
+        rewards = np.zeros((self.num_envs, self.num_players), dtype=np.float32)
+        won = np.flatnonzero(winner >= 0)
+        rewards[won, winner[won]] = 1.0
+        self.wins[won, winner[won]] += 1
+        self.score += alive_count > 0
+        if self.max_round_ticks is None:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+        else:
+            # Where Match ends the round as a tie
+            truncated = ~terminated & (self.score >= self.max_round_ticks)
+        finished = np.flatnonzero(terminated | truncated)
+        if len(finished):
+            self.next_round(finished)
+        return self.observe(), rewards, terminated, truncated, {"winner": winner}
+
+    def update_terrain(self):
+        """TerrainSystem.update for every match; only the matches that start a morph run Python code"""
+        morphing = self.is_morphing
+        self.morph_progress += morphing
+        ended = morphing & (self.morph_progress >= MORPH_DURATION)
+        morphing &= ~ended
+        self.morph_progress[ended] = 0
+
+        waiting = ~morphing & ~ended
+        self.morph_timer += waiting
+        difficulty = np.minimum(self.score // 500, 10)
+        np.copyto(self.morph_interval, np.maximum(BASE_MORPH_INTERVAL - difficulty * 20, 60), where=waiting)
+        starting = np.flatnonzero(waiting & (self.morph_timer >= self.morph_interval))
+        if len(starting):
+            morphing[starting] = True
+            self.morph_progress[starting] = 0
+            self.morph_timer[starting] = 0
+            for k in starting.tolist():
+                terrain = self.terrains[k]
+                terrain.morph_terrain(self.x[~self.is_dead[:, k], k].tolist())
+                self.load_terrain(k)
+
+    def update_player(self, index, actions):
+        """Player.update for one slot in every match; actions is a (6, K) bool array"""
+        x, y, vel_x, vel_y = self.x[index], self.y[index], self.vel_x[index], self.vel_y[index]
+        is_stunned, stun_timer = self.is_stunned[index], self.stun_timer[index]
+        dead = self.is_dead[index].copy()
+        alive = ~dead
+        self.death_timer[index] += dead
+
+        stunned = alive & is_stunned
+        stun_timer += stunned
+        recovered = stunned & (stun_timer >= STUN_DURATION)
+        is_stunned &= ~recovered
+        stun_timer[recovered] = 0
+        for cooldown in (self.tag_cooldown[index], self.punch_cooldown[index], self.throw_cooldown[index]):
+            cooldown -= alive & (cooldown > 0)
+
+        controlled = alive & ~self.is_morphing & ~is_stunned
+        if self.num_players > 1 and (controlled & actions[TAG:].any(axis=0)).any():
+            self.attack(index, actions, controlled)
+
+        moving = np.where(actions[LEFT], -SPEED, np.where(actions[RIGHT], SPEED, vel_x * 0.8))
+        np.copyto(vel_x, np.where(controlled, moving, np.where(alive, vel_x * 0.9, vel_x)))
+        np.copyto(vel_y, JUMP_POWER, where=controlled & actions[JUMP] & self.on_ground[index])
+
+        vel_y += np.where(dead, GRAVITY * 0.5, GRAVITY)
+        start_x, start_y = x.copy(), y.copy()
+        x += np.where(alive, vel_x, 0.0)
+        y += vel_y
+        np.maximum(x, 0.0, out=x)
+        np.minimum(x, float(WIDTH - PLAYER_WIDTH), out=x)
+        self.on_ground[index] &= dead
+        self.collide(index, alive, start_x, start_y)
+
+        # Player.die: the spin is the first draw from the player's round RNG. Only that draw is needed,
+        # so it comes from a plain Random on the same key rather than a snapshotting SimRandom
+        round_index = self.round_index
+        for k in np.flatnonzero(alive & self.is_dead[index]).tolist():
+            rng = random.Random(stream_key(self.seeds[k], 'player', round_index[k].item(), index))
+            self.death_timer[index, k] = 0
+            vel_x[k] = rng.randint(-5, 5)
+            vel_y[k] = -8
+
+    def attack(self, index, actions, controlled):
+        """Player.try_tag/try_punch/try_throw from slot index against every other slot, in slot order"""
+        others = [other for other in range(self.num_players) if other != index]
+
+        tagging = controlled & actions[TAG] & (self.tag_cooldown[index] == 0)
+        if tagging.any():
+            for other in others:
+                for k, _ in self.in_range(index, other, tagging & ~self.is_stunned[other], TAG_RANGE):
+                    self.is_stunned[other, k] = True
+                    self.stun_timer[other, k] = 0
+                    self.tag_cooldown[index, k] = TAG_COOLDOWN
+
+        punching = controlled & actions[PUNCH] & (self.punch_cooldown[index] == 0)
+        if punching.any():
+            for other in others:
+                for k, distance_sq in self.in_range(index, other, punching, PUNCH_RANGE):
+                    dx = self.x[other, k].item() - self.x[index, k].item()
+                    dy = self.y[other, k].item() - self.y[index, k].item()
+                    distance = distance_sq ** 0.5
+                    if distance > 0:
+                        dx /= distance
+                        dy /= distance
+                    self.vel_x[other, k] += dx * PUNCH_FORCE
+                    self.vel_y[other, k] += dy * PUNCH_FORCE - 3
+                    self.punch_cooldown[index, k] = PUNCH_COOLDOWN
+
+        throwing = controlled & actions[THROW] & (self.throw_cooldown[index] == 0)
+        if throwing.any():
+            for other in others:
+                for k, _ in self.in_range(index, other, throwing, THROW_RANGE):
+                    dx = WIDTH // 2 - self.x[other, k].item()
+                    dy = HEIGHT // 2 - self.y[other, k].item()
+                    center_distance = (dx ** 2 + dy ** 2) ** 0.5
+                    if center_distance > 0:
+                        dx /= center_distance
+                        dy /= center_distance
+                    self.vel_x[other, k] = dx * THROW_FORCE_X
+                    self.vel_y[other, k] = dy * THROW_FORCE_X + THROW_FORCE_Y
+                    self.on_ground[other, k] = False
+                    self.throw_cooldown[index, k] = THROW_COOLDOWN
+
+    def in_range(self, index, other, attacking, radius):
+        """(match, distance_sq) where the living `other` is within radius of the attacking slot.
+
+        NumPy narrows the matches down with a pixel of slack; the few left are measured again
+        with Python floats, because x ** 2 and x ** 0.5 on a Python float go through libm pow
+        and can differ from NumPy's results in the last bit, which would let matches drift.
+        """
+        x, y = self.x, self.y
+        near = attacking & ~self.is_dead[other] & (
+            (x[index] - x[other]) ** 2 + (y[index] - y[other]) ** 2 <= (radius + 1) ** 2)
+        found = []
+        for k in np.flatnonzero(near).tolist():
+            dx = x[index, k].item() - x[other, k].item()
+            dy = y[index, k].item() - y[other, k].item()
+            distance_sq = dx ** 2 + dy ** 2
+            if distance_sq <= radius ** 2:
+                found.append((k, distance_sq))
+        return found
+
+    def collide(self, index, alive, start_x, start_y):
+        """Player.check_terrain_collision for one slot in every match"""
+        x, y, vel_y = self.x[index], self.y[index], self.vel_y[index]
+        holes = self.hole_count
+        left = np.trunc(x)[:, None]
+        columns = (left < self.rect_right) & (left + PLAYER_WIDTH > self.rect_left)
+        over_hole = ((x + PLAYER_WIDTH)[:, None] > self.hole_left) & (x[:, None] < self.hole_right)
+        cut = np.zeros_like(columns[:, holes:])
+        for hole in range(holes):
+            cut |= over_hole[:, hole, None] & self.cuts[:, hole]
+        supported = columns[:, holes:] & ~cut & alive[:, None]
+
+        # Vectorized first_platform_hit; each element goes through the same operations, so times match bit for bit
+        dx, dy = (x - start_x)[:, None], (y - start_y)[:, None]
+        sx, sy = start_x[:, None], start_y[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            toi = np.where(dy > 0, self.platform_top - (sy + PLAYER_HEIGHT), self.platform_bottom - sy) / dy
+            near_x, far_x = (self.platform_left - (sx + PLAYER_WIDTH)) / dx, (self.platform_right - sx) / dx
+            crossing = ((dx > 0) & (near_x <= toi) & (toi < far_x)) | ((dx < 0) & (far_x <= toi) & (toi < near_x))
+            crossing |= (dx == 0) & (sx + PLAYER_WIDTH > self.platform_left) & (sx < self.platform_right)
+            hit = supported & crossing & (toi >= 0) & (toi < 1) & (dy != 0)
+        first = np.where(hit, toi, np.inf).argmin(axis=1)[:, None]
+        swept = hit.any(axis=1)
+        top = np.take_along_axis(self.platform_top, first, axis=1)[:, 0]
+        bottom = np.take_along_axis(self.platform_bottom, first, axis=1)[:, 0]
+        landed = swept & (vel_y > 0)
+        np.copyto(y, top - PLAYER_HEIGHT, where=landed)
+        np.copyto(y, bottom, where=swept & ~landed)
+        np.copyto(vel_y, 0.0, where=swept)
+        on_ground = self.on_ground[index]
+        on_ground |= landed
+
+        row = np.trunc(y)[:, None]
+        overlap = columns & (row < self.rect_bottom) & (row + PLAYER_HEIGHT > self.rect_top)
+        fell = alive & overlap[:, :holes].any(axis=1)
+        solid = overlap[:, holes:] & supported & ~swept[:, None]
+        first = solid.argmax(axis=1)[:, None]
+        top = np.take_along_axis(self.platform_top, first, axis=1)[:, 0]
+        bottom = np.take_along_axis(self.platform_bottom, first, axis=1)[:, 0]
+        resting = ~fell & solid.any(axis=1)
+        falling = resting & (vel_y > 0)
+        rising = resting & (vel_y < 0)
+        np.copyto(y, top - PLAYER_HEIGHT, where=falling)
+        np.copyto(y, bottom, where=rising)
+        np.copyto(vel_y, 0.0, where=falling | rising)
+        on_ground |= falling
+        self.is_dead[index] |= alive & (fell | (y > HEIGHT))
+
+    def observe(self):
+        """Observation arrays: players (K, players, features), terrain (K, rows, columns), morph (K, 2)"""
+        obs = self.player_obs
+        obs[:, :, 0] = self.x.T / WIDTH
+        obs[:, :, 1] = self.y.T / HEIGHT
+        obs[:, :, 2] = self.vel_x.T / VELOCITY_SCALE
+        obs[:, :, 3] = self.vel_y.T / VELOCITY_SCALE
+        obs[:, :, 4] = self.on_ground.T
+        obs[:, :, 5] = self.is_dead.T
+        obs[:, :, 6] = self.is_stunned.T
+        obs[:, :, 7] = self.tag_cooldown.T / TAG_COOLDOWN
+        obs[:, :, 8] = self.punch_cooldown.T / PUNCH_COOLDOWN
+        obs[:, :, 9] = self.throw_cooldown.T / THROW_COOLDOWN
+        self.morph_obs[:, 0] = self.is_morphing
+        self.morph_obs[:, 1] = self.morph_timer / self.morph_interval
+        return {"players": obs, "terrain": self.grid, "morph": self.morph_obs}
+
+    def player_state(self, k, index):
+        """Player.state() of one player, for comparisons against the scalar Match"""
+        return (self.x[index, k].item(), self.y[index, k].item(), self.vel_x[index, k].item(),
+                self.vel_y[index, k].item(), self.on_ground[index, k].item(), self.is_dead[index, k].item(),
+                self.death_timer[index, k].item(), self.is_stunned[index, k].item(),
+                self.stun_timer[index, k].item(), self.tag_cooldown[index, k].item(),
+                self.punch_cooldown[index, k].item(), self.throw_cooldown[index, k].item())
+
+def random_actions(seed, frames, num_envs, num_players):
+    """Seeded button mashing: (frames, K, players, 6) bools"""
+    return np.random.default_rng(seed).random((frames, num_envs, num_players, len(ACTIONS))) < 0.4
+
+def verify(num_envs, num_players, frames, seed=0):
+    """Step a BatchEnv and one scalar Match per match side by side; first (frame, match) that differs, or None"""
+    env = BatchEnv(num_envs, num_players, seed)
+    env.reset()
+    actions = random_actions(seed, frames, num_envs, num_players)
+    packed = (actions * (1 << np.arange(len(ACTIONS)))).sum(axis=3)
+    games = []
+    for k in range(num_envs):
+        inputs = [ScriptedInput(packed[:, k, index].tolist()) for index in range(num_players)]
+        game = Match(inputs=inputs, seed=env.seeds[k])
+        game.init_game(num_players, reset_scores=True)
+        games.append(game)
+
+    for frame in range(frames):
+        env.step(actions[frame])
+        for k, game in enumerate(games):
+            game.update()
+            if game.game_over:
+                game.next_round()
+            if (any(player.state() != env.player_state(k, index) for index, player in enumerate(game.players))
+                    or game.terrain.geometry() != env.terrains[k].geometry()
+                    or game.player_scores != env.wins[k].tolist()
+                    or game.score != env.score[k]):
+                return frame, k
+    return None
+
+def benchmark(env_counts, num_players, frames, seed=0):
+    print(f"{'envs':>6} {'players':>8} {'step ms':>9} {'env steps/s':>12}")
+    for num_envs in env_counts:
+        env = BatchEnv(num_envs, num_players, seed)
+        env.reset()
+        actions = random_actions(seed, frames, num_envs, num_players)
+        start = time.perf_counter()
+        for frame in range(frames):
+            env.step(actions[frame])
+        elapsed = time.perf_counter() - start
+        print(f"{num_envs:>6} {num_players:>8} {elapsed / frames * 1000:>9.3f} {num_envs * frames / elapsed:>12,.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched headless matches for bot training")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    verify_parser = subcommands.add_parser("verify", help="check every batched match against the scalar Match")
+    verify_parser.add_argument("--envs", type=int, default=8)
+    verify_parser.add_argument("--players", type=int, nargs="+", default=[2, 3])
+    verify_parser.add_argument("--frames", type=int, default=3000)
+    verify_parser.add_argument("--seed", type=int, default=0)
+    bench_parser = subcommands.add_parser("bench", help="environment steps per second as the batch grows")
+    bench_parser.add_argument("--envs", type=int, nargs="+", default=[64, 256, 1024, 4096])
+    bench_parser.add_argument("--players", type=int, default=2)
+    bench_parser.add_argument("--frames", type=int, default=600)
+    bench_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        failed = False
+        for num_players in args.players:
+            mismatch = verify(args.envs, num_players, args.frames, args.seed)
+            result = "match on every frame" if mismatch is None else "diverge at frame %d in match %d" % mismatch
+            print(f"{args.envs} matches of {num_players} players, seed {args.seed}: batched and scalar {result}")
+            failed = failed or mismatch is not None
+        if failed:
+            sys.exit(1)
+    else:
+        benchmark(args.envs, args.players, args.frames, args.seed)
+
+if __name__ == "__main__":
+    main()
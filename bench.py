@@ -0,0 +1,330 @@
+"""Frame-time benchmarks for the update and draw paths, run under the SDL dummy drivers.
+
+Each scenario drives a windowed Game through scripted frames and times four phases
+separately: the simulation step, the terrain draw, every player sprite and the full
+Game.draw. A second pass under tracemalloc counts the memory blocks each frame
+leaves allocated, from snapshots taken every ALLOC_WINDOW frames, and the KB each
+frame allocates at its peak. Results can be saved as JSON and compared against a baseline.
+The morph scenarios also time the steps that start a morph on their own (morph_step),
+with layouts generated inline in morph-max and taken from a LayoutQueue in morph-queue.
+That queue refills in the rest of each 60 Hz frame, as the frame-cap wait would let it.
+
+    python bench.py
+    python bench.py --scenarios combat-3 morph-max --frames 1200 --json run.json
+    python bench.py --scenarios morph-max morph-queue --frames 2000
+    python bench.py --baseline baseline.json --tolerance 0.2
+    python bench.py --import-time
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Keep the report to results only
+
+import pygame
+
+import dreamrunner
+from dreamrunner import HEIGHT, TICK_SECONDS, ScriptedInput, random_scripts, spawn_positions
+from dreamrunner.app import Game
+from dreamrunner.render import player_sprites
+
+PHASES = ("update", "terrain_draw", "player_draw", "game_draw")
+ALLOC_ROWS = ("alloc_blocks", "alloc_kb")
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+WARMUP_FRAMES = 30  # Skipped in the statistics: terrain baking and first text renders
+ALLOC_WINDOW = 30  # Frames between tracemalloc snapshots; block counts are averaged over each
+IMPORT_RUNS = 5  # The fastest run is compared, since a cold disk cache only ever adds time
+
+def keep_alive(game, frame=None):
+    """Respawn dead players so a scenario never ends its round"""
+    game.game_over = False
+    positions = spawn_positions(game.num_players)
+    for i, player in enumerate(game.players):
+        if player.is_dead:
+            player.is_dead = False
+            player.death_timer = 0
+            player.x, player.y = positions[i], HEIGHT - 150
+            player.vel_x = player.vel_y = 0
+
+def idle_inputs(seed, num_players, frames):
+    return [ScriptedInput() for _ in range(num_players)]
+
+def brawl_inputs(seed, num_players, frames):
+    """Random movement with an attack pressed on most frames"""
+    scripts = random_scripts(seed, num_players, frames)
+    for script in scripts:
+        script.script = [dict(actions, tag=True, punch=True, throw=True) if i % 4 else actions
+                         for i, actions in enumerate(script.script)]
+    return scripts
+
+def huddle(game):
+    """Start everyone within punching range of the middle of the stage"""
+    for i, player in enumerate(game.players):
+        player.x = 560 + 30 * i
+
+def stun_everyone(game, frame):
+    keep_alive(game)
+    for player in game.players:
+        player.is_stunned = True
+        player.stun_timer = frame % 60
+
+def kill_everyone(game, frame):
+    for i, player in enumerate(game.players):
+        player.is_dead = True
+        player.death_timer = frame % 40
+        player.x, player.y, player.vel_y = 300 + 250 * i, 400, 0
+
+def resume_round(game, frame):
+    # The death scenario wants the animations, not the round-end overlay
+    game.game_over = False
+
+def morph_constantly(game, frame):
+    keep_alive(game)
+    game.score = 10000  # Top difficulty: the shortest morph interval
+    if not game.terrain.is_morphing:
+        game.terrain.morph_timer = game.terrain.morph_interval
+
+def hold_game_over(game, frame):
+    game.game_over = True
+    game.winner = "Player 1"
+    game.round_end_timer = 0
+
+class Scenario:
+    def __init__(self, num_players, inputs=idle_inputs, setup=None, before=keep_alive, after=None,
+                 layout_queue=False):
+        self.num_players = num_players
+        self.inputs = inputs
+        self.setup = setup
+        self.before = before  # before(game, frame) runs ahead of each step
+        self.after = after  # after(game, frame) runs between the step and the draws
+        self.layout_queue = layout_queue  # True prepares layouts between frames instead of on the morph step
+
+SCENARIOS = {
+    "idle-2": Scenario(2),
+    "idle-3": Scenario(3),
+    "combat-3": Scenario(3, inputs=brawl_inputs, setup=huddle),
+    "stunned-3": Scenario(3, before=stun_everyone),
+    "death-3": Scenario(3, before=kill_everyone, after=resume_round),
+    "morph-max": Scenario(3, inputs=random_scripts, before=morph_constantly),
+    "morph-queue": Scenario(3, inputs=random_scripts, before=morph_constantly, layout_queue=True),
+    "game-over": Scenario(3, before=hold_game_over),
+}
+
+def make_game(scenario, frames, seed):
+    # No music: the asset loader's thread and messages would only disturb the timings and the report
+    game = Game(inputs=scenario.inputs(seed, scenario.num_players, frames), seed=seed, music=False,
+                layout_queue=scenario.layout_queue)
+    game.init_game(scenario.num_players, reset_scores=True)
+    game.in_start_screen = False
+    if scenario.setup:
+        scenario.setup(game)
+    return game
+
+def run_frames(game, scenario, frames, frame_done):
+    """Step and draw `frames` times, calling frame_done(frame, phase_seconds, morphed) after
+    each; morphed is True when that step started a morph and so took a new layout"""
+    screen = game.screen
+    clock = time.perf_counter
+    for frame in range(frames):
+        if scenario.before:
+            scenario.before(game, frame)
+        terrain, layout_index = game.terrain, game.terrain.layout_index
+        start = clock()
+        game.step()
+        stepped = clock()
+        morphed = game.terrain is terrain and terrain.layout_index != layout_index
+        if scenario.after:
+            scenario.after(game, frame)
+        resumed = clock()
+        game.terrain_renderer.draw(screen, game.terrain)
+        terrain_drawn = clock()
+        for player in game.players:
+            player_sprites.draw(screen, player)
+        players_drawn = clock()
+        game.draw()
+        game_drawn = clock()
+        pygame.display.flip()
+        if game.layouts:
+            # Untimed: a LayoutQueue only refills while the frame cap leaves the loop idle
+            game.layouts.refill(start + TICK_SECONDS)
+        frame_done(frame, (stepped - start, terrain_drawn - resumed,
+                           players_drawn - terrain_drawn, game_drawn - players_drawn), morphed)
+
+def percentiles(values):
+    ordered = sorted(values)
+    return {name: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for name, q in PERCENTILES}
+
+def run_scenario(name, frames, seed):
+    """Per-phase frame time percentiles in milliseconds, plus allocated blocks and KB per frame.
+
+    Scenarios that morph also get morph_step, the update phase of just the steps that
+    started a morph, and layout_misses, the layouts a LayoutQueue had to generate inline.
+    """
+    scenario = SCENARIOS[name]
+    times = {phase: [] for phase in PHASES}
+    morph_times = []
+
+    def record_times(frame, seconds, morphed):
+        if frame >= WARMUP_FRAMES:
+            for phase, value in zip(PHASES, seconds):
+                times[phase].append(value * 1000)
+            if morphed:
+                morph_times.append(seconds[0] * 1000)
+
+    game = make_game(scenario, frames, seed)
+    run_frames(game, scenario, frames, record_times)
+    layouts = game.layouts
+
+    # Tracing slows everything down, so allocations get a pass of their own
+    blocks, allocated = [], []
+    game = make_game(scenario, frames, seed)
+    tracemalloc.start()
+    ignore_tracing = (tracemalloc.Filter(False, tracemalloc.__file__),)
+
+    def record_allocations(frame, seconds, morphed):
+        if frame >= WARMUP_FRAMES:
+            current, peak = tracemalloc.get_traced_memory()
+            allocated.append((peak - record_allocations.start) / 1024)
+            if (frame + 1 - WARMUP_FRAMES) % ALLOC_WINDOW == 0:
+                # Blocks the window's frames left allocated, net of the ones they freed
+                snapshot = tracemalloc.take_snapshot().filter_traces(ignore_tracing)
+                if record_allocations.snapshot is not None:
+                    stats = snapshot.compare_to(record_allocations.snapshot, "filename")
+                    blocks.append(sum(stat.count_diff for stat in stats) / ALLOC_WINDOW)
+                record_allocations.snapshot = snapshot
+        elif frame == WARMUP_FRAMES - 1:
+            record_allocations.snapshot = tracemalloc.take_snapshot().filter_traces(ignore_tracing)
+        tracemalloc.reset_peak()
+        record_allocations.start = tracemalloc.get_traced_memory()[0]
+
+    record_allocations.start = tracemalloc.get_traced_memory()[0]
+    record_allocations.snapshot = None
+    run_frames(game, scenario, frames, record_allocations)
+    tracemalloc.stop()
+
+    result = {phase: percentiles(times[phase]) for phase in PHASES}
+    result["alloc_blocks"] = percentiles(blocks)
+    result["alloc_kb"] = percentiles(allocated)
+    if morph_times:
+        result["morph_step"] = percentiles(morph_times)
+        result["morphs"] = len(morph_times)
+        if layouts is not None:
+            result["layout_misses"] = f"{layouts.misses}/{layouts.taken}"
+    return result
+
+def stat_rows(result):
+    """Phases and other percentile rows present in a result, in report order"""
+    return PHASES + ALLOC_ROWS + (("morph_step",) if "morph_step" in result else ())
+
+def compare(results, baseline, tolerance):
+    """Print p95 changes against a baseline run; returns the regressions beyond tolerance"""
+    regressions = []
+    print(f"\n{'scenario':<11} {'phase':<13} {'base p95':>9} {'now p95':>9} {'change':>8}")
+    for name, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        for phase in stat_rows(result):
+            if phase not in base:
+                continue
+            before, now = base[phase]["p95"], result[phase]["p95"]
+            change = (now - before) / before if before else 0.0
+            flag = ""
+            if change > tolerance:
+                flag = "  more" if phase in ALLOC_ROWS else "  slower"
+                regressions.append((name, phase, change))
+            print(f"{name:<11} {phase:<13} {before:>9.3f} {now:>9.3f} {change:>+7.0%}{flag}")
+    return regressions
+
+def import_time():
+    """Cumulative milliseconds for `import dreamrunner` in a fresh interpreter, and the
+    pygame modules it loaded (there should be none)"""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import dreamrunner"],
+                            capture_output=True, text=True, check=True).stderr
+    total = 0
+    display_modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if name == "dreamrunner":
+            total = int(cumulative) / 1000
+        elif name.split(".")[0] in ("pygame", "numpy"):
+            display_modules.append(name)
+    return total, display_modules
+
+def check_import_time():
+    """Exit with status 1 if the simulation core is over its import budget or loads pygame"""
+    runs = [import_time() for _ in range(IMPORT_RUNS)]
+    best, display_modules = min(runs)
+    budget = dreamrunner.IMPORT_BUDGET_MS
+    print(f"import dreamrunner: {best:.1f} ms (best of {IMPORT_RUNS}), budget {budget} ms")
+    if display_modules:
+        print(f"The simulation core loaded {', '.join(sorted(set(display_modules)))}")
+    if best > budget or display_modules:
+        sys.exit(1)
+    print("Within budget")
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame-time benchmarks for Dream Runner")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=600, help="frames per scenario, warmup included")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="FILE", help="save the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare p95 times against a saved run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="p95 growth over the baseline counted as a regression (0.2 = 20%%)")
+    parser.add_argument("--import-time", action="store_true",
+                        help="check `import dreamrunner` against its import budget instead")
+    args = parser.parse_args()
+    if args.import_time:
+        check_import_time()
+        return
+    if args.frames < WARMUP_FRAMES + 2 * ALLOC_WINDOW:
+        parser.error(f"--frames must be at least {WARMUP_FRAMES + 2 * ALLOC_WINDOW}: "
+                     f"{WARMUP_FRAMES} warmup frames and two allocation windows")
+
+    results = {
+        "frames": args.frames,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "scenarios": {},
+    }
+    print(f"{'scenario':<11} {'phase':<13} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms; blocks and KB per frame for alloc)")
+    for name in args.scenarios:
+        result = run_scenario(name, args.frames, args.seed)
+        results["scenarios"][name] = result
+        for phase in stat_rows(result):
+            stats = result[phase]
+            print(f"{name:<11} {phase:<13} " + " ".join(f"{stats[key]:>8.3f}" for key, _ in PERCENTILES))
+        if "morphs" in result:
+            misses = result.get("layout_misses")
+            print(f"{name:<11} {result['morphs']} morphs timed, "
+                  + (f"{misses} layouts missed the queue" if misses else "layouts generated inline"))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            sys.exit(1)
+        print("No regressions")
+
+if __name__ == "__main__":
+    main()
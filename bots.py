@@ -0,0 +1,171 @@
+"""Scriptable computer players.
+
+A bot is an InputProvider, so it plugs into any Match input slot next to keyboards,
+scripts and replays. Each tick Bot.poll hands act() read-only snapshots of the
+players and the terrain, and act() returns the tick's actions: an actions dict or the
+six action bits packed into an integer (see dreamrunner.pack_actions).
+
+Bots that want randomness should draw from self.rng, which is seeded per match and
+slot, so a seeded match with bots replays identically.
+
+    from bots import Bot
+    class Coward(Bot):
+        def act(self, me, others, terrain):
+            nearest = self.nearest(me, others)
+            return {'left': nearest and nearest.x > me.x, 'right': nearest and nearest.x < me.x}
+
+Bots are named in BOTS, or loaded from "module:ClassName" with load_bot.
+"""
+import importlib
+from collections import namedtuple
+
+from dreamrunner import ACTIONS, HEIGHT, NO_ACTIONS, InputProvider, SimRandom, make_rng, unpack_actions
+from dreamrunner.constants import PUNCH_RANGE, TAG_RANGE, THROW_RANGE
+
+PlayerView = namedtuple('PlayerView', (
+    'index', 'x', 'y', 'vel_x', 'vel_y', 'width', 'height', 'on_ground', 'is_dead', 'is_stunned',
+    'tag_cooldown', 'punch_cooldown', 'throw_cooldown'))
+
+# platforms and holes are (x, y, width, height) tuples; the first platform is the floor
+TerrainView = namedtuple('TerrainView', ('platforms', 'holes', 'is_morphing', 'morph_timer', 'morph_interval'))
+
+FLOOR_Y = HEIGHT - 60
+
+def player_view(index, player):
+    return PlayerView(index, player.x, player.y, player.vel_x, player.vel_y, player.width, player.height,
+                      player.on_ground, player.is_dead, player.is_stunned,
+                      player.tag_cooldown, player.punch_cooldown, player.throw_cooldown)
+
+def terrain_view(terrain):
+    platforms, holes = terrain.geometry()
+    return TerrainView(platforms, holes, terrain.is_morphing, terrain.morph_timer, terrain.morph_interval)
+
+class Bot(InputProvider):
+    """Base class for computer players; subclasses implement act()"""
+
+    def __init__(self, seed=None):
+        self.rng = SimRandom(seed)
+
+    def seed(self, seed, slot):
+        """Reseed for a new match so bot choices are reproducible"""
+        self.rng = make_rng(seed, 'bot', slot)
+
+    def poll(self, game, player_index):
+        players = game.players
+        me = player_view(player_index, players[player_index])
+        others = [player_view(i, player) for i, player in enumerate(players) if i != player_index]
+        actions = self.act(me, others, terrain_view(game.terrain))
+        if not actions:
+            return NO_ACTIONS
+        if isinstance(actions, int):
+            return unpack_actions(actions)
+        return {name: bool(actions.get(name)) for name in ACTIONS}
+
+    def act(self, me, others, terrain):
+        """Return this tick's actions for the player `me`"""
+        raise NotImplementedError
+
+    @staticmethod
+    def nearest(me, others):
+        """Closest living opponent, or None"""
+        alive = [other for other in others if not other.is_dead]
+        if not alive:
+            return None
+        return min(alive, key=lambda other: (other.x - me.x) ** 2 + (other.y - me.y) ** 2)
+
+    @staticmethod
+    def hole_ahead(me, terrain, direction, lookahead=40):
+        """Whether a floor hole starts within lookahead pixels in the direction of travel"""
+        if direction > 0:
+            near, far = me.x + me.width, me.x + me.width + lookahead
+        else:
+            near, far = me.x - lookahead, me.x
+        return any(hole_x < far and hole_x + hole_width > near
+                   for hole_x, hole_y, hole_width, _ in terrain.holes if hole_y == FLOOR_Y)
+
+class IdleBot(Bot):
+    """Never presses anything; a baseline for everything else"""
+
+    def act(self, me, others, terrain):
+        return 0
+
+class RandomBot(Bot):
+    """Holds a random button combination for a few ticks at a time"""
+
+    def __init__(self, seed=None, hold=8):
+        super().__init__(seed)
+        self.hold = hold
+        self.held = 0
+        self.bits = 0
+
+    def act(self, me, others, terrain):
+        if self.held <= 0:
+            self.bits = self.rng.randrange(64)
+            self.held = self.rng.randint(1, self.hold)
+        self.held -= 1
+        return self.bits
+
+class ChaserBot(Bot):
+    """Runs at the nearest opponent, jumps holes, and attacks whenever something is in range"""
+
+    def act(self, me, others, terrain):
+        target = self.nearest(me, others)
+        if target is None:
+            return 0
+        dx = target.x - me.x
+        dy = target.y - me.y
+        distance_sq = dx * dx + dy * dy
+        direction = 1 if dx > 0 else -1
+        actions = {}
+        hole_ahead = self.hole_ahead(me, terrain, direction)
+        # In the air nothing can jump the hole, so wait for solid ground first
+        if abs(dx) > 10 and (me.on_ground or not hole_ahead):
+            actions['right' if direction > 0 else 'left'] = True
+        if me.on_ground and (hole_ahead or dy < -60):
+            actions['jump'] = True
+        if distance_sq <= TAG_RANGE ** 2 and not target.is_stunned:
+            actions['tag'] = True
+        if distance_sq <= PUNCH_RANGE ** 2:
+            actions['punch'] = True
+        # Throws pull the target toward the middle of the stage, so only throw when it is stunned
+        if distance_sq <= THROW_RANGE ** 2 and target.is_stunned:
+            actions['throw'] = True
+        return actions
+
+class KeeperBot(Bot):
+    """Stays near the stage middle, away from holes, and punches anyone who comes close"""
+
+    def act(self, me, others, terrain):
+        actions = {}
+        middle = 600 - me.width / 2
+        direction = 1 if middle > me.x else -1
+        if abs(middle - me.x) > 80 and not self.hole_ahead(me, terrain, direction):
+            actions['right' if direction > 0 else 'left'] = True
+        elif me.on_ground and self.hole_ahead(me, terrain, direction, lookahead=5):
+            actions['right' if direction < 0 else 'left'] = True
+        target = self.nearest(me, others)
+        if target is not None:
+            distance_sq = (target.x - me.x) ** 2 + (target.y - me.y) ** 2
+            if distance_sq <= PUNCH_RANGE ** 2:
+                actions['punch'] = True
+                actions['tag'] = not target.is_stunned
+        return actions
+
+BOTS = {
+    'idle': IdleBot,
+    'random': RandomBot,
+    'chaser': ChaserBot,
+    'keeper': KeeperBot,
+}
+
+def load_bot(name):
+    """A bot class by BOTS name or "module:ClassName" path"""
+    if name in BOTS:
+        return BOTS[name]
+    module_name, _, class_name = name.partition(':')
+    if not class_name:
+        raise ValueError(f"Unknown bot {name!r}; use one of {', '.join(BOTS)} or module:ClassName")
+    bot_class = getattr(importlib.import_module(module_name), class_name)
+    if not issubclass(bot_class, InputProvider):
+        raise ValueError(f"{name} is not an InputProvider")
+    return bot_class
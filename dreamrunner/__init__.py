@@ -0,0 +1,25 @@
+"""Dream Runner: players push each other into lava on terrain that shifts every few seconds.
+
+The package is split so that simulating a match never touches SDL:
+
+    constants, rng, inputs, geometry, player, terrain, match, replay, profiler, telemetry
+        The simulation core. None of these import pygame, and `import dreamrunner`
+        loads only them.
+    render, audio, keyboard, particles, app
+        The display layer: drawing, music, keyboard players and the windowed Game.
+        It imports pygame; SDL subsystems still start only when a window opens.
+
+The core must import within IMPORT_BUDGET_MS (as reported by `python -X importtime`);
+`python bench.py --import-time` checks it.
+"""
+from .constants import FPS, HEIGHT, MAX_PLAYERS, TICK_SECONDS, WIDTH
+from .geometry import Rect, spawn_positions
+from .inputs import ACTIONS, NO_ACTIONS, InputProvider, ScriptedInput, pack_actions, random_scripts, unpack_actions
+from .match import Match, verify_collision, verify_determinism
+from .player import Player, SpatialHash, player_color
+from .replay import Replay, ReplayPlayer, ReplayRecorder
+from .rng import SimRandom, make_rng, state_digest, stream_key
+from .telemetry import Telemetry, TelemetryWriter, read_telemetry
+from .terrain import LayoutQueue, TerrainSystem, generate_layout
+
+IMPORT_BUDGET_MS = 60
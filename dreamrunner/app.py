@@ -0,0 +1,555 @@
+"""The windowed game: a Match with the start screen, HUD, particles, music and keyboard players.
+
+Importing this module loads pygame (but starts no SDL subsystem until a Game opens its
+window). Simulation-only code should use dreamrunner.match.Match instead.
+"""
+import sys
+import time
+
+import pygame
+
+from .audio import AssetLoader
+from .constants import (BLACK, DEATH_COLORS, EMBER_COLORS, EMBER_RATE, FPS, HEIGHT, IDLE_FPS,
+                        INPUT_READ_SECONDS, MAX_CATCH_UP_TICKS, MUSIC_VOLUME, ORANGE, PLAYER_COLORS, PURPLE, SPARK_COLORS,
+                        SUCCESS_GREEN, TICK_SECONDS, TRACE_SECONDS, UI_BACKGROUND, UI_TEXT, WARNING_RED, WHITE,
+                        WIDTH, YELLOW)
+from .keyboard import PLAYER_CONTROLS, KeyboardInput
+from .match import Match
+from .player import player_color
+from .render import (BackgroundLayer, StartScreen, TerrainRenderer, init_display, player_sprites, text_cache,
+                     ticks_ms)
+from .replay import ReplayRecorder
+from .terrain import LayoutQueue
+
+try:
+    from .particles import ParticleSystem
+except ImportError as e:
+    # Particle effects need NumPy; without it the game simply draws none
+    print(f"Particle effects unavailable: {e}")
+    ParticleSystem = None
+
+class Game(Match):
+    """A Match in a window, with the start screen, HUD, particles, music and keyboard players"""
+
+    def __init__(self, headless=False, inputs=None, seed=None, music=True, layout_queue=False):
+        if inputs is None and not headless:
+            inputs = [KeyboardInput(controls) for controls in PLAYER_CONTROLS]
+        # layout_queue prepares upcoming terrain layouts while waiting out the frame cap; off by
+        # default, since generating a layout inline on the morph tick costs well under a millisecond
+        super().__init__(inputs, seed, LayoutQueue() if layout_queue and not headless else None)
+        # Headless games never open a window, load music or wait on the frame clock
+        self.headless = headless
+
+        if headless:
+            self.screen = None
+            self.start_screen = None
+        else:
+            init_display()
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption("Dream Runner")
+            self.font = text_cache.font(36)
+            self.background = BackgroundLayer()
+            self.start_screen = StartScreen(self.screen, self.font, self.background)
+        self.terrain_renderer = TerrainRenderer()
+        # Pooled particles for deaths, hits and lava; cosmetic, so headless games have none
+        self.effects = ParticleSystem() if ParticleSystem and not headless else None
+        self.effect_watch = []  # (is_dead, punch cooldown, throw cooldown) per player at the last draw
+        # F3 shows the profiler overlay and F4 saves a trace
+        self.trace_seconds = TRACE_SECONDS
+        self.clock = pygame.time.Clock()
+        self.frame_end = time.perf_counter()  # When the last frame's wait finished, for wait_for_frame
+        self.key_events = []  # Key events read since the frame loop last handled events
+        self.render_fps = FPS  # Frame cap for Game.run; 0 renders as fast as possible
+        self.renderer = None  # A DirtyRenderer repaints only changed regions while a round runs
+        self.shown = None  # Key of the static screen currently on display, see static_screen()
+        self.in_start_screen = not headless
+        self.record_path = None  # Where the ReplayRecorder started for the next match is saved
+        self.telemetry_writer = None  # TelemetryWriter streaming self.telemetry, closed when the game exits
+
+        # Music is found and decoded in the background; start_music() plays it once it is ready.
+        # music=False skips the loader and its console messages, as benchmarks do
+        self.music_playing = False
+        self.assets = None
+        if music and not headless:
+            self.assets = AssetLoader()
+            self.assets.start()
+        self.warmed_up = headless  # Whether the work put off until after the first frame is done
+        self.startup = None  # A StartupTimer when the start-up report is wanted
+
+    def start_music(self):
+        """Play the background music once the asset loader has finished"""
+        loader = self.assets
+        if loader is None or not loader.finished():
+            return
+        self.assets = None
+        if self.startup:
+            self.startup.mark("assets (thread)", loader.finished_at, loader.started_at)
+        if loader.music:
+            try:
+                pygame.mixer.music.set_volume(MUSIC_VOLUME)
+                pygame.mixer.music.play(-1)  # Loop indefinitely
+                self.music_playing = True
+            except pygame.error as e:
+                print(f"Error starting music: {e}")
+
+    def warm_up(self):
+        """Work put off until the first frame is on screen"""
+        if self.startup:
+            self.startup.mark("first frame")
+        # Each on-screen player color is drawn from frames baked once, before the first round
+        seconds = player_sprites.bake(PLAYER_COLORS)
+        if seconds:
+            print(f"Baked player sprites for {len(PLAYER_COLORS)} colors in {seconds * 1000:.1f} ms")
+        if self.startup:
+            self.startup.mark("player sprites")
+        self.warmed_up = True
+
+    def toggle_music(self):
+        """Toggle background music on/off"""
+        if self.assets:
+            print("Music is still loading")
+            return
+        try:
+            if self.music_playing:
+                pygame.mixer.music.pause()
+                self.music_playing = False
+                print("Music paused")
+            else:
+                pygame.mixer.music.unpause()
+                self.music_playing = True
+                print("Music resumed")
+        except Exception as e:
+            print(f"Error toggling music: {e}")
+
+    def init_game(self, num_players, reset_scores=False):
+        super().init_game(num_players, reset_scores)
+        self.effect_watch = []
+
+    def run(self):
+        running = True
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        profiler = self.profiler
+        while running:
+            profiler.start_frame()
+            # Key events go to the keyboard players as soon as they are read; the loop sees them too
+            self.read_key_events()
+            events = self.key_events + pygame.event.get(exclude=(pygame.KEYDOWN, pygame.KEYUP))
+            self.key_events = []
+            for event in events:
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_F3:
+                        profiler.toggle_overlay()
+                    elif event.key == pygame.K_F4:
+                        self.save_trace()
+                    elif self.in_start_screen:
+                        result = self.start_screen.handle_input(event)
+                        if result:
+                            self.init_game(result, reset_scores=True)
+                            self.in_start_screen = False
+                            if self.record_path:
+                                self.recorder = ReplayRecorder(self.seed, self.num_players, self.round_index)
+                    elif self.game_over and event.key == pygame.K_r:
+                        if self.recorder:
+                            self.recorder.mark_restart()
+                        self.restart(reset_scores=False)
+                    elif self.game_over and event.key == pygame.K_ESCAPE:
+                        self.in_start_screen = True
+                        self.game_over = False
+                        self.save_recording()
+                    elif event.key == pygame.K_m:
+                        self.toggle_music()
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    # Something covered the window, so the next frame repaints all of it
+                    self.shown = None
+                    if self.renderer:
+                        self.renderer.invalidate()
+            self.start_music()
+            if self.startup and self.warmed_up and not self.assets:
+                print(self.startup.report())
+                self.startup = None
+            profiler.mark("events")
+
+            now = time.perf_counter()
+            elapsed, last_time = now - last_time, now
+            if self.in_start_screen:
+                accumulator = 0.0
+            else:
+                # Simulate whole 60 Hz ticks for the real time that passed, whatever the render rate
+                accumulator += elapsed
+                ticks = 0
+                while accumulator >= TICK_SECONDS and ticks < MAX_CATCH_UP_TICKS:
+                    self.step()
+                    accumulator -= TICK_SECONDS
+                    ticks += 1
+                if accumulator >= TICK_SECONDS:
+                    # Too far behind to catch up: drop the backlog instead of spiralling
+                    accumulator %= TICK_SECONDS
+
+            # Menus and the round-end screen only change on input or once a second, so they are
+            # redrawn only when they change and the loop slows down while they are up
+            static = self.static_screen()
+            idle = static is not None and not profiler.visible
+            if not idle or static != self.shown:
+                regions = None
+                if self.in_start_screen:
+                    self.start_screen.draw()
+                    profiler.mark("start screen")
+                elif self.renderer and not self.game_over:
+                    regions = self.renderer.draw(accumulator / TICK_SECONDS)
+                else:
+                    self.draw(accumulator / TICK_SECONDS)
+                    if self.renderer:
+                        self.renderer.invalidate()
+                if regions is None:
+                    pygame.display.flip()
+                    profiler.mark("display.flip")
+                else:
+                    pygame.display.update(regions)
+                    profiler.mark("display.update")
+                shown_at = time.perf_counter()
+                for provider in self.inputs:
+                    if isinstance(provider, KeyboardInput):
+                        provider.shown(shown_at)
+                self.shown = static
+                if not self.warmed_up:
+                    self.warm_up()
+            if idle:
+                self.clock.tick(min(IDLE_FPS, self.render_fps or IDLE_FPS))
+                self.frame_end = time.perf_counter()
+            else:
+                self.wait_for_frame(self.render_fps)
+            profiler.mark("frame cap wait")
+
+        self.report_input_latency()
+        self.save_recording()
+        if self.telemetry_writer:
+            self.telemetry_writer.close()
+            print(self.telemetry_writer.report())
+        pygame.quit()
+        sys.exit()
+
+    def read_key_events(self):
+        """Take waiting key events off the SDL queue and hand them to the inputs, stamped with the time"""
+        events = pygame.event.get((pygame.KEYDOWN, pygame.KEYUP))
+        if events:
+            now = time.perf_counter()
+            for event in events:
+                for provider in self.inputs:
+                    provider.handle_event(event, now)
+            self.key_events += events
+
+    def wait_for_frame(self, fps):
+        """Wait out the frame cap like Clock.tick, reading key events while waiting.
+
+        pygame doesn't pass on SDL's event timestamps, so an event is stamped when it is read.
+        Reading every INPUT_READ_SECONDS keeps that within about a millisecond of the key press.
+        """
+        if fps:
+            deadline = self.frame_end + 1 / fps
+            if self.layouts:
+                self.layouts.refill(deadline)
+            while True:
+                self.read_key_events()
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                time.sleep(min(remaining, INPUT_READ_SECONDS))
+        self.frame_end = time.perf_counter()
+
+    def report_input_latency(self):
+        for i, provider in enumerate(self.inputs):
+            if isinstance(provider, KeyboardInput) and provider.latency.count:
+                print(provider.latency.report(f"P{i + 1} key press to display"))
+
+    def static_screen(self):
+        """What the menu or round-end screen shows, or None while a round is being played"""
+        if self.in_start_screen:
+            self.start_screen.loading = self.assets.progress() if self.assets else None
+            return ("start screen", self.start_screen.selected_option, self.start_screen.loading)
+        if self.game_over:
+            return ("game over", self.winner, tuple(self.player_scores), self.round_end_seconds(),
+                    self.music_playing)
+        return None
+
+    def round_end_seconds(self):
+        """Whole seconds left on the round-end countdown"""
+        return (self.round_end_duration - self.round_end_timer) // 60 + 1
+
+    def save_trace(self):
+        """Write the last trace_seconds of profiling as a Chrome trace-event file"""
+        if not self.profiler.enabled:
+            print("Profiler is off; press F3 to start recording")
+            return
+        path = time.strftime("trace-%Y%m%d-%H%M%S.json")
+        count = self.profiler.write_trace(path, self.trace_seconds)
+        print(f"Saved {count} profiler spans to {path}")
+
+    def save_recording(self):
+        if self.recorder:
+            with open(self.record_path, "wb") as f:
+                f.write(self.recorder.encode())
+            print(f"Saved replay ({self.recorder.frame_count} frames) to {self.record_path}")
+            self.recorder = None
+
+    def watch(self, replay_player, speed):
+        """Show a ReplayPlayer's match at `speed` ticks per frame until it ends or the window closes"""
+        owed = 0.0
+        while not replay_player.finished():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+            owed += speed
+            while owed >= 1 and not replay_player.finished():
+                replay_player.step()
+                owed -= 1
+            self.draw()
+            pygame.display.flip()
+            self.clock.tick(FPS)
+
+    def spawn_effects(self, step):
+        """Emit lava embers for `step` seconds, plus bursts for deaths and hits since the last draw.
+
+        Events are read off the drawn state rather than the simulation, so re-simulated
+        rollback frames and vectorized players spawn them exactly once.
+        """
+        effects = self.effects
+        for hole in self.terrain.holes:
+            effects.emit(effects.random.poisson(EMBER_RATE * hole.width * step), hole.x, hole.y,
+                         EMBER_COLORS, speed=(20, 60), life=(0.5, 1.2), radius=(1, 3), gravity=-30,
+                         angle=(240, 300), area=(hole.width, hole.height // 2))
+
+        watch = [(player.is_dead, player.punch_cooldown, player.throw_cooldown) for player in self.players]
+        if len(watch) == len(self.effect_watch):
+            for player, (was_dead, punch, throw), (dead, new_punch, new_throw) in zip(
+                    self.players, self.effect_watch, watch):
+                center_x = player.x + player.width / 2
+                center_y = player.y + player.height / 2
+                if dead and not was_dead:
+                    effects.emit(28, center_x, center_y, DEATH_COLORS, speed=(80, 260),
+                                 life=(0.5, 1.1), radius=(2, 4), gravity=500)
+                # A cooldown only goes up when an attack lands; spark between the attacker and its target
+                if new_punch > punch or new_throw > throw:
+                    target = min((other for other in self.players if other is not player and not other.is_dead),
+                                 key=lambda other: (other.x - player.x) ** 2 + (other.y - player.y) ** 2,
+                                 default=player)
+                    effects.emit(12, (center_x + target.x + target.width / 2) / 2,
+                                 (center_y + target.y + target.height / 2) / 2,
+                                 SPARK_COLORS, speed=(120, 320), life=(0.15, 0.35), radius=(1, 3))
+        self.effect_watch = watch
+
+    def render_positions(self, alpha):
+        """Player positions blended from the previous tick (alpha 0) to the latest one (alpha 1)"""
+        current = self.player_positions()
+        previous = self.previous_positions
+        if alpha >= 1 or len(previous) != len(current):
+            return current
+        return [(px + (x - px) * alpha, py + (y - py) * alpha) for (px, py), (x, y) in zip(previous, current)]
+
+    def draw(self, alpha=1.0):
+        profiler = self.profiler
+        # Cached gradient sky with twinkling stars
+        self.background.draw(self.screen, ticks_ms())
+        profiler.mark("background draw")
+
+        self.terrain_renderer.draw(self.screen, self.terrain)
+        profiler.mark("terrain draw")
+        if self.effects:
+            self.spawn_effects(self.effects.update(ticks_ms()))
+        for player, position in zip(self.players, self.render_positions(alpha)):
+            player_sprites.draw(self.screen, player, position)
+        profiler.mark("player draw")
+        if self.effects:
+            self.effects.draw(self.screen)
+            profiler.mark("particles")
+
+        self.draw_hud_chrome(self.screen)
+        self.draw_hud_counters(self.screen)
+        if self.game_over:
+            self.draw_game_over()
+        profiler.mark("hud")
+
+        if profiler.visible:
+            profiler.draw(self.screen)
+            profiler.mark("profiler overlay")
+
+    def draw_hud_chrome(self, screen):
+        """HUD parts that only change with the music setting or player count; returns their areas"""
+        bounds = []
+        # Music status indicator
+        music_bg = pygame.Rect(WIDTH - 160, 80, 150, 25)
+        pygame.draw.rect(screen, UI_BACKGROUND, music_bg)
+        music_color = SUCCESS_GREEN if self.music_playing else WARNING_RED
+        pygame.draw.rect(screen, music_color, music_bg, 2)
+        music_status = "♪ Music: ON" if self.music_playing else "♪ Music: OFF"
+        music_text = text_cache.render(music_status, 24, UI_TEXT)
+        bounds.append(music_bg.union(screen.blit(music_text, (WIDTH - 155, 85))))
+
+        # Music controls hint
+        music_hint = text_cache.render("Press M to toggle", 18, UI_TEXT)
+        bounds.append(screen.blit(music_hint, (WIDTH - 140, 105)))
+
+        # Enhanced controls display - moved to top middle
+        controls_text = [
+            "P1: WASD + Q(tag) E(punch) S(throw)",
+            "P2: Arrows + rshift(tag) /(punch) Down Arrow(throw)",
+            "P3: YGJ + T(tag) U(punch) H(throw)"
+        ]
+
+        # Calculate total width needed for controls
+        max_text_width = max(text_cache.font(20).size(text)[0] for text in controls_text[:self.num_players])
+        controls_width = max_text_width + 20  # Add padding
+        
+        for i in range(min(self.num_players, len(controls_text))):
+            # Position at top middle
+            controls_x = (WIDTH - controls_width) // 2
+            controls_y = 85 + i * 25
+            
+            controls_bg = pygame.Rect(controls_x, controls_y, controls_width, 25)
+            pygame.draw.rect(screen, UI_BACKGROUND, controls_bg)
+            pygame.draw.rect(screen, player_color(i), controls_bg, 2)
+
+            text = text_cache.render(controls_text[i], 20, UI_TEXT)
+            # Center the text within the background
+            text_x = controls_x + (controls_width - text.get_width()) // 2
+            screen.blit(text, (text_x, controls_y + 3))
+            bounds.append(controls_bg)
+
+        # Timer label, just above the morph bar
+        timer_label = text_cache.render("Next Shift", 20, UI_TEXT)
+        bounds.append(screen.blit(timer_label, (WIDTH - 235, -5)))
+        return bounds
+
+    def draw_hud_counters(self, screen):
+        """HUD parts that change while a round is played; returns their areas"""
+        bounds = []
+        # Enhanced UI with backgrounds and better styling
+        # Time display with background
+        time_bg = pygame.Rect(5, 5, 150, 35)
+        pygame.draw.rect(screen, UI_BACKGROUND, time_bg)
+        pygame.draw.rect(screen, SUCCESS_GREEN, time_bg, 2)
+        score_text = text_cache.render(f"Time: {self.score // 10}", 36, UI_TEXT)
+        bounds.append(time_bg.union(screen.blit(score_text, (10, 12))))
+
+        # Level display with background
+        level_bg = pygame.Rect(5, 45, 120, 35)
+        pygame.draw.rect(screen, UI_BACKGROUND, level_bg)
+        pygame.draw.rect(screen, PURPLE, level_bg, 2)
+        difficulty_level = min(self.score // 500, 10) + 1
+        difficulty_text = text_cache.render(f"Level: {difficulty_level}", 36, UI_TEXT)
+        bounds.append(level_bg.union(screen.blit(difficulty_text, (10, 52))))
+
+        # Player score counters
+        for i in range(self.num_players):
+            score_bg = pygame.Rect(5, 85 + i * 40, 130, 35)
+            pygame.draw.rect(screen, UI_BACKGROUND, score_bg)
+            pygame.draw.rect(screen, player_color(i), score_bg, 2)
+
+            score_text = text_cache.render(f"P{i+1}: {self.player_scores[i]}", 36, UI_TEXT)
+            bounds.append(score_bg.union(screen.blit(score_text, (10, 92 + i * 40))))
+
+        # Enhanced morph timer with better styling
+        morph_progress = (self.terrain.morph_interval - self.terrain.morph_timer) / self.terrain.morph_interval
+        bar_width = 220
+        bar_height = 15
+        bar_x = WIDTH - bar_width - 15
+        bar_y = 15
+
+        # Timer background and border
+        timer_bg = pygame.Rect(bar_x - 5, bar_y - 5, bar_width + 10, bar_height + 10)
+        pygame.draw.rect(screen, UI_BACKGROUND, timer_bg)
+        pygame.draw.rect(screen, WARNING_RED, timer_bg, 2)
+        bounds.append(timer_bg)
+
+        # Timer bar background
+        pygame.draw.rect(screen, BLACK, (bar_x, bar_y, bar_width, bar_height))
+
+        # Timer progress with gradient effect
+        progress_width = int(bar_width * morph_progress)
+        if morph_progress > 0.7:
+            bar_color = SUCCESS_GREEN
+        elif morph_progress > 0.3:
+            bar_color = YELLOW
+        else:
+            bar_color = WARNING_RED
+
+        pygame.draw.rect(screen, bar_color, (bar_x, bar_y, progress_width, bar_height))
+
+        # Score counter display below terrain timer
+        score_bg = pygame.Rect(WIDTH - 160, 40, 150, 35)
+        pygame.draw.rect(screen, UI_BACKGROUND, score_bg)
+        pygame.draw.rect(screen, ORANGE, score_bg, 2)
+        score_counter_text = text_cache.render(f"Score: {self.score}", 36, UI_TEXT)
+        bounds.append(score_bg.union(screen.blit(score_counter_text, (WIDTH - 155, 47))))
+
+        # Enhanced terrain shift warning
+        if self.terrain.morph_timer > self.terrain.morph_interval - 60:
+            # Flashing warning with background
+            flash = (ticks_ms() // 200) % 2
+            if flash:
+                warning_bg = pygame.Rect(WIDTH // 2 - 100, 40, 200, 40)
+                pygame.draw.rect(screen, WARNING_RED, warning_bg)
+                pygame.draw.rect(screen, WHITE, warning_bg, 3)
+
+                warning_text = text_cache.render("TERRAIN SHIFT!", 32, WHITE)
+                text_rect = warning_text.get_rect(center=(WIDTH // 2, 60))
+                screen.blit(warning_text, text_rect)
+                bounds.append(warning_bg)
+        return bounds
+
+    def draw_game_over(self):
+        # Semi-transparent overlay
+        colors = [player_color(i) for i in range(self.num_players)]
+        overlay = pygame.Surface((WIDTH, HEIGHT))
+        overlay.set_alpha(180)
+        overlay.fill(BLACK)
+        self.screen.blit(overlay, (0, 0))
+
+        # Game over box
+        game_over_box = pygame.Rect(WIDTH // 2 - 200, HEIGHT // 2 - 150, 400, 300)
+        pygame.draw.rect(self.screen, UI_BACKGROUND, game_over_box)
+        pygame.draw.rect(self.screen, WARNING_RED, game_over_box, 4)
+
+        # Game over text with glow
+        game_over_text = text_cache.render("GAME OVER", 48, WARNING_RED)
+        game_over_rect = game_over_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
+
+        # Add glow effect
+        for offset in [(2, 2), (-2, -2), (2, -2), (-2, 2)]:
+            glow_text = text_cache.render("GAME OVER", 48, (100, 0, 0))
+            self.screen.blit(glow_text, (game_over_rect.x + offset[0], game_over_rect.y + offset[1]))
+
+        self.screen.blit(game_over_text, game_over_rect)
+
+        if self.winner:
+            winner_color = SUCCESS_GREEN if self.winner != "Tie" else YELLOW
+            if self.winner == "Tie":
+                winner_text = text_cache.render("It's a Tie!", 36, winner_color)
+            else:
+                winner_text = text_cache.render(f"{self.winner} Wins!", 36, winner_color)
+
+            winner_rect = winner_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
+            self.screen.blit(winner_text, winner_rect)
+
+        final_score_text = text_cache.render(f"Final Time: {self.score // 10}", 36, UI_TEXT)
+        score_rect = final_score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+        self.screen.blit(final_score_text, score_rect)
+
+        # Display player scores
+        for i in range(self.num_players):
+            score_text = text_cache.render(f"Player {i+1}: {self.player_scores[i]} wins", 36, colors[i])
+            score_rect = score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 30 + i * 25))
+            self.screen.blit(score_text, score_rect)
+
+        # Show countdown and instructions
+        seconds_left = self.round_end_seconds()
+        countdown_text = text_cache.render(f"Next round in {seconds_left} seconds...", 36, YELLOW)
+        countdown_rect = countdown_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 60 + self.num_players * 15))
+        self.screen.blit(countdown_text, countdown_rect)
+
+        restart_text = text_cache.render("Press R for Next Round or ESC for Menu", 24, WHITE)
+        restart_rect = restart_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 90 + self.num_players * 15))
+        self.screen.blit(restart_text, restart_rect)
+
@@ -0,0 +1,93 @@
+"""Sound: the mixer is opened and the music found and decoded on a background thread"""
+import os
+import threading
+import time
+
+import pygame
+
+from .constants import MUSIC_FILES
+
+def init_audio():
+    """Open the mixer; returns False on machines without audio"""
+    if pygame.mixer.get_init():
+        return True
+    try:
+        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    except pygame.error as e:
+        print(f"Audio unavailable: {e}")
+        return False
+    return True
+
+class AssetLoader:
+    """Opens the audio device and finds and decodes the music on a background thread.
+
+    The start screen is up while this runs and shows progress(). Playback is left to the
+    main thread, which checks finished() once a frame.
+    """
+
+    STEPS = 3  # Opening audio, finding music, decoding it
+
+    def __init__(self, directory=".", music_files=MUSIC_FILES):
+        self.directory = directory
+        self.music_files = music_files
+        self.step = 0
+        self.status = "Opening audio"
+        self.music = None  # File name of the decoded track, if any
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, name="asset loader", daemon=True)
+        self.thread.start()
+
+    def finished(self):
+        return self.done.is_set()
+
+    def progress(self):
+        """(steps done, total steps, what is happening now)"""
+        return self.step, self.STEPS, self.status
+
+    def advance(self, status):
+        self.step += 1
+        self.status = status
+
+    def run(self):
+        try:
+            if init_audio():
+                self.advance("Finding music")
+                candidates = self.find_music()
+                self.advance("Loading music")
+                self.music = self.decode(candidates)
+                if self.music is None:
+                    print("No music files found. Running without background music.")
+                    print("To add music, place a file named 'background_music.mp3' in the game directory.")
+        except Exception as e:
+            print(f"Error loading assets: {e}")
+        finally:
+            self.step = self.STEPS
+            self.status = "Ready"
+            self.finished_at = time.perf_counter()
+            self.done.set()
+
+    def find_music(self):
+        """Music files present in the directory, in MUSIC_FILES order, from a single listing"""
+        try:
+            present = set(os.listdir(self.directory))
+        except OSError:
+            return []
+        return [name for name in self.music_files if name in present]
+
+    def decode(self, candidates):
+        """Load the first track that decodes; returns its name, or None"""
+        for name in candidates:
+            try:
+                pygame.mixer.music.load(os.path.join(self.directory, name))
+            except pygame.error:
+                continue
+            print(f"Loaded music: {name}")
+            return name
+        return None
+
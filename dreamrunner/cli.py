@@ -0,0 +1,135 @@
+"""Command line for python main.py.
+
+Headless simulation, --verify and unthrottled replays only import the simulation core;
+pygame is loaded when a window is needed.
+"""
+import argparse
+import sys
+import time
+
+from .constants import FPS, HEADLESS_HOLD_TICKS, MAX_PLAYERS, MAX_ROUND_TICKS, TRACE_SECONDS
+from .inputs import random_scripts
+from .match import Match, verify_collision, verify_determinism
+from .profiler import StartupTimer
+from .replay import Replay, ReplayPlayer
+from .telemetry import Telemetry, TelemetryWriter
+
+def load_game_class():
+    """The windowed Game, imported on first use so headless runs never load pygame"""
+    from .app import Game
+    return Game
+
+def start_telemetry(game, directory):
+    """Record the game's events and stream them to rotating files in directory"""
+    telemetry = Telemetry()
+    game.attach_telemetry(telemetry)
+    return TelemetryWriter(telemetry, directory).start()
+
+def main(started=None):
+    """Command line entry point; `started` is when the launching script began, for --debug-startup"""
+    imported = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Dream Runner")
+    parser.add_argument("--headless", action="store_true", help="simulate without a window or frame limit")
+    parser.add_argument("--players", type=int, default=2, choices=range(2, MAX_PLAYERS + 1),
+                        metavar="N", help="players in headless mode (2-3 on screen, up to 64 headless)")
+    parser.add_argument("--rounds", type=int, default=100, help="rounds to simulate in headless mode")
+    parser.add_argument("--seed", type=int, default=None, help="match seed (random if omitted)")
+    parser.add_argument("--verify", action="store_true", help="check that a seeded headless match is reproducible")
+    parser.add_argument("--verify-collision", action="store_true",
+                        help="check the walkable-surface index and swept collision against a full scan")
+    parser.add_argument("--record", metavar="FILE", help="record the next match's inputs to a replay file")
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded replay")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (0 = unthrottled, no rendering)")
+    parser.add_argument("--seek", type=int, default=0, help="replay frame to start watching from")
+    parser.add_argument("--render-fps", type=int, default=FPS, metavar="N",
+                        help="frame cap for the window; the simulation stays at 60 Hz (0 = uncapped)")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="repaint only the parts of the screen that change, for lower CPU use")
+    parser.add_argument("--layout-queue", action="store_true",
+                        help="prepare upcoming terrain layouts while waiting for the frame cap")
+    parser.add_argument("--profile", action="store_true",
+                        help="record per-phase timings from the start (F3 shows them, F4 saves a trace)")
+    parser.add_argument("--trace-seconds", type=float, default=TRACE_SECONDS, metavar="S",
+                        help="seconds of profiling that F4 writes out")
+    parser.add_argument("--debug-startup", action="store_true",
+                        help="print how long import, initialization and the first frame took")
+    parser.add_argument("--telemetry", metavar="DIR",
+                        help="stream attacks, deaths, morphs and round results to files in DIR")
+    args = parser.parse_args()
+
+    if args.replay:
+        replay = Replay.load(args.replay)
+        player = ReplayPlayer(replay, load_game_class() if args.speed else Match)
+        start = time.perf_counter()
+        player.seek(args.seek)
+        player.play(args.speed)
+        elapsed = time.perf_counter() - start
+        print(f"Replayed {player.frame} frames in {elapsed:.2f}s, final state {player.game.state_hash()}")
+        print("Round wins: " + ", ".join(f"P{i + 1} {wins}" for i, wins in enumerate(player.game.player_scores)))
+        return
+
+    if args.verify:
+        seed = args.seed if args.seed is not None else 0
+        frame = verify_determinism(seed, args.players)
+        if frame is None:
+            print(f"Seed {seed}: runs match on every frame")
+        else:
+            print(f"Seed {seed}: runs diverge at frame {frame}")
+            sys.exit(1)
+        return
+
+    if args.verify_collision:
+        seed = args.seed if args.seed is not None else 0
+        terrains = 200
+        mismatch = verify_collision(seed, terrains)
+        if mismatch is None:
+            print(f"Seed {seed}: surface index and swept collision match the full scan on {terrains} terrains")
+        else:
+            terrain, x, y = mismatch
+            where = f"x={x!r}" if y is None else f"x={x!r}, y={y!r}"
+            print(f"Seed {seed}: terrain {terrain} differs from the full scan at {where}")
+            sys.exit(1)
+        return
+
+    if args.headless:
+        game = Match(seed=args.seed)
+        # Idle players never fall, so headless players move and attack at random, seeded by the match
+        game.inputs = random_scripts(game.seed, args.players, MAX_ROUND_TICKS, hold=HEADLESS_HOLD_TICKS, loop=True)
+        writer = start_telemetry(game, args.telemetry) if args.telemetry else None
+        game.init_game(args.players, reset_scores=True)
+        start = time.perf_counter()
+        winners = game.run_headless(rounds=args.rounds)
+        elapsed = time.perf_counter() - start
+        if writer:
+            writer.close()
+            print(writer.report())
+        print(f"Seed {game.seed}: simulated {args.rounds} rounds in {elapsed:.2f}s "
+              f"({args.rounds / elapsed * 60:.0f} rounds/min)")
+        for i, wins in enumerate(game.player_scores):
+            print(f"Player {i + 1}: {wins} wins")
+        print(f"Ties: {winners.count('Tie')} (rounds still running after {MAX_ROUND_TICKS // FPS}s end as ties)")
+        return
+
+    startup = None
+    if args.debug_startup:
+        startup = StartupTimer(imported if started is None else started)
+        if started is not None:
+            startup.mark("core import", imported)
+    game_class = load_game_class()
+    if startup:
+        startup.mark("display import")
+    game = game_class(seed=args.seed, layout_queue=args.layout_queue)
+    if startup:
+        startup.mark("window and game")
+        game.startup = startup
+    game.record_path = args.record
+    game.render_fps = args.render_fps
+    if args.dirty_rects:
+        from .render import DirtyRenderer
+        game.renderer = DirtyRenderer(game)
+    game.trace_seconds = args.trace_seconds
+    if args.telemetry:
+        game.telemetry_writer = start_telemetry(game, args.telemetry)
+    if args.profile:
+        game.profiler.enable()
+    game.run()
@@ -0,0 +1,95 @@
+"""Stage size, tick rate, colors and tuning shared by the simulation and the display layer"""
+
+# Screen dimensions and simulation rate
+WIDTH = 1200
+HEIGHT = 800
+FPS = 60  # Simulation ticks per second; rendering can run faster and interpolates
+TICK_SECONDS = 1 / FPS
+MAX_CATCH_UP_TICKS = 5  # Ticks run per rendered frame at most; beyond that a slow machine slows the game
+
+# Enhanced color palette with better contrast and visual appeal
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BLUE = (64, 128, 255)
+GREEN = (46, 204, 113)
+RED = (231, 76, 60)
+PURPLE = (155, 89, 182)
+ORANGE = (230, 126, 34)
+YELLOW = (241, 196, 15)
+
+# Background gradient colors
+DARK_BLUE = (15, 32, 60)
+LIGHT_BLUE = (52, 152, 219)
+MIDNIGHT_BLUE = (8, 20, 40)
+
+# Platform colors
+BROWN = (101, 67, 33)
+DARK_GREEN = (39, 174, 96)
+PLATFORM_GRAY = (108, 122, 137)
+PLATFORM_HIGHLIGHT = (149, 165, 180)
+
+# UI colors
+UI_BACKGROUND = (44, 62, 80)
+UI_TEXT = (236, 240, 241)
+WARNING_RED = (192, 57, 43)
+SUCCESS_GREEN = (39, 174, 96)
+
+# Background layer settings
+SKY_BUCKETS = 48  # Number of cached brightness levels for the day/night sky
+SKY_CACHE_SIZE = 6  # Full-screen gradient surfaces kept in memory
+STAR_COUNT = 80
+STAR_SEED = 42
+
+# Rendered text surfaces kept by the shared text cache
+TEXT_CACHE_SIZE = 256
+
+# Room around each baked platform sprite for grass blades and the drop shadow
+TERRAIN_SPRITE_PADDING = 8
+
+# Matches run 2-3 keyboard players; party matches can simulate up to this many
+MAX_PLAYERS = 64
+PLAYER_COLORS = (BLUE, RED, GREEN)
+
+# Combat reach in pixels, measured between players' top-left corners
+TAG_RANGE = 60
+PUNCH_RANGE = 50
+THROW_RANGE = 45
+COMBAT_CELL_SIZE = max(TAG_RANGE, PUNCH_RANGE, THROW_RANGE)
+COMBAT_GRID_MIN_PLAYERS = 12  # Smaller matches just check every other player
+MAX_ROUND_TICKS = 60 * FPS  # Rounds still running after a minute end as a tie
+HEADLESS_HOLD_TICKS = 30  # Headless players hold each random button combination this long
+TRACE_SECONDS = 10  # How much recent profiling F4 writes out
+PLAYER_UPDATE_SPANS = tuple(f"player {i + 1} update" for i in range(MAX_PLAYERS))
+
+# Terrain layout rules; a full jump lifts a player about 133 px
+LAYOUT_QUEUE_SIZE = 4  # Morph layouts a LayoutQueue prepares ahead of time
+LAYOUT_CACHE_SIZE = 64  # Recently generated layouts kept for rollbacks that re-simulate a morph
+SURFACE_INDEX_CACHE_SIZE = 64  # Collision indexes kept per (geometry, player width)
+PLACEMENT_ATTEMPTS = 50  # Tries for each hole or platform before it is left out
+SPAWN_SAFE_ZONE = 80  # No hole starts within this distance of a spawn point
+MORPH_SAFE_ZONE = 40  # Morph holes that land this close to a living player are dropped
+MAX_JUMP_RISE = 120  # How much higher a platform can be than the surface it is jumped to from
+MAX_JUMP_GAP = 120  # Horizontal gap a jump can clear
+PLATFORM_CLEARANCE = 50  # Vertical room between stacked platforms, so a player fits in between
+GROUND = (0, HEIGHT - 60, WIDTH, 60)
+
+# Player sprite frames: room around the body for the stun glow, and above it for the stun countdown
+PLAYER_SPRITE_PADDING = 4
+PLAYER_SPRITE_TOP = 28
+
+# Redraw pacing
+INPUT_READ_SECONDS = 0.001  # How often key events are read while waiting for the next frame
+IDLE_FPS = 15  # Frame rate of screens waiting on input; keep it at least FPS / MAX_CATCH_UP_TICKS
+DIRTY_SKY_INTERVAL_MS = 1000  # With dirty rects the sky brightens or dims at most this often
+
+# Start-up and assets
+MUSIC_FILES = ("background_music.mp3", "music.mp3", "bgm.mp3",
+               "background_music.ogg", "music.ogg", "bgm.ogg",
+               "background_music.wav", "music.wav", "bgm.wav")  # Music tracks looked for, in order
+MUSIC_VOLUME = 0.3
+
+# Particle effects, drawn only in windowed games
+DEATH_COLORS = (ORANGE, RED, YELLOW)
+SPARK_COLORS = (WHITE, YELLOW)
+EMBER_COLORS = ((255, 110, 0), (255, 150, 0), (255, 190, 0))
+EMBER_RATE = 0.4  # Embers per second per pixel of hole width
@@ -0,0 +1,69 @@
+"""Rectangles and collision tests for the simulation, in plain Python"""
+from collections import namedtuple
+
+from .constants import WIDTH
+
+class Rect(namedtuple('Rect', ('x', 'y', 'width', 'height'))):
+    """Integer rectangle with pygame.Rect's edge names, so the simulation needs no pygame.
+
+    pygame.draw and Surface.blit accept it wherever they take a rect.
+    """
+    __slots__ = ()
+
+    def __new__(cls, x, y=None, width=None, height=None):
+        if y is None:
+            x, y, width, height = x
+        # pygame.Rect truncates, and collision results depend on it
+        return super().__new__(cls, int(x), int(y), int(width), int(height))
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def top(self):
+        return self.y
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+def spawn_positions(num_players):
+    """Evenly spaced starting x positions across the stage"""
+    return [WIDTH * (i + 1) // (num_players + 1) for i in range(num_players)]
+
+def first_platform_hit(platforms, start_x, start_y, end_x, end_y, width, height):
+    """Swept-box test: the first platform top or bottom crossed moving to (end_x, end_y), or None.
+
+    Returns (time of impact in [0, 1), contact normal, rect). platforms comes from
+    TerrainSystem.surfaces_at(end_x), so only platforms the box is still over at the end count:
+    players slide off edges and drop into holes just as the overlap test lets them. Side contacts
+    are left to that test too, which snaps players onto or under the platform as it always has.
+    """
+    dx, dy = end_x - start_x, end_y - start_y
+    if dy == 0:
+        return None
+    normal = (0, -1) if dy > 0 else (0, 1)
+    best = None
+    for rect in platforms:
+        left, top, right, bottom = rect
+        # Time the leading edge reaches the facing side; the box must start clear of it
+        toi = (top - (start_y + height)) / dy if dy > 0 else (bottom - start_y) / dy
+        if not 0 <= toi < 1 or (best is not None and toi >= best[0]):
+            continue
+        # The box has to be overlapping the platform's columns at that moment, not touching a corner
+        if dx > 0:
+            if not (left - (start_x + width)) / dx <= toi < (right - start_x) / dx:
+                continue
+        elif dx < 0:
+            if not (right - start_x) / dx <= toi < (left - (start_x + width)) / dx:
+                continue
+        elif start_x + width <= left or start_x >= right:
+            continue
+        best = (toi, normal, rect)
+    return best
+
@@ -0,0 +1,59 @@
+"""Per-tick player actions and the input providers that produce them"""
+from .rng import make_rng
+
+# Player actions, in the bit order used when actions are packed into an integer
+ACTIONS = ('left', 'right', 'jump', 'tag', 'punch', 'throw')
+NO_ACTIONS = {name: False for name in ACTIONS}
+
+def pack_actions(actions):
+    """Pack an actions dict into a 6-bit integer"""
+    bits = 0
+    for i, name in enumerate(ACTIONS):
+        if actions[name]:
+            bits |= 1 << i
+    return bits
+
+def unpack_actions(bits):
+    """Expand a 6-bit integer back into an actions dict"""
+    return {name: bool(bits & (1 << i)) for i, name in enumerate(ACTIONS)}
+
+class InputProvider:
+    """Source of per-tick actions for one player (keyboard, script, replay or bot)"""
+
+    def poll(self, game, player_index):
+        """Return this tick's actions as a dict keyed by ACTIONS"""
+        raise NotImplementedError
+
+    def handle_event(self, event, timestamp):
+        """Take a KEYDOWN or KEYUP event read at perf_counter() time `timestamp`"""
+
+    def flush(self):
+        """Drop input buffered for ticks that will never run, e.g. presses made in a menu"""
+
+class ScriptedInput(InputProvider):
+    def __init__(self, script=(), loop=False):
+        # Each entry is an actions dict or a packed integer; past the end the player idles
+        self.script = [entry if isinstance(entry, dict) else unpack_actions(entry) for entry in script]
+        self.loop = loop
+        self.frame = 0
+
+    def poll(self, game, player_index):
+        if not self.script:
+            return NO_ACTIONS
+        if self.loop:
+            actions = self.script[self.frame % len(self.script)]
+        elif self.frame < len(self.script):
+            actions = self.script[self.frame]
+        else:
+            actions = NO_ACTIONS
+        self.frame += 1
+        return actions
+
+def random_scripts(seed, num_players, frames, hold=1, loop=False):
+    """Seeded random button mashing, one ScriptedInput per player; each press is held for `hold` ticks"""
+    rng = make_rng(seed, 'script')
+    presses = -(-frames // hold)
+    return [ScriptedInput([bits for bits in [rng.randrange(64) for _ in range(presses)] for _ in range(hold)][:frames],
+                          loop)
+            for _ in range(num_players)]
+
@@ -0,0 +1,66 @@
+"""Keyboard players: shared-keyboard layouts and the event-driven KeyboardInput"""
+import pygame
+
+from .inputs import ACTIONS, InputProvider
+from .profiler import LatencyHistogram
+
+# Keyboard layouts for players 1-3 on a shared keyboard
+PLAYER_CONTROLS = (
+    {'left': pygame.K_a, 'right': pygame.K_d, 'jump': pygame.K_w, 'tag': pygame.K_q, 'punch': pygame.K_e, 'throw': pygame.K_s},
+    {'left': pygame.K_LEFT, 'right': pygame.K_RIGHT, 'jump': pygame.K_UP, 'tag': pygame.K_RSHIFT, 'punch': pygame.K_SLASH, 'throw': pygame.K_DOWN},
+    {'left': pygame.K_g, 'right': pygame.K_j, 'jump': pygame.K_y, 'tag': pygame.K_t, 'punch': pygame.K_u, 'throw': pygame.K_h},
+)
+
+class KeyboardInput(InputProvider):
+    """Keyboard controls driven by the SDL event queue.
+
+    Key events are buffered with the time they were read and applied on the next tick, so a
+    tap that starts and ends between two ticks still holds its action for one tick. Loops
+    that never hand over events fall back to sampling pygame.key.get_pressed().
+    """
+
+    def __init__(self, controls):
+        self.controls = controls  # action name -> pygame key code
+        self.key_actions = {key: name for name, key in controls.items()}
+        self.events = []  # (timestamp, action, pressed) since the last tick
+        self.held = set()
+        self.fed = False  # Set by the first event; until then poll samples the keyboard
+        self.applied = []  # Timestamps of presses applied since the last frame was shown
+        self.latency = LatencyHistogram()
+
+    def handle_event(self, event, timestamp):
+        name = self.key_actions.get(event.key)
+        if name is not None:
+            self.fed = True
+            self.events.append((timestamp, name, event.type == pygame.KEYDOWN))
+
+    def poll(self, game, player_index):
+        if not self.fed:
+            keys = pygame.key.get_pressed()
+            return {name: bool(keys[self.controls[name]]) for name in ACTIONS}
+        active = set(self.held)
+        for timestamp, name, pressed in self.events:
+            if pressed and name not in self.held:
+                self.held.add(name)
+                active.add(name)
+                self.applied.append(timestamp)
+            elif not pressed:
+                self.held.discard(name)
+        self.events.clear()
+        return {name: name in active for name in ACTIONS}
+
+    def flush(self):
+        for timestamp, name, pressed in self.events:
+            if pressed:
+                self.held.add(name)
+            else:
+                self.held.discard(name)
+        self.events.clear()
+        self.applied.clear()
+
+    def shown(self, timestamp):
+        """A frame showing every tick polled so far went to the display at `timestamp`"""
+        for pressed_at in self.applied:
+            self.latency.add(timestamp - pressed_at)
+        self.applied.clear()
+
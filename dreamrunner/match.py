@@ -0,0 +1,278 @@
+"""The match simulation: rounds, scoring and the fixed-rate tick, with no display or sound.
+
+Match imports nothing from pygame, so tools, servers and process-pool workers that only
+simulate start quickly. Game (dreamrunner.app) adds the window, music and keyboard on top.
+"""
+import random
+
+from .constants import HEIGHT, MAX_ROUND_TICKS, PLAYER_UPDATE_SPANS, WIDTH
+from .geometry import spawn_positions
+from .inputs import ScriptedInput, random_scripts
+from .player import Player, SpatialHash, player_color
+from .profiler import Profiler
+from .rng import SimRandom, make_rng, state_digest
+from .telemetry import MORPH, NO_PLAYER, ROUND
+from .terrain import TerrainSystem
+
+class Match:
+    """Players, terrain and scores for a series of rounds, advanced one tick at a time"""
+
+    def __init__(self, inputs=None, seed=None, layouts=None):
+        # Matches without a window never load music or wait on the frame clock
+        self.headless = True
+
+        # Every simulation RNG is derived from the match seed and the round number
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.round_index = 0
+        # Optional LayoutQueue that builds upcoming terrain layouts between frames
+        self.layouts = layouts
+        # Per-phase timings; mark() returns straight away while the profiler is off
+        self.profiler = Profiler()
+        self.num_players = 2
+
+        self.players = []
+        self.previous_positions = []  # Player positions before the latest tick, for interpolation
+        self.combat_grid = SpatialHash()
+        self.terrain = None
+        self.score = 0
+        self.game_over = False
+        self.winner = None
+        self.player_scores = []
+        self.round_end_timer = 0
+        self.round_end_duration = 180  # 3 seconds at 60 FPS
+        # Holes never open under a player, so idle players could otherwise outlast every morph
+        self.max_round_ticks = MAX_ROUND_TICKS  # A round still running this long ends as a tie; None for no limit
+
+        # One input provider per player slot; players idle unless given scripts or bots
+        self.inputs = list(inputs) if inputs is not None else [ScriptedInput() for _ in range(3)]
+        self.last_actions = []
+
+        # Optional ReplayRecorder fed one entry per simulation step
+        self.recorder = None
+        # Optional Telemetry fed attacks, deaths, morphs and round results; see attach_telemetry
+        self.telemetry = None
+
+    def init_game(self, num_players, reset_scores=False):
+        self.num_players = num_players
+        self.players = []
+        self.previous_positions = []
+        self.round_index += 1
+
+        # Only reset scores if explicitly requested or if number of players changed
+        if reset_scores or len(self.player_scores) != num_players:
+            self.player_scores = [0] * num_players
+
+        positions = spawn_positions(num_players)
+        for i in range(num_players):
+            rng = make_rng(self.seed, 'player', self.round_index, i)
+            player = Player(positions[i], HEIGHT - 150, player_color(i), rng)
+            player.slot = i
+            player.telemetry = self.telemetry
+            self.players.append(player)
+
+        # Players beyond the provided inputs idle
+        while len(self.inputs) < num_players:
+            self.inputs.append(ScriptedInput())
+        for provider in self.inputs:
+            provider.flush()
+
+        self.terrain = TerrainSystem(num_players, make_rng(self.seed, 'terrain', self.round_index), self.layouts)
+        self.score = 0
+        self.game_over = False
+        self.winner = None
+
+    def attach_telemetry(self, telemetry):
+        """Record gameplay events into a Telemetry from now on"""
+        telemetry.match = self
+        self.telemetry = telemetry
+        for player in self.players:
+            player.telemetry = telemetry
+
+    def run_headless(self, rounds=1, max_frames=None):
+        """Simulate rounds as fast as possible with no rendering or frame limit, returning the winners"""
+        winners = []
+        frames = 0
+        while len(winners) < rounds and (max_frames is None or frames < max_frames):
+            self.update()
+            frames += 1
+            if self.game_over:
+                winners.append(self.winner)
+                # The round-end countdown is only there for people watching, so skip it
+                self.next_round()
+        return winners
+
+    def step(self):
+        """Advance the match by one simulation tick"""
+        self.previous_positions = self.player_positions()
+        self.last_actions = []
+        if not self.game_over:
+            self.update()
+        else:
+            # Handle round end timer
+            self.round_end_timer += 1
+            if self.round_end_timer >= self.round_end_duration:
+                self.next_round()
+
+        if self.recorder:
+            self.recorder.record(self.last_actions)
+        self.profiler.mark("step")
+
+    def update(self):
+        profiler = self.profiler
+        morphing = self.terrain.is_morphing
+        self.terrain.update(self.score, self.living_player_xs)
+        if self.telemetry and self.terrain.is_morphing and not morphing:
+            self.telemetry.record(MORPH, detail=min(len(self.terrain.holes), 255))
+        profiler.mark("terrain.update")
+
+        self.last_actions = [self.inputs[i].poll(self, i) for i in range(self.num_players)]
+        profiler.mark("input poll")
+        players_dead = self.update_players(self.last_actions)
+
+        # Check game over conditions
+        alive_players = [i for i, player in enumerate(self.players) if not player.is_dead]
+        dead_players = [i for i, (player, dead) in enumerate(zip(self.players, players_dead)) if player.is_dead and dead]
+
+        # If only one player alive or all dead, end round
+        if len(alive_players) <= 1 and not self.game_over:
+            if len(alive_players) == 1:
+                self.winner = f"Player {alive_players[0] + 1}"
+                self.player_scores[alive_players[0]] += 1
+            else:
+                self.winner = "Tie"
+            self.game_over = True
+            self.round_end_timer = 0
+            if self.telemetry:
+                winner = alive_players[0] if alive_players else NO_PLAYER
+                self.telemetry.record(ROUND, winner, detail=self.num_players)
+        elif dead_players:
+            # Award points to surviving players
+            for player_idx in dead_players:
+                for alive_idx in alive_players:
+                    if alive_idx != player_idx:
+                        pass  # Could add partial scoring here
+
+        # Increment score if any player is alive
+        if alive_players:
+            self.score += 1
+        if not self.game_over and self.max_round_ticks and self.score >= self.max_round_ticks:
+            self.winner = "Tie"
+            self.game_over = True
+            self.round_end_timer = 0
+            if self.telemetry:
+                self.telemetry.record(ROUND, NO_PLAYER, detail=self.num_players)
+        profiler.mark("round logic")
+
+    def update_players(self, actions):
+        """Advance every player one frame; True for each dead player whose death animation finished"""
+        self.combat_grid.reset(self.players)
+        if not self.profiler.enabled:
+            return [player.update(self.terrain, actions[i], self.players, self.combat_grid)
+                    for i, player in enumerate(self.players)]
+        finished = []
+        for i, player in enumerate(self.players):
+            finished.append(player.update(self.terrain, actions[i], self.players, self.combat_grid))
+            self.profiler.mark(PLAYER_UPDATE_SPANS[i], "player update")
+        return finished
+
+    def state(self):
+        """Tuple of the full match state: round and score bookkeeping, players and terrain"""
+        return (self.round_index, self.score, self.game_over, self.winner,
+                tuple(self.player_scores), self.round_end_timer,
+                tuple(player.state() for player in self.players),
+                self.terrain.state() if self.terrain else None)
+
+    def state_hash(self):
+        """Hash of state(); two runs with the same seed and inputs match frame by frame"""
+        return state_digest(self.state())
+
+    def save_state(self):
+        """Snapshot everything needed to resume the match, including the RNG streams"""
+        return (self.num_players, self.round_index, self.score, self.game_over, self.winner,
+                tuple(self.player_scores), self.round_end_timer,
+                tuple(player.save_state() for player in self.players),
+                self.terrain.save_state())
+
+    def load_state(self, saved):
+        num_players = saved[0]
+        if num_players != self.num_players or not self.terrain:
+            self.init_game(num_players)
+        (_, self.round_index, self.score, self.game_over, self.winner,
+         player_scores, self.round_end_timer, players, terrain) = saved
+        self.player_scores = list(player_scores)
+        for player, player_state in zip(self.players, players):
+            player.load_state(player_state)
+        self.terrain.load_state(terrain)
+
+    def restart(self, reset_scores=False):
+        self.init_game(self.num_players, reset_scores=reset_scores)
+
+    def next_round(self):
+        # Start next round without resetting scores
+        self.init_game(self.num_players, reset_scores=False)
+
+    def player_positions(self):
+        return [(player.x, player.y) for player in self.players]
+
+    def living_player_xs(self):
+        return [x for (x, _), player in zip(self.player_positions(), self.players) if not player.is_dead]
+
+def verify_determinism(seed, num_players=2, frames=3600):
+    """Run the same seeded match twice and return the first frame whose state hashes differ, or None"""
+    games = []
+    for _ in range(2):
+        game = Match(inputs=random_scripts(seed, num_players, frames), seed=seed)
+        game.init_game(num_players, reset_scores=True)
+        games.append(game)
+
+    for frame in range(frames):
+        for game in games:
+            game.run_headless(rounds=1, max_frames=1)
+        if games[0].state_hash() != games[1].state_hash():
+            return frame
+    return None
+
+
+class ScannedTerrain:
+    """Stands in for a TerrainSystem in collision checks, answering surfaces_at with a full scan"""
+
+    def __init__(self, terrain):
+        self.terrain = terrain
+
+    def surfaces_at(self, x, width):
+        return self.terrain.surfaces_by_scan(x, width)
+
+def verify_collision(seed, terrains=200, probes=500):
+    """Check the surface index and the swept collision against a scan of every hole and platform.
+
+    Seeded terrains are morphed a few times and probed at random positions and around every
+    region boundary of the index. Returns the first (terrain, x, y) where surfaces_at or a
+    player's collision result differs from the scan (y is None for surfaces_at), or None.
+    """
+    rng = make_rng(seed, 'collision')
+    width = Player(0, 0).width
+    max_x = WIDTH - width
+    for index in range(terrains):
+        terrain = TerrainSystem(2 + index % 2, make_rng(seed, 'terrain', index))
+        for _ in range(index % 8):
+            terrain.morph_terrain([rng.uniform(0, WIDTH) for _ in range(rng.randint(0, 3))])
+        scanned = ScannedTerrain(terrain)
+        terrain.surfaces_at(0, width)  # Builds the index, whose breakpoints are probed below
+        xs = [rng.uniform(0, max_x) for _ in range(probes)]
+        xs += [x + offset for x in terrain.surface_breaks for offset in (-1, -0.5, -1e-6, 0, 1e-6, 0.5)
+               if 0 <= x + offset <= max_x]
+        for x in xs:
+            if terrain.surfaces_at(x, width) != terrain.surfaces_by_scan(x, width):
+                return index, x, None
+            y = rng.uniform(0, HEIGHT + 50)
+            start_x = min(max(x - rng.uniform(-12, 12), 0), max_x)
+            start_y = y - rng.uniform(-30, 30)
+            states = []
+            for surfaces in (terrain, scanned):
+                player = Player(x, y, rng=SimRandom(index))
+                player.vel_y = y - start_y
+                player.check_terrain_collision(surfaces, start_x, start_y)
+                states.append(player.state())
+            if states[0] != states[1]:
+                return index, x, y
+    return None
@@ -0,0 +1,127 @@
+"""Pooled particle effects: a fixed number of particle slots stored in NumPy arrays.
+
+Spawning fills free slots, every live particle moves in one batch of array operations,
+and drawing hands a single list of pre-rendered dots to Surface.blits. Nothing is
+created per particle, so a burst of sparks costs about the same as a quiet frame.
+"""
+import numpy as np
+import pygame
+
+PARTICLE_CAPACITY = 2048
+MAX_RADIUS = 4
+MAX_STEP = 0.1  # Longest time step in seconds, so a stalled window doesn't fling particles away
+
+class ParticleSystem:
+    """Fixed-capacity pool of fading dots with velocity and gravity"""
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vel_x = np.zeros(capacity)
+        self.vel_y = np.zeros(capacity)
+        self.gravity = np.zeros(capacity)
+        self.life = np.zeros(capacity)  # Seconds left; slots at or below 0 are free
+        self.max_life = np.ones(capacity)
+        self.radius = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.intp)  # Index into self.sprites
+        self.color_indices = {}
+        self.sprites = []  # sprites[color][radius]: a filled circle for every color and size
+        # Cosmetic only: never touches the simulation's random streams
+        self.random = np.random.default_rng(seed)
+        self.last_time = None
+
+    def palette(self, color):
+        """Index of a color's sprites, rendering them the first time the color is used"""
+        index = self.color_indices.get(color)
+        if index is None:
+            sprites = [None]
+            for radius in range(1, MAX_RADIUS + 1):
+                sprite = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, color, (radius, radius), radius)
+                sprites.append(sprite)
+            index = len(self.sprites)
+            self.sprites.append(sprites)
+            self.color_indices[color] = index
+        return index
+
+    def emit(self, count, x, y, colors, speed, life, radius, gravity=0.0, angle=(0, 360), area=(0, 0)):
+        """Spawn count particles in the area of size `area` at (x, y).
+
+        speed, life, radius and angle (degrees, 0 = right, 90 = down) are (low, high)
+        ranges sampled per particle; colors is a sequence of RGB tuples. When the pool
+        is full the particles closest to expiring are replaced.
+        """
+        count = min(int(count), self.capacity)
+        if count <= 0:
+            return
+        slots = np.flatnonzero(self.life <= 0)[:count]
+        if len(slots) < count:
+            slots = np.argpartition(self.life, count - 1)[:count]
+
+        rng = self.random
+        headings = np.radians(rng.uniform(angle[0], angle[1], count))
+        speeds = rng.uniform(speed[0], speed[1], count)
+        lives = rng.uniform(life[0], life[1], count)
+        self.x[slots] = x + rng.uniform(0, area[0], count)
+        self.y[slots] = y + rng.uniform(0, area[1], count)
+        self.vel_x[slots] = np.cos(headings) * speeds
+        self.vel_y[slots] = np.sin(headings) * speeds
+        self.gravity[slots] = gravity
+        self.life[slots] = lives
+        self.max_life[slots] = lives
+        self.radius[slots] = rng.uniform(radius[0], radius[1], count)
+        palette = np.array([self.palette(color) for color in colors], dtype=np.intp)
+        self.color[slots] = palette[rng.integers(len(palette), size=count)]
+
+    def update(self, now):
+        """Advance every particle to `now` (milliseconds) and return the step in seconds"""
+        step = 0.0 if self.last_time is None else min(max(now - self.last_time, 0) / 1000, MAX_STEP)
+        self.last_time = now
+        if step:
+            self.vel_y += self.gravity * step
+            self.x += self.vel_x * step
+            self.y += self.vel_y * step
+            self.life -= step
+        return step
+
+    def draw(self, screen):
+        """Blit every live particle in one call; dots shrink as they fade"""
+        live = np.flatnonzero(self.life > 0)
+        if not len(live):
+            return
+        radius = np.ceil(self.radius[live] * self.life[live] / self.max_life[live]).astype(np.intp)
+        np.clip(radius, 1, MAX_RADIUS, out=radius)
+        left = (self.x[live] - radius).astype(np.intp).tolist()
+        top = (self.y[live] - radius).astype(np.intp).tolist()
+        sprites = self.sprites
+        screen.blits([(sprites[color][size], (x, y))
+                      for color, size, x, y in zip(self.color[live].tolist(), radius.tolist(), left, top)],
+                     doreturn=False)
+
+    def bounds(self, tile=64):
+        """Rects covering every live particle, one per run of occupied tiles in a row of the grid"""
+        live = np.flatnonzero(self.life > 0)
+        if not len(live):
+            return []
+        # Every dot lies within MAX_RADIUS of its center, so pad the tiles by that much
+        columns = np.floor_divide(self.x[live], tile).astype(np.intp)
+        rows = np.floor_divide(self.y[live], tile).astype(np.intp)
+        occupied = np.unique(np.stack((rows, columns), axis=1), axis=0).tolist()
+        rects = []
+        start = None
+        for (row, column), following in zip(occupied, occupied[1:] + [None]):
+            if start is None:
+                start = column
+            if following != [row, column + 1]:
+                rects.append(pygame.Rect(start * tile - MAX_RADIUS, row * tile - MAX_RADIUS,
+                                         (column - start + 1) * tile + 2 * MAX_RADIUS, tile + 2 * MAX_RADIUS))
+                start = None
+        return rects
+
+    def clear(self):
+        self.life[:] = 0
+        self.last_time = None
+
+    def count(self):
+        return int(np.count_nonzero(self.life > 0))
@@ -0,0 +1,342 @@
+"""Player physics and combat, and the spatial hash that finds nearby players"""
+import colorsys
+
+from .constants import (BLUE, COMBAT_CELL_SIZE, COMBAT_GRID_MIN_PLAYERS, HEIGHT, PLAYER_COLORS, PUNCH_RANGE,
+                        TAG_RANGE, THROW_RANGE, WIDTH)
+from .geometry import first_platform_hit
+from .rng import SimRandom
+from .telemetry import DEATH, DEATH_FELL, DEATH_HOLE, HIT, PUNCH, TAG, THROW
+
+def player_color(index):
+    """The classic colors for the first three players, then evenly spread hues"""
+    if index < len(PLAYER_COLORS):
+        return PLAYER_COLORS[index]
+    rgb = colorsys.hsv_to_rgb((index * 137.5) % 360 / 360, 0.7, 0.9)
+    return tuple(int(channel * 255) for channel in rgb)
+
+class SpatialHash:
+    """Uniform grid of living players, so range checks only look at nearby cells.
+
+    Players move one at a time during a tick, so the grid is built on the first query of
+    the tick and brought up to date lazily: before player i's query, the players updated
+    since the last query are re-bucketed.
+    """
+
+    def __init__(self, cell_size=COMBAT_CELL_SIZE, min_players=COMBAT_GRID_MIN_PLAYERS):
+        self.cell_size = cell_size
+        self.min_players = min_players  # Below this a plain scan is cheaper than the grid
+        self.cells = {}  # (column, row) -> players in that cell
+        self.player_cells = {}
+        self.order = {}
+        self.players = []
+        self.synced = None  # Players before this index may have moved since they were bucketed
+
+    def reset(self, players):
+        """Start a new tick"""
+        if players is not self.players:
+            self.order = {player: i for i, player in enumerate(players)}
+            self.players = players
+        self.synced = None
+
+    def cell(self, player):
+        return (int(player.x // self.cell_size), int(player.y // self.cell_size))
+
+    def rebuild(self):
+        self.cells.clear()
+        self.player_cells.clear()
+        for player in self.players:
+            if not player.is_dead:
+                self.insert(player, self.cell(player))
+
+    def insert(self, player, cell):
+        self.cells.setdefault(cell, []).append(player)
+        self.player_cells[player] = cell
+
+    def remove(self, player):
+        cell = self.player_cells.pop(player, None)
+        if cell is not None:
+            bucket = self.cells[cell]
+            bucket.remove(player)
+            if not bucket:
+                del self.cells[cell]
+
+    def move(self, player):
+        if player.is_dead:
+            self.remove(player)
+            return
+        cell = self.cell(player)
+        if self.player_cells.get(player) != cell:
+            self.remove(player)
+            self.insert(player, cell)
+
+    def query(self, player, radius):
+        """Other players that might be within radius of player, in player order"""
+        if len(self.players) < self.min_players:
+            return [other for other in self.players if other is not player]
+
+        index = self.order[player]
+        if self.synced is None:
+            self.rebuild()
+        else:
+            for moved in self.players[self.synced:index]:
+                self.move(moved)
+        self.synced = index
+
+        size = self.cell_size
+        found = []
+        for column in range(int((player.x - radius) // size), int((player.x + radius) // size) + 1):
+            for row in range(int((player.y - radius) // size), int((player.y + radius) // size) + 1):
+                bucket = self.cells.get((column, row))
+                if bucket:
+                    found.extend(other for other in bucket if other is not player)
+        if len(found) > 1:
+            found.sort(key=self.order.__getitem__)
+        return found
+
+class Player:
+    def __init__(self, x, y, color=BLUE, rng=None):
+        self.rng = rng or SimRandom()
+        self.x = x
+        self.y = y
+        self.width = 30
+        self.height = 40
+        self.vel_x = 0
+        self.vel_y = 0
+        self.speed = 8
+        self.jump_power = -15
+        self.gravity = 0.8
+        self.on_ground = False
+        self.color = color
+        self.is_dead = False
+        self.death_timer = 0
+        self.death_animation_duration = 60
+        self.is_stunned = False
+        self.stun_timer = 0
+        self.stun_duration = 120  # 2 seconds at 60 FPS
+        self.tag_cooldown = 0
+        self.tag_cooldown_duration = 30  # 0.5 second cooldown
+        self.punch_cooldown = 0
+        self.punch_cooldown_duration = 20  # 0.33 second cooldown
+        self.throw_cooldown = 0
+        self.throw_cooldown_duration = 60  # 1 second cooldown
+        self.slot = 0  # Index in the match's player list
+        self.telemetry = None  # Optional Telemetry told about attacks and deaths
+
+    def update(self, terrain, actions, other_players, grid=None):
+        if self.is_dead:
+            self.death_timer += 1
+            self.vel_y += self.gravity * 0.5
+            self.y += self.vel_y
+            return self.death_timer >= self.death_animation_duration
+
+        # Update stun timer
+        if self.is_stunned:
+            self.stun_timer += 1
+            if self.stun_timer >= self.stun_duration:
+                self.is_stunned = False
+                self.stun_timer = 0
+
+        # Update tag cooldown
+        if self.tag_cooldown > 0:
+            self.tag_cooldown -= 1
+
+        # Update punch cooldown
+        if self.punch_cooldown > 0:
+            self.punch_cooldown -= 1
+
+        # Update throw cooldown
+        if self.throw_cooldown > 0:
+            self.throw_cooldown -= 1
+
+        # Don't allow movement during terrain morphing or when stunned
+        if not terrain.is_morphing and not self.is_stunned:
+            # Check for tag input
+            if actions['tag'] and self.tag_cooldown == 0:
+                if self.telemetry:
+                    self.telemetry.attempt(self.slot, TAG)
+                for other_player in self.combat_targets(other_players, grid, TAG_RANGE):
+                    self.try_tag(other_player)
+
+            # Check for punch input
+            if actions['punch'] and self.punch_cooldown == 0:
+                if self.telemetry:
+                    self.telemetry.attempt(self.slot, PUNCH)
+                for other_player in self.combat_targets(other_players, grid, PUNCH_RANGE):
+                    self.try_punch(other_player)
+
+            # Check for throw input
+            if actions['throw'] and self.throw_cooldown == 0:
+                if self.telemetry:
+                    self.telemetry.attempt(self.slot, THROW)
+                for other_player in self.combat_targets(other_players, grid, THROW_RANGE):
+                    self.try_throw(other_player)
+
+            if actions['left']:
+                self.vel_x = -self.speed
+            elif actions['right']:
+                self.vel_x = self.speed
+            else:
+                self.vel_x *= 0.8
+
+            if actions['jump'] and self.on_ground:
+                self.vel_y = self.jump_power
+                self.on_ground = False
+        else:
+            # During morphing or stunned, apply friction but no input
+            self.vel_x *= 0.9
+
+        self.vel_y += self.gravity
+
+        start_x, start_y = self.x, self.y
+        self.x += self.vel_x
+        self.y += self.vel_y
+
+        if self.x < 0:
+            self.x = 0
+        elif self.x > WIDTH - self.width:
+            self.x = WIDTH - self.width
+
+        return self.check_terrain_collision(terrain, start_x, start_y)
+
+    def state(self):
+        """Tuple of every field the simulation reads, used for hashing and comparisons"""
+        return (self.x, self.y, self.vel_x, self.vel_y, self.on_ground,
+                self.is_dead, self.death_timer, self.is_stunned, self.stun_timer,
+                self.tag_cooldown, self.punch_cooldown, self.throw_cooldown)
+
+    def save_state(self):
+        return self.state() + (self.rng.getstate(),)
+
+    def load_state(self, saved):
+        (self.x, self.y, self.vel_x, self.vel_y, self.on_ground,
+         self.is_dead, self.death_timer, self.is_stunned, self.stun_timer,
+         self.tag_cooldown, self.punch_cooldown, self.throw_cooldown, rng_state) = saved
+        self.rng.setstate(rng_state)
+
+    def die(self, cause=DEATH_FELL):
+        if self.telemetry:
+            self.telemetry.record(DEATH, self.slot, detail=cause)
+        self.is_dead = True
+        self.death_timer = 0
+        self.vel_x = self.rng.randint(-5, 5)
+        self.vel_y = -8
+
+    def combat_targets(self, other_players, grid, radius):
+        """Players that might be within radius: nearby grid cells, or everyone without a grid"""
+        if grid is None:
+            return [other_player for other_player in other_players if other_player != self]
+        return grid.query(self, radius)
+
+    def try_tag(self, other_player):
+        # Check if players are close enough to tag
+        distance_sq = (self.x - other_player.x) ** 2 + (self.y - other_player.y) ** 2
+
+        if distance_sq <= TAG_RANGE ** 2 and not other_player.is_dead and not other_player.is_stunned:
+            other_player.is_stunned = True
+            other_player.stun_timer = 0
+            self.tag_cooldown = self.tag_cooldown_duration
+            if self.telemetry:
+                self.telemetry.record(HIT, self.slot, other_player.slot, TAG)
+
+    def try_punch(self, other_player):
+        # Check if players are close enough to punch
+        distance_sq = (self.x - other_player.x) ** 2 + (self.y - other_player.y) ** 2
+
+        if distance_sq <= PUNCH_RANGE ** 2 and not other_player.is_dead:
+            # Calculate knockback direction
+            dx = other_player.x - self.x
+            dy = other_player.y - self.y
+
+            # Normalize direction
+            distance = distance_sq ** 0.5
+            if distance > 0:
+                dx /= distance
+                dy /= distance
+
+            # Apply knockback
+            knockback_force = 12
+            other_player.vel_x += dx * knockback_force
+            other_player.vel_y += dy * knockback_force - 3  # Slight upward component
+
+            self.punch_cooldown = self.punch_cooldown_duration
+            if self.telemetry:
+                self.telemetry.record(HIT, self.slot, other_player.slot, PUNCH)
+
+    def try_throw(self, other_player):
+        # Check if players are close enough to throw
+        distance_sq = (self.x - other_player.x) ** 2 + (self.y - other_player.y) ** 2
+
+        if distance_sq <= THROW_RANGE ** 2 and not other_player.is_dead:
+            # Calculate direction towards center of stage
+            stage_center_x = WIDTH // 2
+            stage_center_y = HEIGHT // 2
+            
+            # Calculate direction from thrown player to stage center
+            dx = stage_center_x - other_player.x
+            dy = stage_center_y - other_player.y
+            
+            # Normalize direction
+            center_distance = (dx ** 2 + dy ** 2) ** 0.5
+            if center_distance > 0:
+                dx /= center_distance
+                dy /= center_distance
+            
+            # Apply throw force towards center
+            throw_force_x = 15
+            throw_force_y = -12  # Always have upward component for arc
+            
+            other_player.vel_x = dx * throw_force_x
+            other_player.vel_y = dy * throw_force_x + throw_force_y  # Combine center direction with upward arc
+            other_player.on_ground = False
+
+            self.throw_cooldown = self.throw_cooldown_duration
+            if self.telemetry:
+                self.telemetry.record(HIT, self.slot, other_player.slot, THROW)
+
+    def check_terrain_collision(self, terrain, start_x=None, start_y=None):
+        self.on_ground = False
+        # Holes and uncut platforms this x can touch, in list order; their rows are checked below
+        holes, platforms = terrain.surfaces_at(self.x, self.width)
+
+        swept = False
+        if start_y is not None:
+            # Stop on the first platform face crossed since (start_x, start_y), however thin it is
+            hit = first_platform_hit(platforms, start_x, start_y, self.x, self.y, self.width, self.height)
+            if hit is not None:
+                toi, normal, (left, platform_top, right, platform_bottom) = hit
+                if normal[1] < 0:
+                    self.y = platform_top - self.height
+                    self.on_ground = True
+                else:
+                    self.y = platform_bottom
+                self.vel_y = 0
+                swept = True
+
+        top = int(self.y)  # pygame.Rect truncates, as the old per-rect test did
+        bottom = top + self.height
+
+        # Check collision with holes (player falls through)
+        for hole_top, hole_bottom in holes:
+            if top < hole_bottom and bottom > hole_top and self.y + self.height >= hole_top:
+                if not self.is_dead:
+                    self.die(DEATH_HOLE)
+                return False
+
+        # Overlaps the sweep skips (entering from the side) still snap vertically.
+        # Only the first platform hit matters: resolving it zeroes vel_y
+        for left, platform_top, right, platform_bottom in () if swept else platforms:
+            if top < platform_bottom and bottom > platform_top:
+                if self.vel_y > 0:
+                    self.y = platform_top - self.height
+                    self.vel_y = 0
+                    self.on_ground = True
+                elif self.vel_y < 0:
+                    self.y = platform_bottom
+                    self.vel_y = 0
+                break
+
+        if self.y > HEIGHT:
+            if not self.is_dead:
+                self.die(DEATH_FELL)
+            return False
+        return False
@@ -0,0 +1,251 @@
+"""Per-phase frame profiler with a live overlay and Chrome trace export.
+
+Code marks the end of each phase with Profiler.mark(name); the span runs from the
+previous mark, so a frame needs one clock read per phase. Spans go into a fixed-size
+ring buffer, and each frame's per-phase totals feed a scrolling stacked graph. While
+the profiler is off, mark() returns straight away.
+
+Dump the buffer with write_trace() and open the file in chrome://tracing or Perfetto.
+pygame is only imported once the overlay is drawn, and json once a trace is written, so
+the simulation core can profile without loading either.
+LatencyHistogram collects input-to-display delays for the end-of-session report, and
+StartupTimer the milestones of the start-up report.
+"""
+import time
+from array import array
+from collections import deque
+
+SPAN_CAPACITY = 1 << 16  # Spans kept for trace export, about a minute of play
+GRAPH_FRAMES = 240  # Frames shown in the overlay graph, one pixel column each
+GRAPH_HEIGHT = 120
+GRAPH_MS = 33.3  # Frame time at the top of the graph
+FRAME_BUDGET_MS = 1000 / 60
+PANEL_REFRESH_FRAMES = 15  # Legend text is re-rendered this often; the graph scrolls every frame
+GROUP_COLORS = ((231, 76, 60), (46, 204, 113), (52, 152, 219), (241, 196, 15), (155, 89, 182),
+                (230, 126, 34), (26, 188, 156), (236, 240, 241), (149, 165, 166), (243, 104, 224))
+
+class Profiler:
+    """Ring buffer of named spans plus a rolling per-frame breakdown by phase group"""
+
+    def __init__(self, capacity=SPAN_CAPACITY, clock=time.perf_counter):
+        self.enabled = False
+        self.visible = False
+        self.clock = clock
+        self.capacity = capacity
+        self.names = [None] * capacity
+        self.starts = array('d', bytes(8 * capacity))
+        self.ends = array('d', bytes(8 * capacity))
+        self.head = 0
+        self.count = 0
+        self.last = clock()
+
+        self.frame_groups = {}  # Phase group -> seconds spent in it this frame
+        self.history = deque(maxlen=GRAPH_FRAMES)  # Finished frames' frame_groups
+        self.colors = {}
+        self.graph = None
+        self.panel = None
+        self.panel_age = 0
+        self.font = None
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+        self.last = self.clock()
+
+    def toggle_overlay(self):
+        """Show or hide the overlay; recording runs whenever it is shown"""
+        self.visible = not self.visible
+        self.panel = None
+        if self.visible and not self.enabled:
+            self.enable()
+
+    def start_frame(self):
+        """Close the current frame's breakdown and start timing the next one"""
+        if not self.enabled:
+            return
+        if self.frame_groups:
+            self.history.append(self.frame_groups)
+            if self.visible:
+                self.add_graph_column(self.frame_groups)
+            self.frame_groups = {}
+        self.last = self.clock()
+
+    def mark(self, name, group=None):
+        """End the span `name` that began at the previous mark; group merges spans in the graph"""
+        if not self.enabled:
+            return
+        now = self.clock()
+        head = self.head
+        self.names[head] = name
+        self.starts[head] = self.last
+        self.ends[head] = now
+        self.head = (head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        group = group or name
+        self.frame_groups[group] = self.frame_groups.get(group, 0.0) + (now - self.last)
+        self.last = now
+
+    def spans(self, seconds=None):
+        """Recorded (name, start, end) spans, oldest first, optionally only the last `seconds`"""
+        first = (self.head - self.count) % self.capacity
+        order = [(first + i) % self.capacity for i in range(self.count)]
+        spans = [(self.names[i], self.starts[i], self.ends[i]) for i in order]
+        if seconds is not None and spans:
+            cutoff = spans[-1][2] - seconds
+            spans = [span for span in spans if span[2] >= cutoff]
+        return spans
+
+    def trace_events(self, seconds=None):
+        """Spans as Chrome trace-event complete ("X") events, timestamps in microseconds"""
+        return [{"name": name, "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                 "ts": round(start * 1e6, 3), "dur": round((end - start) * 1e6, 3)}
+                for name, start, end in self.spans(seconds)]
+
+    def write_trace(self, path, seconds=None):
+        import json
+        events = self.trace_events(seconds)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+    def averages(self, frames=60):
+        """Mean milliseconds per frame for each group over the last `frames` frames"""
+        recent = list(self.history)[-frames:]
+        totals = {}
+        for groups in recent:
+            for group, seconds in groups.items():
+                totals[group] = totals.get(group, 0.0) + seconds
+        return {group: total * 1000 / len(recent) for group, total in totals.items()}
+
+    def color(self, group):
+        color = self.colors.get(group)
+        if color is None:
+            color = GROUP_COLORS[len(self.colors) % len(GROUP_COLORS)]
+            self.colors[group] = color
+        return color
+
+    def add_graph_column(self, groups):
+        """Scroll the graph one pixel and stack this frame's phases in the new column"""
+        import pygame
+        if self.graph is None:
+            self.graph = pygame.Surface((GRAPH_FRAMES, GRAPH_HEIGHT))
+            self.graph.fill((0, 0, 0))
+        graph = self.graph
+        graph.scroll(-1, 0)
+        x = GRAPH_FRAMES - 1
+        graph.fill((0, 0, 0), (x, 0, 1, GRAPH_HEIGHT))
+        bottom = GRAPH_HEIGHT
+        for group, seconds in groups.items():
+            height = seconds * 1000 / GRAPH_MS * GRAPH_HEIGHT
+            top = max(0, bottom - height)
+            if bottom - top >= 0.5:
+                graph.fill(self.color(group), (x, round(top), 1, max(1, round(bottom) - round(top))))
+            bottom = top
+        budget = GRAPH_HEIGHT - round(FRAME_BUDGET_MS / GRAPH_MS * GRAPH_HEIGHT)
+        graph.set_at((x, budget), (255, 255, 255))
+
+    def render_panel(self):
+        """Background and legend of per-phase averages, redrawn a few times a second"""
+        import pygame
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        averages = sorted(self.averages().items(), key=lambda item: -item[1])
+        line_height = 14
+        width = GRAPH_FRAMES + 8
+        panel = pygame.Surface((width, GRAPH_HEIGHT + 24 + line_height * len(averages)), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+        total = sum(ms for _, ms in averages)
+        title = self.font.render(f"frame {total:.2f} ms   F3 hide, F4 save trace", True, (255, 255, 255))
+        panel.blit(title, (4, GRAPH_HEIGHT + 8))
+        for i, (group, ms) in enumerate(averages):
+            row = GRAPH_HEIGHT + 24 + i * line_height
+            pygame.draw.rect(panel, self.color(group), (4, row + 2, 8, 8))
+            panel.blit(self.font.render(group, True, (230, 230, 230)), (16, row))
+            value = self.font.render(f"{ms:.2f} ms", True, (230, 230, 230))
+            panel.blit(value, (width - 4 - value.get_width(), row))
+        self.panel = panel
+        self.panel_age = 0
+
+    def draw(self, screen, x=10, y=None):
+        """Graph and legend in the bottom-left corner by default; returns the area drawn"""
+        if not self.visible:
+            return None
+        self.panel_age += 1
+        if self.panel is None or self.panel_age >= PANEL_REFRESH_FRAMES:
+            self.render_panel()
+        if y is None:
+            y = screen.get_height() - self.panel.get_height() - 10
+        bounds = screen.blit(self.panel, (x, y))
+        if self.graph is not None:
+            screen.blit(self.graph, (x + 4, y + 4))
+        return bounds
+
+class LatencyHistogram:
+    """Latencies counted in fixed-width millisecond buckets; the last bucket catches the rest"""
+
+    def __init__(self, bucket_ms=2, max_ms=100):
+        self.bucket_ms = bucket_ms
+        self.counts = [0] * (max_ms // bucket_ms + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        self.counts[min(int(ms // self.bucket_ms), len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th latency, in milliseconds"""
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min((i + 1) * self.bucket_ms, self.max)
+        return self.max
+
+    def report(self, label, width=40):
+        """Summary line plus one bar per bucket that has samples"""
+        if not self.count:
+            return f"{label}: no samples"
+        lines = [f"{label}: {self.count} samples, mean {self.total / self.count:.1f} ms, "
+                 f"p50 {self.percentile(0.5):.0f} ms, p95 {self.percentile(0.95):.0f} ms, "
+                 f"p99 {self.percentile(0.99):.0f} ms, max {self.max:.1f} ms"]
+        peak = max(self.counts)
+        for i, count in enumerate(self.counts):
+            if count:
+                low = i * self.bucket_ms
+                span = f"{low:>4}+    ms" if i == len(self.counts) - 1 else f"{low:>4}-{low + self.bucket_ms:<4} ms"
+                lines.append(f"  {span} {count:>6} {'#' * max(1, round(count / peak * width))}")
+        return "\n".join(lines)
+
+class StartupTimer:
+    """Start-up milestones, reported as the time each took after the one before"""
+
+    def __init__(self, started, clock=time.perf_counter):
+        self.started = started
+        self.clock = clock
+        self.marks = []
+
+    def mark(self, name, at=None, since=None):
+        """Record that `name` finished now or at clock time `at`, having started at `since`.
+
+        Milestones start when the one before them finished unless `since` says otherwise,
+        as for work done on another thread.
+        """
+        self.marks.append((name, self.clock() if at is None else at, since))
+
+    def report(self, label="Startup"):
+        marks = sorted(self.marks, key=lambda mark: mark[1])
+        total = (marks[-1][1] - self.started) * 1000 if marks else 0.0
+        lines = [f"{label}: {total:.0f} ms"]
+        last = self.started
+        for name, at, since in marks:
+            took = at - (last if since is None else since)
+            lines.append(f"  {name:<16} {took * 1000:>7.1f} ms   done at {(at - self.started) * 1000:>7.1f} ms")
+            if since is None:
+                last = at
+        return "\n".join(lines)
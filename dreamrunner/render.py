@@ -0,0 +1,641 @@
+"""Drawing: sprites, terrain, sky, the start screen and dirty-rectangle repaints.
+
+Importing this module loads pygame but starts no SDL subsystem; init_display() opens
+video and fonts when a window is wanted.
+"""
+import math
+import random
+import time
+from collections import OrderedDict
+
+import pygame
+
+from .constants import (BLACK, DARK_GREEN, DIRTY_SKY_INTERVAL_MS, GREEN, HEIGHT, LIGHT_BLUE, MIDNIGHT_BLUE,
+                        ORANGE, PLATFORM_GRAY, PLATFORM_HIGHLIGHT, PLAYER_SPRITE_PADDING, PLAYER_SPRITE_TOP, PURPLE,
+                        RED, SKY_BUCKETS, SKY_CACHE_SIZE, STAR_COUNT, STAR_SEED, TERRAIN_SPRITE_PADDING,
+                        TEXT_CACHE_SIZE, UI_BACKGROUND, UI_TEXT, WARNING_RED, WHITE, WIDTH, YELLOW)
+from .player import Player
+
+STARTED = time.perf_counter()
+
+def ticks_ms():
+    """Milliseconds since import; pygame.time.get_ticks reads 0 until pygame.init() has run"""
+    return int((time.perf_counter() - STARTED) * 1000)
+
+def init_display():
+    """Start SDL video and fonts, the only subsystems the start screen needs"""
+    pygame.display.init()
+    pygame.font.init()
+
+class TextCache:
+    """Font registry and bounded LRU cache of rendered text surfaces"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        """Return the default font at the given size, creating it only once"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color, antialias=True):
+        """Return a rendered text surface, rasterizing it only on a cache miss"""
+        key = (text, size, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.surfaces),
+            'fonts': len(self.fonts),
+        }
+
+# Shared by every screen so static HUD strings are rasterized once
+text_cache = TextCache()
+
+# Cosmetic randomness (grass, flowers, shake, particles) never touches the simulation streams
+fx_random = random.Random()
+
+# Spiral eye dots for each stun tick: the spiral turns 15 degrees a tick, dots at radius 2-4
+SPIRAL_OFFSETS = [[((2 + i) * math.cos(math.radians(step * 15 + i * 120)),
+                    (2 + i) * math.sin(math.radians(step * 15 + i * 120))) for i in range(3)]
+                  for step in range(24)]
+
+class PlayerSprites:
+    """Every frame a player of one color can show, baked side by side into one atlas surface.
+
+    Frame 0 is standing, frames 1 to stun_duration are the stun ticks (pulsing color,
+    turning spiral eyes and the countdown box) and the last two are the death flashes.
+    """
+
+    def __init__(self, color, width, height, stun_duration):
+        self.width = width
+        self.height = height
+        self.stun_duration = stun_duration
+        self.frame_width = width + 2 + 2 * PLAYER_SPRITE_PADDING  # Shadow is offset 2 px
+        self.frame_height = PLAYER_SPRITE_TOP + height + 10 + PLAYER_SPRITE_PADDING  # Legs reach 10 px below
+        self.death_frame = 1 + stun_duration
+        frames = self.death_frame + 2
+        atlas = pygame.Surface((self.frame_width * frames, self.frame_height), pygame.SRCALPHA)
+        for frame in range(frames):
+            x = frame * self.frame_width + PLAYER_SPRITE_PADDING
+            y = PLAYER_SPRITE_TOP
+            if frame >= self.death_frame:
+                self.paint(atlas, x, y, color, dead=True, flash=frame == self.death_frame)
+            elif frame > 0:
+                self.paint(atlas, x, y, color, stunned=True, stun_timer=frame - 1)
+            else:
+                self.paint(atlas, x, y, color)
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        self.atlas = atlas
+
+    def paint(self, surface, x, y, color, stunned=False, stun_timer=0, dead=False, flash=False):
+        """Draw one frame with primitives, with the body's top-left corner at (x, y)"""
+        width, height, stun_duration = self.width, self.height, self.stun_duration
+        if dead:
+            # Enhanced death animation; Game.spawn_effects bursts particles from the body
+            death_color = RED if flash else ORANGE
+
+            # Draw spinning death effect with gradient
+            death_rect = pygame.Rect(x, y, width, height)
+            pygame.draw.rect(surface, death_color, death_rect)
+
+            # Add inner glow effect
+            inner_color = (255, 200, 200) if flash else (255, 220, 180)
+            inner_rect = pygame.Rect(x + 3, y + 3, width - 6, height - 6)
+            pygame.draw.rect(surface, inner_color, inner_rect)
+
+            # Draw X eyes for death
+            eye_color = BLACK
+            pygame.draw.line(surface, eye_color, (x + 6, y + 8), (x + 10, y + 12), 3)
+            pygame.draw.line(surface, eye_color, (x + 10, y + 8), (x + 6, y + 12), 3)
+            pygame.draw.line(surface, eye_color, (x + 20, y + 8), (x + 24, y + 12), 3)
+            pygame.draw.line(surface, eye_color, (x + 24, y + 8), (x + 20, y + 12), 3)
+
+            # Add glowing outline
+            pygame.draw.rect(surface, WHITE, death_rect, 1)
+            pygame.draw.rect(surface, BLACK, death_rect, 3)
+        else:
+            # Enhanced player drawing with shadows and effects
+            player_color = color
+            shadow_color = (max(0, color[0] - 60), max(0, color[1] - 60), max(0, color[2] - 60))
+
+            if stunned:
+                # Pulsing effect when stunned
+                pulse = abs(math.sin(stun_timer * 0.2)) * 0.5 + 0.5
+                player_color = tuple(int(c * pulse + 128 * (1 - pulse)) for c in color)
+
+            # Draw shadow
+            shadow_rect = pygame.Rect(x + 2, y + 2, width, height)
+            pygame.draw.rect(surface, shadow_color, shadow_rect)
+
+            # Draw main body with gradient effect
+            main_rect = pygame.Rect(x, y, width, height)
+            pygame.draw.rect(surface, player_color, main_rect)
+
+            # Add highlight on top half
+            highlight_color = tuple(min(255, c + 40) for c in player_color)
+            highlight_rect = pygame.Rect(x + 2, y + 2, width - 4, height // 2 - 2)
+            pygame.draw.rect(surface, highlight_color, highlight_rect)
+
+            # Enhanced eyes
+            if stunned:
+                # Swirling spiral eyes
+                pygame.draw.circle(surface, WHITE, (int(x + 8), int(y + 10)), 5)
+                pygame.draw.circle(surface, WHITE, (int(x + 22), int(y + 10)), 5)
+
+                for dx, dy in SPIRAL_OFFSETS[stun_timer % len(SPIRAL_OFFSETS)]:
+                    pygame.draw.circle(surface, BLACK, (int(x + 8 + dx), int(y + 10 + dy)), 1)
+                    pygame.draw.circle(surface, BLACK, (int(x + 22 + dx), int(y + 10 + dy)), 1)
+            else:
+                # Normal eyes with shine
+                pygame.draw.circle(surface, WHITE, (int(x + 8), int(y + 10)), 5)
+                pygame.draw.circle(surface, WHITE, (int(x + 22), int(y + 10)), 5)
+                pygame.draw.circle(surface, BLACK, (int(x + 8), int(y + 10)), 3)
+                pygame.draw.circle(surface, BLACK, (int(x + 22), int(y + 10)), 3)
+                # Eye shine
+                pygame.draw.circle(surface, WHITE, (int(x + 9), int(y + 9)), 1)
+                pygame.draw.circle(surface, WHITE, (int(x + 23), int(y + 9)), 1)
+
+            # Enhanced legs with shoes
+            leg_color = tuple(max(0, c - 30) for c in player_color)
+            pygame.draw.rect(surface, leg_color, (x + 8, y + height, 6, 8))
+            pygame.draw.rect(surface, leg_color, (x + 16, y + height, 6, 8))
+            # Shoes
+            pygame.draw.rect(surface, BLACK, (x + 6, y + height + 6, 10, 4))
+            pygame.draw.rect(surface, BLACK, (x + 14, y + height + 6, 10, 4))
+
+            # Enhanced outline with glow effect
+            outline_width = 3 if stunned else 2
+            if stunned:
+                # Glowing outline when stunned
+                glow_color = YELLOW
+                for i in range(3):
+                    pygame.draw.rect(surface, glow_color, main_rect, outline_width + i)
+
+            pygame.draw.rect(surface, BLACK, main_rect, outline_width)
+
+            # Floating stun indicator
+            if stunned:
+                remaining_time = (stun_duration - stun_timer) // 60 + 1
+                # Background for text
+                text_bg = pygame.Rect(x + 5, y - 25, 20, 15)
+                pygame.draw.rect(surface, UI_BACKGROUND, text_bg)
+                pygame.draw.rect(surface, WARNING_RED, text_bg, 2)
+
+                stun_text = text_cache.render(str(remaining_time), 20, WHITE)
+                surface.blit(stun_text, (x + 10, y - 23))
+
+    def draw(self, screen, player, x, y):
+        """Blit the frame for the player's state; returns the area covered"""
+        if player.is_dead:
+            frame = self.death_frame + (0 if player.death_timer % 10 < 5 else 1)
+        elif player.is_stunned:
+            frame = 1 + min(player.stun_timer, self.stun_duration - 1)
+        else:
+            frame = 0
+        area = (frame * self.frame_width, 0, self.frame_width, self.frame_height)
+        return screen.blit(self.atlas, (int(x) - PLAYER_SPRITE_PADDING, int(y) - PLAYER_SPRITE_TOP), area)
+
+class SpriteAtlas:
+    """Baked PlayerSprites for every player color and size in use"""
+
+    def __init__(self):
+        self.sprites = {}
+        self.bake_seconds = 0.0
+
+    def get(self, color, width, height, stun_duration):
+        key = (tuple(color), width, height, stun_duration)
+        sprites = self.sprites.get(key)
+        if sprites is None:
+            start = time.perf_counter()
+            sprites = PlayerSprites(*key)
+            self.bake_seconds += time.perf_counter() - start
+            self.sprites[key] = sprites
+        return sprites
+
+    def bake(self, colors):
+        """Bake frames for these colors ahead of time; returns the seconds spent on new ones"""
+        template = Player(0, 0)
+        before = self.bake_seconds
+        for color in colors:
+            self.get(color, template.width, template.height, template.stun_duration)
+        return self.bake_seconds - before
+
+    def draw(self, screen, player, position=None):
+        """Blit the player's baked frame and return the area it covers, stun timer included"""
+        # position overrides (x, y) when the renderer interpolates between ticks
+        x, y = position if position is not None else (player.x, player.y)
+        sprites = self.get(player.color, player.width, player.height, player.stun_duration)
+        return sprites.draw(screen, player, x, y)
+
+player_sprites = SpriteAtlas()
+
+class TerrainRenderer:
+    """Draws a TerrainSystem: platforms from sprites baked per layout, holes with a pulsing glow"""
+
+    def __init__(self):
+        self.platform_sprites = []
+        self.baked = None  # (terrain, geometry_version) the sprites were baked for
+
+    def bake(self, terrain):
+        """Render every platform once into its own sprite, reused until the geometry changes"""
+        self.platform_sprites = []
+        pad = TERRAIN_SPRITE_PADDING
+
+        for i, platform in enumerate(terrain.platforms):
+            sprite = pygame.Surface((platform.width + 2 * pad, platform.height + 2 * pad), pygame.SRCALPHA)
+            local_rect = pygame.Rect(pad, pad, platform.width, platform.height)
+
+            if i == 0:  # Ground platform
+                # Draw ground with gradient
+                base_color = DARK_GREEN
+                top_color = GREEN
+
+                # Draw gradient effect
+                for y_offset in range(local_rect.height):
+                    ratio = y_offset / local_rect.height
+                    r = int(top_color[0] * (1 - ratio) + base_color[0] * ratio)
+                    g = int(top_color[1] * (1 - ratio) + base_color[1] * ratio)
+                    b = int(top_color[2] * (1 - ratio) + base_color[2] * ratio)
+                    line_rect = pygame.Rect(local_rect.x, local_rect.y + y_offset, local_rect.width, 1)
+                    pygame.draw.rect(sprite, (r, g, b), line_rect)
+
+                # Add grass texture
+                flower_colors = [RED, YELLOW, PURPLE]
+                for x in range(local_rect.x, local_rect.x + local_rect.width, 4):
+                    grass_height = fx_random.randint(3, 6)
+                    grass_color = tuple(min(255, c + fx_random.randint(-20, 20)) for c in GREEN)
+                    pygame.draw.line(sprite, grass_color, (x, local_rect.y), (x, local_rect.y - grass_height), 2)
+
+                    # Add some flowers
+                    if fx_random.randint(1, 40) == 1:
+                        flower_color = fx_random.choice(flower_colors)
+                        pygame.draw.circle(sprite, flower_color, (x, local_rect.y - 2), 2)
+            else:  # Regular platforms
+                # Draw platform with 3D effect
+                main_color = PLATFORM_GRAY
+                highlight_color = PLATFORM_HIGHLIGHT
+                shadow_color = tuple(max(0, c - 40) for c in main_color)
+
+                # Shadow
+                shadow_rect = pygame.Rect(local_rect.x + 2, local_rect.y + 2, local_rect.width, local_rect.height)
+                pygame.draw.rect(sprite, shadow_color, shadow_rect)
+
+                # Main platform
+                pygame.draw.rect(sprite, main_color, local_rect)
+
+                # Highlight on top
+                highlight_rect = pygame.Rect(local_rect.x, local_rect.y, local_rect.width, 4)
+                pygame.draw.rect(sprite, highlight_color, highlight_rect)
+
+                # Add texture lines
+                for y in range(local_rect.y + 5, local_rect.y + local_rect.height - 2, 3):
+                    pygame.draw.line(sprite, shadow_color, (local_rect.x + 2, y), (local_rect.x + local_rect.width - 2, y))
+
+            # Enhanced outline
+            pygame.draw.rect(sprite, BLACK, local_rect, 2)
+
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self.platform_sprites.append(sprite)
+
+        self.baked = (terrain, terrain.geometry_version)
+
+    def draw(self, screen, terrain):
+        shake_intensity = terrain.shake_intensity()
+        self.draw_platforms(screen, terrain, shake_intensity)
+        self.draw_holes(screen, terrain, shake_intensity)
+
+    def draw_platforms(self, screen, terrain, shake_intensity=0):
+        """Draw the platforms and return the area each one covers"""
+        if self.baked != (terrain, terrain.geometry_version):
+            self.bake(terrain)
+        pad = TERRAIN_SPRITE_PADDING
+
+        # Blit the baked platforms, shaking each one just before a morph
+        bounds = []
+        for platform, sprite in zip(terrain.platforms, self.platform_sprites):
+            if shake_intensity > 0:
+                shake_x = fx_random.randint(-int(shake_intensity), int(shake_intensity))
+                shake_y = fx_random.randint(-int(shake_intensity//2), int(shake_intensity//2))
+                bounds.append(screen.blit(sprite, (platform.x + shake_x - pad, platform.y + shake_y - pad)))
+            else:
+                bounds.append(screen.blit(sprite, (platform.x - pad, platform.y - pad)))
+        return bounds
+
+    def platform_bounds(self, terrain):
+        """Screen area of each platform sprite when it isn't shaking"""
+        pad = TERRAIN_SPRITE_PADDING
+        return [pygame.Rect(platform).inflate(2 * pad, 2 * pad) for platform in terrain.platforms]
+
+    def draw_holes(self, screen, terrain, shake_intensity=0):
+        """Draw the glowing holes and return the area each one covers"""
+        # Pulsing red glow effect, shared by every hole this frame
+        glow_intensity = abs(math.sin(ticks_ms() * 0.005)) * 100 + 100
+        glow_colors = []
+        glow_color = (int(glow_intensity), 0, 0)
+        for i in range(4):
+            glow_colors.append(glow_color)
+            glow_color = tuple(max(0, c - 25) for c in glow_color)
+
+        # Draw holes with enhanced danger effects
+        bounds = []
+        for hole in terrain.holes:
+            if shake_intensity > 0:
+                shake_x = fx_random.randint(-int(shake_intensity), int(shake_intensity))
+                shake_y = fx_random.randint(-int(shake_intensity//2), int(shake_intensity//2))
+                draw_hole = pygame.Rect(hole.x + shake_x, hole.y + shake_y, 
+                                      hole.width, hole.height)
+            else:
+                draw_hole = hole
+
+            # Draw hole with glowing red edges
+            pygame.draw.rect(screen, BLACK, draw_hole)
+
+            # Multiple glow layers
+            for i in range(4):
+                glow_rect = pygame.Rect(draw_hole.x - i, draw_hole.y - i, draw_hole.width + 2*i, draw_hole.height + 2*i)
+                pygame.draw.rect(screen, glow_colors[i], glow_rect, 2)
+            bounds.append(glow_rect)
+        return bounds
+
+class BackgroundLayer:
+    """Pre-rendered sky gradient and star field shared by the game and start screen"""
+
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        self.width = width
+        self.height = height
+        # Gradient surfaces keyed by (top_color, bottom_color), least recently used first
+        self.gradients = OrderedDict()
+        self.cache_size = SKY_CACHE_SIZE
+
+        # Star positions and sizes never change, so roll them once with a private RNG
+        # (same sequence the old per-frame random.seed(42) loop produced)
+        star_rng = random.Random(STAR_SEED)
+        self.star_x = []
+        self.star_y = []
+        self.star_brightness = []
+        self.star_size = []
+        for _ in range(STAR_COUNT):
+            self.star_x.append(star_rng.randint(0, width))
+            self.star_y.append(star_rng.randint(0, height // 2))
+            self.star_brightness.append(star_rng.randint(150, 255))
+            self.star_size.append(star_rng.randint(1, 3))
+
+    def sky_colors(self, time_factor):
+        # Snap the time factor to one of SKY_BUCKETS levels between 0.4 and 1.0
+        level = round((time_factor - 0.4) / 0.6 * (SKY_BUCKETS - 1))
+        level = min(max(level, 0), SKY_BUCKETS - 1)
+        bucket_factor = 0.4 + 0.6 * level / (SKY_BUCKETS - 1)
+
+        top_color = tuple(int(c * bucket_factor) for c in MIDNIGHT_BLUE)
+        bottom_color = tuple(int(c * bucket_factor) for c in LIGHT_BLUE)
+        return top_color, bottom_color
+
+    def gradient(self, top_color, bottom_color):
+        """Return the cached full-screen vertical gradient between two colors"""
+        key = (top_color, bottom_color)
+        surface = self.gradients.get(key)
+        if surface is not None:
+            self.gradients.move_to_end(key)
+            return surface
+
+        # Paint a one pixel wide strip and stretch it, instead of drawing every row full width
+        strip = pygame.Surface((1, self.height))
+        for y in range(self.height):
+            ratio = y / self.height
+            r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
+            g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
+            b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
+            strip.set_at((0, y), (r, g, b))
+        surface = pygame.transform.scale(strip, (self.width, self.height))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
+        self.gradients[key] = surface
+        while len(self.gradients) > self.cache_size:
+            self.gradients.popitem(last=False)
+        return surface
+
+    def sky_at(self, ticks):
+        # Time-based color shifting of the sky
+        time_factor = math.sin(ticks * 0.0005) * 0.3 + 0.7
+        return self.sky_colors(time_factor)
+
+    def draw(self, screen, ticks, sky=None):
+        """Sky and stars at `ticks`; sky overrides the gradient colors"""
+        screen.blit(self.gradient(*(sky or self.sky_at(ticks))), (0, 0))
+        self.draw_stars(screen, ticks, range(STAR_COUNT))
+
+    def star_bounds(self, i):
+        """Screen area star i can cover, glow included"""
+        radius = self.star_size[i] + 2
+        return pygame.Rect(self.star_x[i] - radius, self.star_y[i] - radius, 2 * radius + 1, 2 * radius + 1)
+
+    def draw_stars(self, screen, ticks, stars):
+        # Only the twinkle is computed per frame
+        for i in stars:
+            twinkle = abs(math.sin((ticks + i * 100) * 0.01)) * 0.5 + 0.5
+            brightness = int(self.star_brightness[i] * twinkle)
+            position = (self.star_x[i], self.star_y[i])
+            size = self.star_size[i]
+            pygame.draw.circle(screen, (brightness, brightness, brightness), position, size)
+
+            # Add star glow for larger stars
+            if size > 2:
+                glow = brightness // 3
+                pygame.draw.circle(screen, (glow, glow, glow), position, size + 2)
+
+class StartScreen:
+    def __init__(self, screen, font, background=None):
+        self.screen = screen
+        self.font = font
+        self.background = background or BackgroundLayer()
+        self.selected_option = 0
+        self.options = ["2 Players", "3 Players"]
+        self.loading = None  # An AssetLoader's progress() while it runs, shown as a bar
+
+    def handle_input(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.selected_option = (self.selected_option - 1) % len(self.options)
+            elif event.key == pygame.K_DOWN:
+                self.selected_option = (self.selected_option + 1) % len(self.options)
+            elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
+                return self.selected_option + 2
+        return None
+
+    def draw(self):
+        self.screen.blit(self.background.gradient(MIDNIGHT_BLUE, LIGHT_BLUE), (0, 0))
+
+        title_text = text_cache.render("DREAM RUNNER", 72, WHITE)
+        title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 4))
+        self.screen.blit(title_text, title_rect)
+
+        subtitle_text = text_cache.render("Choose Player Mode", 48, YELLOW)
+        subtitle_rect = subtitle_text.get_rect(center=(WIDTH // 2, HEIGHT // 3))
+        self.screen.blit(subtitle_text, subtitle_rect)
+
+        for i, option in enumerate(self.options):
+            y_pos = HEIGHT // 2 + i * 80
+            color = YELLOW if i == self.selected_option else WHITE
+
+            if i == self.selected_option:
+                option_bg = pygame.Rect(WIDTH // 2 - 100, y_pos - 25, 200, 50)
+                pygame.draw.rect(self.screen, UI_BACKGROUND, option_bg)
+                pygame.draw.rect(self.screen, YELLOW, option_bg, 3)
+
+            option_text = text_cache.render(option, 48, color)
+            option_rect = option_text.get_rect(center=(WIDTH // 2, y_pos))
+            self.screen.blit(option_text, option_rect)
+
+        controls_text = text_cache.render("Use UP/DOWN arrows and ENTER to select", 32, WHITE)
+        controls_rect = controls_text.get_rect(center=(WIDTH // 2, HEIGHT - 100))
+        self.screen.blit(controls_text, controls_rect)
+
+        if self.loading:
+            done, total, status = self.loading
+            bar = pygame.Rect(WIDTH // 2 - 100, HEIGHT - 50, 200, 8)
+            pygame.draw.rect(self.screen, UI_BACKGROUND, bar)
+            pygame.draw.rect(self.screen, LIGHT_BLUE, (bar.x, bar.y, bar.width * done // total, bar.height))
+            status_text = text_cache.render(status, 24, UI_TEXT)
+            self.screen.blit(status_text, status_text.get_rect(midbottom=(WIDTH // 2, bar.y - 4)))
+
+class DirtyRenderer:
+    """Draws a round in progress by repainting only what changed since the last frame.
+
+    The sky, a still frame of the stars and the HUD chrome are composed once into a base
+    layer, and the base plus the platforms into a backdrop. Each frame restores last
+    frame's regions from the backdrop, draws the holes, uncovered stars, players,
+    particles and HUD counters on top, and returns every region it touched for
+    pygame.display.update. While the terrain shakes before a morph the platforms move too,
+    so they are drawn each frame over the base instead. A new terrain, sky step or HUD
+    setting rebuilds both layers and sends the whole screen.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.base = None
+        self.backdrop = None
+        self.chrome = None  # HUD chrome alone on a transparent layer, redrawn over what crosses it
+        self.chrome_bounds = []
+        self.key = None  # What the layers were built from
+        self.sky = None
+        self.sky_ticks = 0
+        self.twinkling = []  # Stars clear of platforms and chrome, redrawn every frame
+        self.twinkle_bounds = []
+        self.previous = []  # Regions drawn last frame, restored this frame
+        self.shaking = False
+        self.screen_rect = game.screen.get_rect()
+
+    def invalidate(self):
+        """Send the whole screen next frame, e.g. after the window was covered"""
+        self.key = None
+
+    def build_layers(self, ticks):
+        game = self.game
+        size = game.screen.get_size()
+        self.base = pygame.Surface(size).convert()
+        game.background.draw(self.base, ticks, self.sky)
+        self.backdrop = self.base.copy()
+        self.chrome_bounds = game.draw_hud_chrome(self.base)
+        game.terrain_renderer.draw_platforms(self.backdrop, game.terrain)
+        game.draw_hud_chrome(self.backdrop)
+        self.chrome = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        game.draw_hud_chrome(self.chrome)
+
+        # Stars partly behind a platform or the chrome stay as they are in the layers,
+        # and so do stars overlapping them, since repainting a neighbour would cut into them
+        background = game.background
+        covered = game.terrain_renderer.platform_bounds(game.terrain) + self.chrome_bounds
+        bounds = [background.star_bounds(i) for i in range(STAR_COUNT)]
+        still = [rect for rect in bounds if rect.collidelist(covered) >= 0]
+        self.twinkling = [i for i, rect in enumerate(bounds)
+                          if rect.collidelist(covered) < 0 and rect.collidelist(still) < 0]
+        self.twinkle_bounds = [bounds[i].clip(self.screen_rect) for i in self.twinkling]
+
+    def draw(self, alpha=1.0):
+        """Draw the frame; returns the regions to update, or None when the whole screen changed"""
+        game = self.game
+        screen = game.screen
+        terrain = game.terrain
+        terrain_renderer = game.terrain_renderer
+        background = game.background
+        profiler = game.profiler
+        ticks = ticks_ms()
+
+        if self.key is None or ticks - self.sky_ticks >= DIRTY_SKY_INTERVAL_MS:
+            self.sky = background.sky_at(ticks)
+            self.sky_ticks = ticks
+        key = (terrain, terrain.geometry_version, game.num_players, game.music_playing, self.sky)
+        shake_intensity = terrain.shake_intensity()
+        full = key != self.key
+        if full:
+            self.build_layers(ticks)
+            self.key = key
+            self.previous = [self.screen_rect]
+        elif shake_intensity > 0 and not self.shaking:
+            # The platforms start moving, so clear them from where they were resting
+            self.previous += [rect.clip(self.screen_rect) for rect in terrain_renderer.platform_bounds(terrain)]
+        source = self.base if shake_intensity > 0 else self.backdrop
+        for rect in self.previous:
+            screen.blit(source, rect, rect)
+        self.shaking = shake_intensity > 0
+        sky = background.gradient(*self.sky)
+        for rect in self.twinkle_bounds:
+            screen.blit(sky, rect, rect)
+        background.draw_stars(screen, ticks, self.twinkling)
+        profiler.mark("background draw")
+
+        drawn = terrain_renderer.draw_platforms(screen, terrain, shake_intensity) if self.shaking else []
+        drawn += terrain_renderer.draw_holes(screen, terrain, shake_intensity)
+        profiler.mark("terrain draw")
+        if game.effects:
+            game.spawn_effects(game.effects.update(ticks))
+        for player, position in zip(game.players, game.render_positions(alpha)):
+            drawn.append(player_sprites.draw(screen, player, position))
+        profiler.mark("player draw")
+        if game.effects:
+            game.effects.draw(screen)
+            drawn += game.effects.bounds()
+            profiler.mark("particles")
+
+        # The HUD sits on top of everything, so put the chrome back over anything drawn across it
+        for rect in drawn:
+            if rect.collidelist(self.chrome_bounds) >= 0:
+                screen.blit(self.chrome, rect, rect)
+        regions = drawn + game.draw_hud_counters(screen)
+        profiler.mark("hud")
+
+        if profiler.visible:
+            regions.append(profiler.draw(screen))
+            profiler.mark("profiler overlay")
+
+        # Twinkling stars repaint their own background, so they are never restored
+        screen_rect = self.screen_rect
+        regions = [rect.clip(screen_rect) for rect in regions]
+        update = None if full else self.previous + regions + self.twinkle_bounds
+        self.previous = regions
+        return update
+
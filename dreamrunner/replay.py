@@ -0,0 +1,183 @@
+"""Replay files: every player's control bits, run-length encoded and compressed"""
+import bisect
+import struct
+import zlib
+
+from .inputs import InputProvider, pack_actions, unpack_actions
+from .match import Match
+
+# Replay file layout: header, then a zlib-compressed stream of varints
+REPLAY_MAGIC = b"DRRP"
+REPLAY_VERSION = 3  # 3: rounds end as a tie after MAX_ROUND_TICKS
+REPLAY_HEADER = struct.Struct("<4sBBQII")  # magic, version, players, seed, first round, frames
+REPLAY_KEYFRAME_INTERVAL = 600  # Frames between in-memory seek keyframes
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class ReplayRecorder:
+    """Run-length encodes the packed control bits of every player, one entry per Match.step"""
+
+    def __init__(self, seed, num_players, first_round=1):
+        self.seed = seed
+        self.num_players = num_players
+        self.first_round = first_round
+        self.runs = []  # [value, length] pairs
+        self.restarts = []  # Frames at which the match was restarted with R
+        self.frame_count = 0
+
+    def record(self, actions_list):
+        # Six bits per player, player 1 in the lowest bits; 0 while no input is polled
+        value = 0
+        for i, actions in enumerate(actions_list):
+            value |= pack_actions(actions) << (6 * i)
+
+        if self.runs and self.runs[-1][0] == value:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([value, 1])
+        self.frame_count += 1
+
+    def mark_restart(self):
+        self.restarts.append(self.frame_count)
+
+    def encode(self):
+        body = bytearray()
+        write_varint(body, len(self.restarts))
+        previous = 0
+        for frame in self.restarts:
+            write_varint(body, frame - previous)
+            previous = frame
+        write_varint(body, len(self.runs))
+        for value, length in self.runs:
+            write_varint(body, length)
+            write_varint(body, value)
+
+        header = REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.num_players,
+                                    self.seed, self.first_round, self.frame_count)
+        return header + zlib.compress(bytes(body), 9)
+
+class Replay:
+    """Decoded replay with random access to any frame's control bits"""
+
+    def __init__(self, seed, num_players, first_round, frame_count, runs, restarts):
+        self.seed = seed
+        self.num_players = num_players
+        self.first_round = first_round
+        self.frame_count = frame_count
+        self.restarts = set(restarts)
+        # Parallel lists: the first frame of each run and its value, searched with bisect
+        self.run_starts = []
+        self.run_values = []
+        frame = 0
+        for value, length in runs:
+            self.run_starts.append(frame)
+            self.run_values.append(value)
+            frame += length
+
+    @classmethod
+    def decode(cls, data):
+        magic, version, num_players, seed, first_round, frame_count = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("Not a Dream Runner replay (or an unsupported version)")
+
+        body = zlib.decompress(data[REPLAY_HEADER.size:])
+        count, pos = read_varint(body, 0)
+        restarts = []
+        frame = 0
+        for _ in range(count):
+            delta, pos = read_varint(body, pos)
+            frame += delta
+            restarts.append(frame)
+
+        count, pos = read_varint(body, pos)
+        runs = []
+        for _ in range(count):
+            length, pos = read_varint(body, pos)
+            value, pos = read_varint(body, pos)
+            runs.append((value, length))
+        return cls(seed, num_players, first_round, frame_count, runs, restarts)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.decode(f.read())
+
+    def value_at(self, frame):
+        return self.run_values[bisect.bisect_right(self.run_starts, frame) - 1]
+
+class ReplayInput(InputProvider):
+    def __init__(self, player):
+        self.player = player  # The ReplayPlayer whose current frame is being simulated
+
+    def poll(self, game, player_index):
+        return unpack_actions((self.player.value >> (6 * player_index)) & 0x3F)
+
+class ReplayPlayer:
+    """Feeds a Replay through Match.step, with keyframes for fast seeking.
+
+    Pass dreamrunner.app.Game as game_class to watch the replay in a window.
+    """
+
+    def __init__(self, replay, game_class=Match, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.frame = 0
+        self.value = 0
+
+        inputs = [ReplayInput(self) for _ in range(replay.num_players)]
+        self.game = game_class(inputs=inputs, seed=replay.seed)
+        if not self.game.headless:
+            self.game.in_start_screen = False
+        self.game.round_index = replay.first_round - 1
+        self.game.init_game(replay.num_players, reset_scores=True)
+
+        self.keyframes = {0: self.game.save_state()}
+        self.keyframe_frames = [0]
+
+    def finished(self):
+        return self.frame >= self.replay.frame_count
+
+    def step(self):
+        if self.frame in self.replay.restarts:
+            self.game.restart(reset_scores=False)
+        self.value = self.replay.value_at(self.frame)
+        self.game.step()
+        self.frame += 1
+
+        if self.frame % self.keyframe_interval == 0 and self.frame not in self.keyframes:
+            self.keyframes[self.frame] = self.game.save_state()
+            bisect.insort(self.keyframe_frames, self.frame)
+
+    def seek(self, frame):
+        """Jump to a frame by restoring the closest earlier keyframe and simulating forward"""
+        frame = min(max(frame, 0), self.replay.frame_count)
+        start = self.keyframe_frames[bisect.bisect_right(self.keyframe_frames, frame) - 1]
+        if frame < self.frame or start > self.frame:
+            self.game.load_state(self.keyframes[start])
+            self.frame = start
+        while self.frame < frame:
+            self.step()
+
+    def play(self, speed=1.0):
+        """Play to the end: speed 1 is real time, 10 is ten ticks per frame, 0 runs unthrottled"""
+        if self.game.headless or not speed:
+            while not self.finished():
+                self.step()
+            return
+
+        self.game.watch(self, speed)
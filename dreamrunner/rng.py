@@ -0,0 +1,44 @@
+"""Seeded random streams and state hashing for reproducible matches"""
+import hashlib
+import random
+
+class SimRandom(random.Random):
+    """Random stream that caches its state between draws, so frequent snapshots stay cheap"""
+
+    def __init__(self, seed=None):
+        self.cached_state = None
+        super().__init__(seed)
+
+    def seed(self, *args, **kwargs):
+        super().seed(*args, **kwargs)
+        self.cached_state = None
+
+    def random(self):
+        self.cached_state = None
+        return super().random()
+
+    def getrandbits(self, k):
+        self.cached_state = None
+        return super().getrandbits(k)
+
+    def getstate(self):
+        if self.cached_state is None:
+            self.cached_state = super().getstate()
+        return self.cached_state
+
+    def setstate(self, state):
+        if state is not self.cached_state:
+            super().setstate(state)
+            self.cached_state = state
+
+def stream_key(seed, *stream):
+    """The string a stream's RNG is seeded with"""
+    return "/".join(str(part) for part in (seed,) + stream)
+
+def make_rng(seed, *stream):
+    """Return an independent RNG for one simulation stream, derived from the match seed"""
+    return SimRandom(stream_key(seed, *stream))
+
+def state_digest(state):
+    """Short stable hash of a tuple of simulation state"""
+    return hashlib.blake2b(repr(state).encode(), digest_size=8).hexdigest()
@@ -0,0 +1,224 @@
+"""Gameplay telemetry: attacks, deaths, morphs and round results, streamed to disk.
+
+The simulation calls Telemetry.record() for each event, which fills one slot of a
+preallocated ring buffer and never waits on anything. A TelemetryWriter thread drains
+the ring once a second into zlib-compressed column blocks in telemetry-*.drt files,
+starts a new file once one passes its size limit and deletes the oldest beyond a
+count, so memory and disk use both stay flat however long the game runs. If the writer
+falls behind, new events are dropped and counted instead of growing the buffer.
+
+read_telemetry() loads a file back as columns; telemetry_report.py summarizes them.
+"""
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+
+# Event kinds
+ATTEMPT = 1  # player pressed an attack that was off cooldown; detail is the move
+HIT = 2  # player's attack connected with target; detail is the move
+DEATH = 3  # detail is the cause
+MORPH = 4  # detail is the number of holes in the new layout
+ROUND = 5  # player won (NO_PLAYER for a tie); tick is the round length, detail the player count
+KIND_NAMES = {ATTEMPT: "attempt", HIT: "hit", DEATH: "death", MORPH: "morph", ROUND: "round"}
+
+# Attack moves and death causes, stored in the detail column
+TAG, PUNCH, THROW = 0, 1, 2
+MOVE_NAMES = ("tag", "punch", "throw")
+DEATH_HOLE, DEATH_FELL = 0, 1
+CAUSE_NAMES = ("hole", "fell off screen")
+NO_PLAYER = 255
+
+# One array per column, in file order
+COLUMNS = (("ms", 'I'), ("round", 'I'), ("tick", 'I'), ("kind", 'B'),
+           ("player", 'B'), ("target", 'B'), ("detail", 'B'))
+
+# Telemetry file layout: header, then blocks of (header, zlib-compressed columns)
+TELEMETRY_MAGIC = b"DRTM"
+TELEMETRY_VERSION = 1
+TELEMETRY_HEADER = struct.Struct("<4sBd")  # magic, version, session start (Unix time)
+BLOCK_HEADER = struct.Struct("<III")  # events, events dropped before this block, compressed bytes
+TELEMETRY_CAPACITY = 1 << 14  # Events buffered between flushes
+FLUSH_SECONDS = 1.0
+FILE_BYTES = 1 << 20  # A new file is started once the current one passes this size
+KEEP_FILES = 64  # Older files are deleted, capping disk use at about KEEP_FILES * FILE_BYTES
+
+def little_endian(column):
+    """Copy of an array in little-endian byte order, as stored in the files"""
+    if sys.byteorder == "little":
+        return column
+    column = array(column.typecode, column)
+    column.byteswap()
+    return column
+
+class Telemetry:
+    """Fixed-size ring of events, written by the simulation and drained by one TelemetryWriter.
+
+    record() only ever advances head and drain() only tail, so the two threads never need a
+    lock: the simulation stops writing when the ring is full rather than overtaking the reader.
+    """
+
+    def __init__(self, capacity=TELEMETRY_CAPACITY, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self.started = clock()
+        self.started_at = time.time()
+        self.columns = [array(typecode, bytes(array(typecode).itemsize * capacity)) for _, typecode in COLUMNS]
+        self.head = 0  # Events recorded so far
+        self.tail = 0  # Events drained so far
+        self.dropped = 0
+        self.drained_dropped = 0
+        self.match = None  # The Match whose round and tick each event is stamped with
+        self.last_attempts = {}  # (player, move) -> (round, tick) of the last attempt, to spot held buttons
+
+    def record(self, kind, player=NO_PLAYER, target=NO_PLAYER, detail=0):
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return
+        i = head % self.capacity
+        ms, round_index, tick, kinds, players, targets, details = self.columns
+        ms[i] = int((self.clock() - self.started) * 1000)
+        round_index[i] = self.match.round_index
+        tick[i] = self.match.score
+        kinds[i] = kind
+        players[i] = player
+        targets[i] = target
+        details[i] = detail
+        self.head = head + 1
+
+    def attempt(self, player, move):
+        """Record an attack press; a button held down since the previous tick is not a new attempt"""
+        now = (self.match.round_index, self.match.score)
+        last = self.last_attempts.get((player, move))
+        self.last_attempts[player, move] = now
+        if last != (now[0], now[1] - 1):
+            self.record(ATTEMPT, player, detail=move)
+
+    def drain(self):
+        """Take every event recorded so far: (columns, events dropped since the last drain)"""
+        head, tail = self.head, self.tail
+        count = head - tail
+        start = tail % self.capacity
+        end = start + count
+        if end <= self.capacity:
+            columns = [column[start:end] for column in self.columns]
+        else:
+            columns = [column[start:] + column[:end - self.capacity] for column in self.columns]
+        self.tail = head
+        dropped = self.dropped - self.drained_dropped
+        self.drained_dropped += dropped
+        return columns, dropped
+
+class TelemetryWriter:
+    """Background thread that appends a Telemetry's events to rotating files in a directory"""
+
+    def __init__(self, telemetry, directory, file_bytes=FILE_BYTES, keep_files=KEEP_FILES,
+                 interval=FLUSH_SECONDS):
+        self.telemetry = telemetry
+        self.directory = directory
+        self.file_bytes = file_bytes
+        self.keep_files = keep_files
+        self.interval = interval
+        self.file = None
+        self.files_started = 0
+        self.events_written = 0
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="telemetry writer", daemon=True)
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        """Write out what is left in the ring and stop the thread"""
+        self.stopping.set()
+        self.thread.join()
+
+    def report(self):
+        dropped = self.telemetry.dropped
+        return (f"Wrote {self.events_written} telemetry events to {self.directory}"
+                + (f" ({dropped} dropped while the writer was behind)" if dropped else ""))
+
+    def run(self):
+        try:
+            while not self.stopping.wait(self.interval):
+                self.flush()
+            self.flush()
+        except OSError as e:
+            # The ring keeps filling and dropping, so the game carries on without telemetry
+            print(f"Telemetry writer stopped: {e}")
+        finally:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+    def flush(self):
+        columns, dropped = self.telemetry.drain()
+        count = len(columns[0])
+        if not count and not dropped:
+            return
+        body = zlib.compress(b"".join(little_endian(column).tobytes() for column in columns))
+        if self.file is None:
+            self.open_file()
+        self.file.write(BLOCK_HEADER.pack(count, dropped, len(body)) + body)
+        self.file.flush()
+        self.events_written += count
+        if self.file.tell() >= self.file_bytes:
+            self.file.close()
+            self.file = None
+            self.remove_old_files()
+
+    def open_file(self):
+        # The sequence number keeps names unique and in order when files rotate within a second
+        name = time.strftime("telemetry-%Y%m%d-%H%M%S") + f"-{self.files_started:04d}.drt"
+        self.files_started += 1
+        self.file = open(os.path.join(self.directory, name), "wb")
+        self.file.write(TELEMETRY_HEADER.pack(TELEMETRY_MAGIC, TELEMETRY_VERSION, self.telemetry.started_at))
+
+    def remove_old_files(self):
+        names = telemetry_files(self.directory)
+        for path in names[:max(0, len(names) - self.keep_files)]:
+            os.remove(path)
+
+def telemetry_files(directory):
+    """Telemetry files in a directory, oldest first"""
+    names = sorted(name for name in os.listdir(directory) if name.startswith("telemetry-") and name.endswith(".drt"))
+    return [os.path.join(directory, name) for name in names]
+
+def read_telemetry(path):
+    """Load one file: (session start as Unix time, {column name: array}, events dropped).
+
+    A block cut short by a crash or a copy of a file still being written ends the read early.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < TELEMETRY_HEADER.size:
+        raise ValueError(f"{path} is not a Dream Runner telemetry file")
+    magic, version, started_at = TELEMETRY_HEADER.unpack_from(data)
+    if magic != TELEMETRY_MAGIC or version != TELEMETRY_VERSION:
+        raise ValueError(f"{path} is not a Dream Runner telemetry file (or an unsupported version)")
+
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+    dropped = 0
+    pos = TELEMETRY_HEADER.size
+    while pos + BLOCK_HEADER.size <= len(data):
+        count, block_dropped, size = BLOCK_HEADER.unpack_from(data, pos)
+        pos += BLOCK_HEADER.size
+        if pos + size > len(data):
+            break
+        body = zlib.decompress(data[pos:pos + size])
+        pos += size
+        offset = 0
+        for name, typecode in COLUMNS:
+            column = array(typecode)
+            length = count * column.itemsize
+            column.frombytes(body[offset:offset + length])
+            offset += length
+            columns[name].extend(little_endian(column))
+        dropped += block_dropped
+    return started_at, columns, dropped
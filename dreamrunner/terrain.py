@@ -0,0 +1,336 @@
+"""Terrain layouts, the queue that prepares them ahead of time, and the morphing TerrainSystem"""
+import bisect
+import functools
+import math
+import random
+import time
+
+from .constants import (GROUND, HEIGHT, LAYOUT_CACHE_SIZE, LAYOUT_QUEUE_SIZE, MAX_JUMP_GAP, MAX_JUMP_RISE,
+                        MORPH_SAFE_ZONE, PLACEMENT_ATTEMPTS, PLATFORM_CLEARANCE, SPAWN_SAFE_ZONE,
+                        SURFACE_INDEX_CACHE_SIZE, WIDTH)
+from .geometry import Rect, spawn_positions
+from .rng import SimRandom
+
+class LayoutRandom(random.Random):
+    """random.Random with a leaner randint that draws exactly the same numbers.
+
+    Random.randint goes through randrange's argument checks on every call, which was a
+    third of the time spent generating a layout.
+    """
+
+    def randint(self, low, high):
+        span = high - low + 1
+        bits = span.bit_length()
+        value = self.getrandbits(bits)
+        while value >= span:
+            value = self.getrandbits(bits)
+        return low + value
+
+def place_holes(rng, count, widths, spawns=(), attempts=PLACEMENT_ATTEMPTS):
+    """Ground holes that overlap neither each other nor any spawn point's safe zone"""
+    holes = []
+    for _ in range(count):
+        for _ in range(attempts):
+            x = rng.randint(100, WIDTH - 200)
+            width = rng.randint(*widths)
+            if any(x < spawn_x + SPAWN_SAFE_ZONE and x + width > spawn_x - SPAWN_SAFE_ZONE for spawn_x in spawns):
+                continue
+            if any(x < hole_x + hole_width and x + width > hole_x for hole_x, _, hole_width, _ in holes):
+                continue
+            holes.append((x, HEIGHT - 60, width, 60))
+            break
+    return holes
+
+def jump_reaches(surface, platform):
+    """Whether a player standing on surface can jump (or drop) onto platform"""
+    x, y, width, _ = platform
+    gap = max(x - (surface[0] + surface[2]), surface[0] - (x + width), 0)
+    return surface[1] - y <= MAX_JUMP_RISE and gap <= MAX_JUMP_GAP
+
+def platform_fits(platform, platforms):
+    """No overlap with the placed platforms, room to stand between stacked ones, and reachable"""
+    x, y, width, height = platform
+    right = x + width
+    reachable = jump_reaches(GROUND, platform)
+    for other_x, other_y, other_width, other_height in platforms:
+        other_right = other_x + other_width
+        if x < other_right and other_x < right:
+            gap = other_y - (y + height) if y < other_y else y - (other_y + other_height)
+            if gap < PLATFORM_CLEARANCE:
+                return False
+        # jump_reaches(other, platform), inlined since this runs for every placement attempt
+        if (not reachable and other_y - y <= MAX_JUMP_RISE and x - other_right <= MAX_JUMP_GAP
+                and other_x - right <= MAX_JUMP_GAP):
+            reachable = True
+    return reachable
+
+def place_platform(rng, platforms, sample, attempts=PLACEMENT_ATTEMPTS):
+    for _ in range(attempts):
+        platform = sample()
+        if platform_fits(platform, platforms):
+            platforms.append(platform)
+            return
+
+@functools.lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def generate_layout(layout_seed, index, num_players):
+    """Layout `index` of a terrain: (platforms, holes) as (x, y, width, height) tuples, ground excluded.
+
+    Layout 0 is the round's starting stage and later ones are morphs. Each depends only on
+    the layout seed and its index, so it can be made ahead of time, and recent ones are kept
+    so a rollback that re-simulates a morph doesn't generate it again.
+    """
+    # Layout streams are never snapshotted, so the plain Random skips SimRandom's per-draw bookkeeping
+    rng = LayoutRandom(f"{layout_seed}/{index}")
+    platforms = []
+    if index == 0:
+        holes = place_holes(rng, 2, (60, 120), spawn_positions(num_players))
+        for _ in range(6):
+            place_platform(rng, platforms, lambda: (rng.randint(100, WIDTH - 200), rng.randint(200, HEIGHT - 150),
+                                                    rng.randint(80, 200), 20))
+    else:
+        holes = place_holes(rng, rng.randint(2, 5), (60, 150))
+
+        def sample_morph_platform():
+            x, y = rng.randint(0, WIDTH - 150), rng.randint(150, HEIGHT - 150)
+            width, height = rng.randint(60, 250), rng.randint(15, 25)
+            if rng.random() < 0.1:
+                width = max(width - rng.randint(10, 30), 30)
+            return (x, y, width, height)
+
+        for _ in range(rng.randint(4, 8)):
+            if rng.random() >= 0.2:
+                place_platform(rng, platforms, sample_morph_platform)
+    return tuple(platforms), tuple(holes)
+
+@functools.lru_cache(maxsize=SURFACE_INDEX_CACHE_SIZE)
+def surface_index(geometry, width):
+    """Split the stage into x ranges that each touch a fixed set of holes and uncut platforms.
+
+    geometry is a TerrainSystem.geometry() tuple and the result is (breaks, regions). A player
+    at x overlaps a rect's columns for x in [rect.x - width + 1, rect.right), since its Rect
+    truncates x, and a platform is cut under it for x in (hole.x - width, hole.right) of any
+    hole on the platform's top edge. Every bound is an integer, so each breakpoint gets a region
+    of its own and the open ranges between them are sampled at their midpoints. Cached, since
+    rollbacks restore the same few geometries over and over.
+    """
+    platforms = [Rect(platform) for platform in geometry[0]]
+    holes = [Rect(hole) for hole in geometry[1]]
+    cuts = {}
+    breaks = set()
+    for hole in holes:
+        breaks.update((hole.x - width + 1, hole.right))
+    for index, platform in enumerate(platforms):
+        breaks.update((platform.x - width + 1, platform.right))
+        cuts[index] = [(hole.x - width, hole.right) for hole in holes
+                       if hole.x < platform.right and hole.right > platform.x and hole.y == platform.y]
+        for start, end in cuts[index]:
+            breaks.update((start, end))
+    breaks = sorted(breaks)
+
+    regions = []
+    for i in range(2 * len(breaks) + 1):
+        if i % 2:
+            x = breaks[i // 2]
+        elif breaks:
+            x = breaks[i // 2] - 0.5 if i // 2 < len(breaks) else breaks[-1] + 0.5
+        else:
+            x = 0
+        left = math.floor(x)
+        region_holes = tuple((hole.top, hole.bottom) for hole in holes if hole.x - width < left < hole.right)
+        region_platforms = tuple((platform.left, platform.top, platform.right, platform.bottom)
+                                 for index, platform in enumerate(platforms)
+                                 if platform.x - width < left < platform.right
+                                 and not any(start < x < end for start, end in cuts[index]))
+        regions.append((region_holes, region_platforms))
+    return tuple(breaks), tuple(regions)
+
+class LayoutQueue:
+    """Upcoming terrain layouts, generated while the game loop waits out its frame cap.
+
+    The queue follows one terrain at a time. take() hands over a prepared layout, or builds it
+    inline on a miss, and never generates ahead itself; refill() uses the idle time before the
+    next frame to top up the look-ahead window. Since a layout depends only on its seed and
+    index, the result is exactly what inline generation would give.
+    """
+
+    def __init__(self, size=LAYOUT_QUEUE_SIZE, clock=time.perf_counter):
+        self.size = size
+        self.clock = clock
+        self.stream = None  # (layout seed, players) of the terrain being followed
+        self.next_index = 0  # Next layout that terrain will ask for
+        self.ready = {}  # index -> layout
+        self.slowest = 0.0  # Longest a layout has taken to generate, in seconds
+        self.taken = 0
+        self.misses = 0  # Layouts take() had to generate inline
+
+    def follow(self, layout_seed, num_players, index):
+        """Prepare layouts for the given terrain from now on, starting at layout index"""
+        if self.stream != (layout_seed, num_players):
+            self.stream = (layout_seed, num_players)
+            self.ready.clear()
+        self.next_index = index
+        for stale in [i for i in self.ready if i < index]:
+            del self.ready[stale]
+
+    def take(self, layout_seed, num_players, index):
+        layout = self.ready.pop(index, None) if self.stream == (layout_seed, num_players) else None
+        self.taken += 1
+        if layout is None:
+            self.misses += 1
+            layout = generate_layout(layout_seed, index, num_players)
+        self.follow(layout_seed, num_players, index + 1)
+        return layout
+
+    def wanted(self):
+        """First layout in the look-ahead window that isn't ready, or None"""
+        if self.stream is None:
+            return None
+        for index in range(self.next_index, self.next_index + self.size):
+            if index not in self.ready:
+                return index
+        return None
+
+    def refill(self, deadline):
+        """Generate wanted layouts while the slowest one so far would still finish before deadline"""
+        index = self.wanted()
+        while index is not None and self.clock() + self.slowest < deadline:
+            start = self.clock()
+            self.ready[index] = generate_layout(self.stream[0], index, self.stream[1])
+            self.slowest = max(self.slowest, self.clock() - start)
+            index = self.wanted()
+
+class TerrainSystem:
+    def __init__(self, num_players=2, rng=None, layouts=None):
+        self.rng = rng or SimRandom()
+        # Every layout this terrain shows is generated from the layout seed and its index alone
+        self.layout_seed = self.rng.getrandbits(64)
+        self.layout_index = 0
+        self.layouts = layouts  # Optional LayoutQueue that prepares upcoming layouts between frames
+        self.platforms = []
+        self.holes = []
+        self.morph_timer = 0
+        self.base_morph_interval = 180
+        self.morph_interval = self.base_morph_interval
+        self.is_morphing = False
+        self.morph_duration = 30
+        self.morph_progress = 0
+        self.num_players = num_players
+        self.geometry_version = 0  # Bumped whenever platforms or holes change
+        self.geometry_cache = None
+        self.geometry_cache_version = -1
+        self.surface_breaks = ()
+        self.surface_regions = (((), ()),)
+        self.surface_index_key = None  # (geometry_version, player width) the index was built for
+        self.generate_initial_terrain()
+
+    def next_layout(self):
+        index = self.layout_index
+        self.layout_index += 1
+        if self.layouts is not None:
+            return self.layouts.take(self.layout_seed, self.num_players, index)
+        return generate_layout(self.layout_seed, index, self.num_players)
+
+    def generate_initial_terrain(self):
+        platforms, holes = self.next_layout()
+        self.platforms = [Rect(GROUND)] + [Rect(platform) for platform in platforms]
+        self.holes = [Rect(hole) for hole in holes]
+        self.geometry_changed()
+
+    def geometry_changed(self):
+        """Call after editing platforms or holes so anything cached from them is rebuilt"""
+        self.geometry_version += 1
+
+    def update(self, score, player_xs=None):
+        """Advance the morph timers; player_xs() lists living players' x, read only when a morph starts"""
+        if self.is_morphing:
+            self.morph_progress += 1
+            if self.morph_progress >= self.morph_duration:
+                self.is_morphing = False
+                self.morph_progress = 0
+        else:
+            self.morph_timer += 1
+
+            # Calculate faster interval based on score
+            difficulty_factor = min(score // 500, 10)  # Every 50 points (500/10), increase difficulty
+            self.morph_interval = max(self.base_morph_interval - (difficulty_factor * 20), 60)  # Minimum 1 second
+
+            if self.morph_timer >= self.morph_interval:
+                self.start_morph(player_xs() if player_xs else ())
+                self.morph_timer = 0
+
+    def geometry(self):
+        """Platforms and holes as nested tuples, cached until the geometry changes"""
+        if self.geometry_cache_version != self.geometry_version:
+            self.geometry_cache = (tuple(tuple(platform) for platform in self.platforms),
+                                   tuple(tuple(hole) for hole in self.holes))
+            self.geometry_cache_version = self.geometry_version
+        return self.geometry_cache
+
+    def build_surface_index(self, width):
+        self.surface_breaks, self.surface_regions = surface_index(self.geometry(), width)
+        self.surface_index_key = (self.geometry_version, width)
+
+    def surfaces_at(self, x, width):
+        """Holes as (top, bottom) and uncut platforms as (left, top, right, bottom) that a player at x overlaps"""
+        if self.surface_index_key != (self.geometry_version, width):
+            self.build_surface_index(width)
+        breaks = self.surface_breaks
+        i = bisect.bisect_left(breaks, x)
+        if i < len(breaks) and breaks[i] == x:
+            return self.surface_regions[2 * i + 1]
+        return self.surface_regions[2 * i]
+
+    def surfaces_by_scan(self, x, width):
+        """surfaces_at worked out by checking every hole and platform, as collision did before the index"""
+        left = int(x)
+        holes = tuple((hole.top, hole.bottom) for hole in self.holes if left < hole.right and left + width > hole.x)
+        platforms = tuple((platform.left, platform.top, platform.right, platform.bottom)
+                          for platform in self.platforms
+                          if left < platform.right and left + width > platform.x
+                          and not any(hole.x < platform.right and hole.right > platform.x and hole.y == platform.y
+                                      and x + width > hole.x and x < hole.right for hole in self.holes))
+        return holes, platforms
+
+    def state(self):
+        """Tuple of the terrain geometry, morph timers and the layouts still to come"""
+        return (self.geometry(), self.morph_timer, self.morph_interval, self.is_morphing, self.morph_progress,
+                self.layout_seed, self.layout_index)
+
+    def save_state(self):
+        # The layout seed and index decide every later morph, so state() already covers them
+        return self.state()
+
+    def load_state(self, saved):
+        # A snapshot from another round brings that round's layout seed with it
+        (geometry, self.morph_timer, self.morph_interval, self.is_morphing, self.morph_progress,
+         self.layout_seed, self.layout_index) = saved
+        # Snapshots share the cached geometry tuple, so unchanged terrain is an identity check
+        current = self.geometry()
+        if geometry is not current:
+            if geometry != current:
+                platforms, holes = geometry
+                self.platforms = [Rect(platform) for platform in platforms]
+                self.holes = [Rect(hole) for hole in holes]
+                self.geometry_changed()
+            self.geometry_cache = geometry
+            self.geometry_cache_version = self.geometry_version
+
+    def start_morph(self, player_xs=()):
+        self.is_morphing = True
+        self.morph_progress = 0
+        self.morph_terrain(player_xs)
+
+    def morph_terrain(self, player_xs=()):
+        """Swap in the next layout; player_xs are living players' x positions"""
+        platforms, holes = self.next_layout()
+        self.platforms = [self.platforms[0]] + [Rect(platform) for platform in platforms]
+        # Layouts are made before anyone knows where the players will be, so this check waits until now
+        self.holes = [Rect(hole) for hole in holes
+                      if not any(hole[0] < x + MORPH_SAFE_ZONE and hole[0] + hole[2] > x - MORPH_SAFE_ZONE
+                                 for x in player_xs)]
+        self.geometry_changed()
+
+    def shake_intensity(self):
+        """How far platforms and holes jitter this frame; nonzero just before a morph"""
+        return max(0, 30 - (self.morph_interval - self.morph_timer)) * 0.5
+
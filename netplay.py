@@ -0,0 +1,617 @@
+"""Networked multiplayer: an authoritative UDP server and a predicting client.
+
+The server runs the normal Match simulation headless at a fixed tick. Clients send
+their control bits every tick and draw the snapshots they get back, predicting their
+own player and interpolating everyone else.
+
+    python netplay.py server --players 2 --port 7777
+    python netplay.py client 192.168.1.10:7777
+    python netplay.py loopback --latency 40 --jitter 10 --loss 0.05
+"""
+import argparse
+import heapq
+import random
+import socket
+import struct
+import time
+from collections import deque, OrderedDict
+
+from dreamrunner import FPS, InputProvider, Match, Rect, pack_actions, random_scripts, unpack_actions
+
+# Message types
+MSG_HELLO = 1
+MSG_INPUT = 2
+MSG_BYE = 3
+MSG_WELCOME = 11
+MSG_SNAPSHOT = 12
+
+HELLO = struct.Struct("<BI")  # type, client nonce
+WELCOME = struct.Struct("<BIBBB")  # type, client nonce, slot, players, tick rate
+INPUT_HEADER = struct.Struct("<BIIB")  # type, newest input sequence, terrain key held, input count
+# type, server tick, last input sequence applied, score, round, game over, winner,
+# round end timer, morph timer, morph interval, morph progress, morphing
+SNAPSHOT_HEADER = struct.Struct("<BIIIHBBBHHHB")
+PLAYER_STATE = struct.Struct("<ffffBHHBBB")  # position, velocity, flags, stun/death timers, cooldowns
+TERRAIN_HEADER = struct.Struct("<IBB")  # terrain key, platform count, hole count
+RECT = struct.Struct("<hhhh")
+
+INPUT_REDUNDANCY = 8  # Every input packet repeats this many recent inputs to ride out loss
+MAX_INPUT_BUFFER = 3  # Server-side inputs queued per client before old ones are dropped
+SNAPSHOT_INTERVAL = 2  # Server ticks between snapshots (30 Hz at a 60 Hz tick)
+INTERPOLATION_DELAY = 6  # Ticks remote players are drawn behind the newest snapshot
+HELLO_RETRY = 0.2  # Seconds between connection attempts
+
+WINNER_NONE = 255
+WINNER_TIE = 254
+
+ON_GROUND = 1
+IS_DEAD = 2
+IS_STUNNED = 4
+
+def terrain_key(game):
+    # Geometry changes within a round bump the version; a new round changes the round number
+    return ((game.round_index & 0xFFFF) << 16) | (game.terrain.geometry_version & 0xFFFF)
+
+def encode_winner(winner):
+    if winner is None:
+        return WINNER_NONE
+    if winner == "Tie":
+        return WINNER_TIE
+    return int(winner.split()[-1]) - 1
+
+def decode_winner(code):
+    if code == WINNER_NONE:
+        return None
+    if code == WINNER_TIE:
+        return "Tie"
+    return f"Player {code + 1}"
+
+def encode_player(player):
+    flags = (ON_GROUND if player.on_ground else 0) | (IS_DEAD if player.is_dead else 0) | (IS_STUNNED if player.is_stunned else 0)
+    return PLAYER_STATE.pack(player.x, player.y, player.vel_x, player.vel_y, flags,
+                             min(player.stun_timer, 0xFFFF), min(player.death_timer, 0xFFFF),
+                             player.tag_cooldown, player.punch_cooldown, player.throw_cooldown)
+
+def apply_player(player, state, x=None, y=None):
+    (player.x, player.y, player.vel_x, player.vel_y, flags, player.stun_timer, player.death_timer,
+     player.tag_cooldown, player.punch_cooldown, player.throw_cooldown) = state
+    player.on_ground = bool(flags & ON_GROUND)
+    player.is_dead = bool(flags & IS_DEAD)
+    player.is_stunned = bool(flags & IS_STUNNED)
+    if x is not None:
+        player.x = x
+        player.y = y
+
+def encode_snapshot(game, tick, ack, include_terrain):
+    terrain = game.terrain
+    parts = [SNAPSHOT_HEADER.pack(MSG_SNAPSHOT, tick, ack, game.score, game.round_index & 0xFFFF,
+                                  game.game_over, encode_winner(game.winner), min(game.round_end_timer, 255),
+                                  terrain.morph_timer, terrain.morph_interval, terrain.morph_progress,
+                                  terrain.is_morphing)]
+    parts.append(struct.pack(f"<{game.num_players}H", *game.player_scores))
+    parts.extend(encode_player(player) for player in game.players)
+
+    if include_terrain:
+        parts.append(b"\x01")
+        parts.append(TERRAIN_HEADER.pack(terrain_key(game), len(terrain.platforms), len(terrain.holes)))
+        parts.extend(RECT.pack(*rect) for rect in terrain.platforms)
+        parts.extend(RECT.pack(*rect) for rect in terrain.holes)
+    else:
+        parts.append(b"\x00")
+    return b"".join(parts)
+
+def decode_snapshot(data, num_players):
+    """Split a snapshot into its header fields, scores, player states and optional terrain"""
+    header = SNAPSHOT_HEADER.unpack_from(data)
+    pos = SNAPSHOT_HEADER.size
+    scores = struct.unpack_from(f"<{num_players}H", data, pos)
+    pos += 2 * num_players
+
+    players = []
+    for _ in range(num_players):
+        players.append(PLAYER_STATE.unpack_from(data, pos))
+        pos += PLAYER_STATE.size
+
+    terrain = None
+    if data[pos]:
+        key, num_platforms, num_holes = TERRAIN_HEADER.unpack_from(data, pos + 1)
+        pos += 1 + TERRAIN_HEADER.size
+        rects = [RECT.unpack_from(data, pos + i * RECT.size) for i in range(num_platforms + num_holes)]
+        terrain = (key, rects[:num_platforms], rects[num_platforms:])
+    return header, scores, players, terrain
+
+class NetworkConditions:
+    """Simulated one-way latency, jitter and packet loss for outgoing datagrams"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, loss=0.0, seed=None):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.loss = loss
+        self.rng = random.Random(seed)
+
+    def delivery_delay(self):
+        """Seconds until a packet goes out, or None if it is dropped"""
+        if self.rng.random() < self.loss:
+            return None
+        return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+class Endpoint:
+    """Non-blocking UDP socket that can hold packets back to simulate a bad network"""
+
+    def __init__(self, address, conditions=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sock.bind(address)
+        self.address = self.sock.getsockname()
+        self.conditions = conditions
+        self.delayed = []  # Heap of (send time, order, data, address)
+        self.order = 0
+        self.packets_dropped = 0
+
+    def send(self, data, address):
+        if self.conditions is None:
+            self.sock.sendto(data, address)
+            return
+        delay = self.conditions.delivery_delay()
+        if delay is None:
+            self.packets_dropped += 1
+            return
+        self.order += 1
+        heapq.heappush(self.delayed, (time.perf_counter() + delay, self.order, data, address))
+
+    def flush(self):
+        now = time.perf_counter()
+        while self.delayed and self.delayed[0][0] <= now:
+            _, _, data, address = heapq.heappop(self.delayed)
+            self.sock.sendto(data, address)
+
+    def receive(self):
+        packets = []
+        while True:
+            try:
+                packets.append(self.sock.recvfrom(2048))
+            except (BlockingIOError, ConnectionResetError):
+                return packets
+
+    def close(self):
+        self.sock.close()
+
+class RemoteInput(InputProvider):
+    """Server-side input for one player slot, fed by the client's INPUT packets"""
+
+    def __init__(self):
+        self.pending = {}  # Input sequence -> control bits
+        self.last_applied = 0
+        self.bits = 0
+
+    def receive(self, newest, inputs):
+        for age, bits in enumerate(inputs):
+            sequence = newest - age
+            if sequence > self.last_applied:
+                self.pending[sequence] = bits
+
+    def advance(self):
+        """Consume the next input in sequence, repeating the last one while it is late"""
+        if len(self.pending) > MAX_INPUT_BUFFER:
+            # The client got ahead of us; drop the oldest inputs instead of adding latency
+            for sequence in sorted(self.pending)[:-MAX_INPUT_BUFFER]:
+                del self.pending[sequence]
+            self.last_applied = min(self.pending) - 1
+
+        sequence = self.last_applied + 1
+        if sequence not in self.pending and self.pending:
+            # Later inputs arrived without this one, so it is lost for good
+            sequence = min(self.pending)
+        if sequence in self.pending:
+            self.bits = self.pending.pop(sequence)
+            self.last_applied = sequence
+
+    def reset(self):
+        self.pending.clear()
+        self.last_applied = 0
+        self.bits = 0
+
+    def poll(self, game, player_index):
+        return unpack_actions(self.bits)
+
+class ClientSlot:
+    def __init__(self, slot, address, nonce):
+        self.slot = slot
+        self.address = address
+        self.nonce = nonce
+        self.terrain_key = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.packets_in = 0
+        self.packets_out = 0
+        self.joined_at = time.perf_counter()
+
+class GameServer:
+    """Headless authoritative simulation that clients feed with inputs over UDP"""
+
+    def __init__(self, num_players=2, host="127.0.0.1", port=0, tick_rate=FPS,
+                 snapshot_interval=SNAPSHOT_INTERVAL, seed=None, conditions=None):
+        self.num_players = num_players
+        self.tick_rate = tick_rate
+        self.snapshot_interval = snapshot_interval
+        self.inputs = [RemoteInput() for _ in range(num_players)]
+        self.game = Match(inputs=self.inputs, seed=seed)
+        self.game.init_game(num_players, reset_scores=True)
+        self.endpoint = Endpoint((host, port), conditions)
+        self.address = self.endpoint.address
+        self.clients = {}  # Address -> ClientSlot
+        self.tick_count = 0
+        self.frame = 0
+        self.tick_times = deque(maxlen=FPS * 10)
+
+    def started(self):
+        # The match clock only runs once every slot is filled
+        return len(self.clients) == self.num_players
+
+    def handle_packets(self):
+        for data, address in self.endpoint.receive():
+            if not data:
+                continue
+            client = self.clients.get(address)
+            if client:
+                client.bytes_in += len(data)
+                client.packets_in += 1
+
+            if data[0] == MSG_HELLO and len(data) == HELLO.size:
+                _, nonce = HELLO.unpack(data)
+                if client is None:
+                    taken = {c.slot for c in self.clients.values()}
+                    free = [slot for slot in range(self.num_players) if slot not in taken]
+                    if not free:
+                        continue
+                    client = ClientSlot(free[0], address, nonce)
+                    self.clients[address] = client
+                    self.inputs[client.slot].reset()
+                    print(f"Player {client.slot + 1} joined from {address[0]}:{address[1]}")
+                self.send(client, WELCOME.pack(MSG_WELCOME, nonce, client.slot, self.num_players, self.tick_rate))
+            elif data[0] == MSG_INPUT and client and len(data) >= INPUT_HEADER.size:
+                _, newest, client.terrain_key, count = INPUT_HEADER.unpack_from(data)
+                inputs = data[INPUT_HEADER.size:INPUT_HEADER.size + count]
+                self.inputs[client.slot].receive(newest, inputs)
+            elif data[0] == MSG_BYE and client:
+                print(f"Player {client.slot + 1} left")
+                del self.clients[address]
+                self.inputs[client.slot].reset()
+
+    def send(self, client, data):
+        client.bytes_out += len(data)
+        client.packets_out += 1
+        self.endpoint.send(data, client.address)
+
+    def tick(self):
+        start = time.perf_counter()
+        self.handle_packets()
+
+        # Inputs are consumed every tick so acknowledgements keep moving even between rounds
+        for remote_input in self.inputs:
+            remote_input.advance()
+        if self.started():
+            self.game.step()
+            self.tick_count += 1
+
+        self.frame += 1
+        if self.frame % self.snapshot_interval == 0:
+            current_key = terrain_key(self.game)
+            for client in self.clients.values():
+                ack = self.inputs[client.slot].last_applied
+                snapshot = encode_snapshot(self.game, self.tick_count, ack, client.terrain_key != current_key)
+                self.send(client, snapshot)
+
+        self.endpoint.flush()
+        self.tick_times.append(time.perf_counter() - start)
+
+    def run(self, duration=None):
+        """Tick at a fixed rate until interrupted or duration seconds have passed"""
+        interval = 1 / self.tick_rate
+        start = next_tick = time.perf_counter()
+        try:
+            while duration is None or time.perf_counter() - start < duration:
+                self.tick()
+                next_tick += interval
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -0.25:
+                    next_tick = time.perf_counter()  # Fell far behind; don't try to catch up
+        except KeyboardInterrupt:
+            pass
+        print(self.report())
+
+    def report(self):
+        times = sorted(self.tick_times)
+        lines = [f"Server: {self.tick_count} ticks simulated"]
+        if times:
+            mean = sum(times) / len(times) * 1000
+            p95 = times[int(len(times) * 0.95)] * 1000
+            lines.append(f"  tick time: mean {mean:.3f} ms, p95 {p95:.3f} ms, max {times[-1] * 1000:.3f} ms")
+        for client in sorted(self.clients.values(), key=lambda c: c.slot):
+            elapsed = max(time.perf_counter() - client.joined_at, 1e-6)
+            lines.append(f"  P{client.slot + 1}: out {client.bytes_out / elapsed / 1024:.2f} KB/s "
+                         f"({client.packets_out} packets), in {client.bytes_in / elapsed / 1024:.2f} KB/s "
+                         f"({client.packets_in} packets)")
+        if self.endpoint.packets_dropped:
+            lines.append(f"  simulated loss dropped {self.endpoint.packets_dropped} outgoing packets")
+        return "\n".join(lines)
+
+class GameClient:
+    """Sends local input to a GameServer and reconstructs the match from its snapshots"""
+
+    def __init__(self, server_address, input_provider, render=False, conditions=None,
+                 interpolation_delay=INTERPOLATION_DELAY):
+        self.server_address = server_address
+        self.input_provider = input_provider
+        self.render = render
+        self.interpolation_delay = interpolation_delay
+        self.endpoint = Endpoint((server_address[0], 0), conditions)
+        self.nonce = random.getrandbits(32)
+        self.last_hello = 0.0
+        if render:
+            from dreamrunner.render import init_display
+            init_display()  # Events are read while waiting for a slot, before the window opens
+
+        self.game = None
+        self.slot = None
+        self.sequence = 0
+        self.pending = OrderedDict()  # Unacknowledged input sequence -> control bits
+        self.recent = deque(maxlen=INPUT_REDUNDANCY)  # Newest inputs, resent every packet
+        self.send_times = {}
+        self.terrain_key = 0
+        self.latest_tick = -1
+        self.snapshots = deque(maxlen=32)  # (server tick, player states) for interpolation
+        self.render_tick = None
+
+        self.snapshots_received = 0
+        self.corrections = 0
+        self.rtt = deque(maxlen=FPS * 5)
+
+    def connected(self):
+        return self.game is not None
+
+    def handle_packets(self):
+        for data, _ in self.endpoint.receive():
+            if not data:
+                continue
+            if data[0] == MSG_WELCOME and len(data) == WELCOME.size and self.game is None:
+                _, nonce, slot, num_players, _ = WELCOME.unpack(data)
+                if nonce == self.nonce:
+                    self.slot = slot
+                    self.game = make_game(self.render)
+                    self.game.init_game(num_players, reset_scores=True)
+            elif data[0] == MSG_SNAPSHOT and self.game is not None:
+                self.apply_snapshot(data)
+
+    def apply_snapshot(self, data):
+        header, scores, players, terrain = decode_snapshot(data, self.game.num_players)
+        (_, tick, ack, score, round_index, game_over, winner, round_end_timer,
+         morph_timer, morph_interval, morph_progress, is_morphing) = header
+        if tick < self.latest_tick:
+            return  # Arrived out of order; a newer snapshot was already applied
+        self.snapshots_received += 1
+        self.latest_tick = tick
+
+        game = self.game
+        game.score = score
+        game.round_index = round_index
+        game.game_over = bool(game_over)
+        game.winner = decode_winner(winner)
+        game.round_end_timer = round_end_timer
+        game.player_scores = list(scores)
+        game.terrain.morph_timer = morph_timer
+        game.terrain.morph_interval = morph_interval
+        game.terrain.morph_progress = morph_progress
+        game.terrain.is_morphing = bool(is_morphing)
+
+        if terrain is not None:
+            self.terrain_key, platforms, holes = terrain
+            game.terrain.platforms = [Rect(rect) for rect in platforms]
+            game.terrain.holes = [Rect(rect) for rect in holes]
+            game.terrain.geometry_changed()
+
+        self.snapshots.append((tick, players))
+
+        # Reconcile: take the server's word for our player, then replay inputs it has not seen yet
+        if ack in self.send_times:
+            self.rtt.append(time.perf_counter() - self.send_times[ack])
+        for sequence in [s for s in self.send_times if s <= ack]:
+            del self.send_times[sequence]
+        while self.pending and next(iter(self.pending)) <= ack:
+            self.pending.popitem(last=False)
+
+        local = game.players[self.slot]
+        predicted = (local.x, local.y)
+        apply_player(local, players[self.slot])
+        if not game.game_over:
+            for bits in self.pending.values():
+                local.update(game.terrain, unpack_actions(bits), [local])
+        if abs(local.x - predicted[0]) > 1 or abs(local.y - predicted[1]) > 1:
+            self.corrections += 1
+
+    def interpolate_remote_players(self):
+        if not self.snapshots:
+            return
+        target = self.latest_tick - self.interpolation_delay
+        if self.render_tick is None or abs(self.render_tick - target) > self.interpolation_delay:
+            self.render_tick = target
+        else:
+            self.render_tick += 1
+
+        # Find the two snapshots around the render tick
+        before = after = self.snapshots[-1]
+        for snapshot in self.snapshots:
+            if snapshot[0] <= self.render_tick:
+                before = snapshot
+            else:
+                after = snapshot
+                break
+        if before[0] > self.render_tick:
+            after = before
+        span = after[0] - before[0]
+        t = (self.render_tick - before[0]) / span if span > 0 else 0.0
+        t = min(max(t, 0.0), 1.0)
+
+        for i, player in enumerate(self.game.players):
+            if i == self.slot:
+                continue
+            a = before[1][i]
+            b = after[1][i]
+            apply_player(player, a, a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+
+    def tick(self):
+        self.handle_packets()
+        now = time.perf_counter()
+        if self.game is None:
+            if now - self.last_hello > HELLO_RETRY:
+                self.endpoint.send(HELLO.pack(MSG_HELLO, self.nonce), self.server_address)
+                self.last_hello = now
+            self.endpoint.flush()
+            return
+
+        actions = self.input_provider.poll(self.game, self.slot)
+        bits = pack_actions(actions)
+        self.sequence += 1
+        self.pending[self.sequence] = bits
+        self.recent.appendleft(bits)
+        self.send_times[self.sequence] = now
+        packet = INPUT_HEADER.pack(MSG_INPUT, self.sequence, self.terrain_key, len(self.recent)) + bytes(self.recent)
+        self.endpoint.send(packet, self.server_address)
+
+        # Predict our own movement right away instead of waiting a round trip
+        if self.latest_tick > 0 and not self.game.game_over:
+            local = self.game.players[self.slot]
+            local.update(self.game.terrain, actions, [local])
+
+        self.interpolate_remote_players()
+        self.endpoint.flush()
+
+    def draw(self):
+        # The window only opens once the server has assigned us a slot
+        if self.game is not None:
+            import pygame
+            self.game.draw()
+            pygame.display.flip()
+
+    def close(self):
+        if self.game is not None:
+            self.endpoint.send(struct.pack("<B", MSG_BYE), self.server_address)
+            self.endpoint.conditions = None
+            self.endpoint.flush()
+            self.endpoint.send(struct.pack("<B", MSG_BYE), self.server_address)
+        self.endpoint.close()
+
+    def run(self):
+        import pygame
+        from dreamrunner.keyboard import KeyboardInput
+        clock = pygame.time.Clock()
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                    self.input_provider.handle_event(event, time.perf_counter())
+            self.tick()
+            self.draw()
+            if isinstance(self.input_provider, KeyboardInput):
+                self.input_provider.shown(time.perf_counter())
+            clock.tick(FPS)
+        self.close()
+        print(self.report())
+        if isinstance(self.input_provider, KeyboardInput) and self.input_provider.latency.count:
+            print(self.input_provider.latency.report("Key press to display"))
+
+    def report(self):
+        slot = "?" if self.slot is None else self.slot + 1
+        rtt = sorted(self.rtt)
+        rtt_text = f"{rtt[len(rtt) // 2] * 1000:.0f} ms" if rtt else "n/a"
+        return (f"Client P{slot}: {self.snapshots_received} snapshots, {self.corrections} prediction corrections, "
+                f"input round trip {rtt_text}")
+
+def run_loopback(num_players=2, seconds=10.0, latency_ms=40, jitter_ms=10, loss=0.02, render=False, seed=0):
+    """Server plus scripted clients in one process, talking over loopback through a simulated network"""
+    server = GameServer(num_players, seed=seed, conditions=NetworkConditions(latency_ms, jitter_ms, loss, seed))
+    scripts = random_scripts(seed, num_players, int(seconds * FPS) + FPS)
+    clients = []
+    for i in range(num_players):
+        conditions = NetworkConditions(latency_ms, jitter_ms, loss, seed + i + 1)
+        clients.append(GameClient(server.address, scripts[i], render=render and i == 0, conditions=conditions))
+
+    if render:
+        import pygame
+    interval = 1 / FPS
+    start = next_tick = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        if render:
+            pygame.event.pump()
+        for client in clients:
+            client.tick()
+        server.tick()
+        if render:
+            clients[0].draw()
+        next_tick += interval
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    print(server.report())
+    for client in clients:
+        print(client.report())
+        client.close()
+    server.endpoint.close()
+
+def make_game(render, seed=None):
+    """A windowed Game to draw, or a plain Match; only the windowed one loads pygame"""
+    if not render:
+        return Match(inputs=[], seed=seed)
+    from dreamrunner.app import Game
+    game = Game(inputs=[], seed=seed)
+    game.in_start_screen = False
+    return game
+
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    return (socket.gethostbyname(host or "127.0.0.1"), int(port))
+
+def main():
+    parser = argparse.ArgumentParser(description="Dream Runner network play")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    server_parser = subcommands.add_parser("server", help="run a headless authoritative server")
+    server_parser.add_argument("--players", type=int, default=2, choices=[2, 3])
+    server_parser.add_argument("--host", default="0.0.0.0")
+    server_parser.add_argument("--port", type=int, default=7777)
+    server_parser.add_argument("--seed", type=int, default=None)
+
+    client_parser = subcommands.add_parser("client", help="join a server and play with the keyboard")
+    client_parser.add_argument("address", help="server HOST:PORT")
+    client_parser.add_argument("--controls", type=int, default=1, choices=[1, 2, 3],
+                               help="which local control scheme to use (1 = WASD)")
+
+    loopback_parser = subcommands.add_parser("loopback", help="server and scripted clients over a simulated network")
+    loopback_parser.add_argument("--players", type=int, default=2, choices=[2, 3])
+    loopback_parser.add_argument("--seconds", type=float, default=10.0)
+    loopback_parser.add_argument("--latency", type=float, default=40, help="one-way latency in ms")
+    loopback_parser.add_argument("--jitter", type=float, default=10, help="latency jitter in ms")
+    loopback_parser.add_argument("--loss", type=float, default=0.02, help="packet loss probability")
+    loopback_parser.add_argument("--render", action="store_true", help="draw the first client's view")
+    loopback_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "server":
+        server = GameServer(args.players, host=args.host, port=args.port, seed=args.seed)
+        print(f"Serving {args.players} players on {server.address[0]}:{server.address[1]}")
+        server.run()
+    elif args.command == "client":
+        from dreamrunner.keyboard import PLAYER_CONTROLS, KeyboardInput
+        keyboard = KeyboardInput(PLAYER_CONTROLS[args.controls - 1])
+        client = GameClient(parse_address(args.address), keyboard, render=True)
+        client.run()
+    else:
+        run_loopback(args.players, args.seconds, args.latency, args.jitter, args.loss, args.render, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""Peer-to-peer rollback netcode built on Match.save_state/load_state.
+
+Each peer simulates immediately with its own input and a guess for the remote one
+(the last input it received). When the real remote input arrives and differs from
+the guess, the session restores the snapshot from that frame and re-simulates up to
+the present before drawing.
+
+    python rollback.py peer --slot 0 --port 7000 --remote 192.168.1.11:7001 --seed 5
+    python rollback.py peer --slot 1 --port 7001 --remote 192.168.1.10:7000 --seed 5
+    python rollback.py loopback --latency 60 --jitter 15 --loss 0.05
+    python rollback.py stress --players 3 --depth 8
+"""
+import argparse
+import struct
+import time
+
+from dreamrunner import FPS, InputProvider, pack_actions, random_scripts, state_digest, unpack_actions
+from netplay import Endpoint, NetworkConditions, make_game, parse_address
+
+MAX_ROLLBACK = 8  # Frames we may run ahead of the last confirmed remote input
+INPUT_DELAY = 2  # Local inputs are scheduled this many frames ahead to hide some latency
+CHECKSUM_INTERVAL = 60  # Confirmed frames between desync checks
+MAX_INPUTS_PER_PACKET = 32
+FRAME_BUDGET = 1 / FPS
+
+MSG_INPUTS = 21
+MSG_CHECKSUM = 22
+
+# type, sender frame, sender frame advantage, first peer frame not yet received, first frame, count
+INPUTS_HEADER = struct.Struct("<BIhIIB")
+CHECKSUM = struct.Struct("<BI8s")
+
+class SessionInput(InputProvider):
+    """Feeds the session's confirmed or predicted input for the frame being simulated"""
+
+    def __init__(self, session):
+        self.session = session
+
+    def poll(self, game, player_index):
+        return unpack_actions(self.session.input_for(player_index))
+
+class RollbackSession:
+    """Predict-and-rollback driver for a Match shared by several players"""
+
+    def __init__(self, game, num_players, max_rollback=MAX_ROLLBACK):
+        self.game = game
+        self.num_players = num_players
+        self.max_rollback = max_rollback
+        game.inputs = [SessionInput(self) for _ in range(num_players)]
+
+        self.frame = 0  # Next frame to simulate
+        self.sim_frame = 0  # Frame currently inside Match.step
+        self.inputs = [{} for _ in range(num_players)]  # Confirmed inputs: frame -> bits
+        self.confirmed = [-1] * num_players  # Every frame up to this one has a confirmed input
+        self.predicted = [{} for _ in range(num_players)]  # Guesses used for unconfirmed frames
+        self.snapshots = [None] * (max_rollback + 2)  # Ring of (frame, state before that frame)
+        self.rollback_from = None
+        self.checksums = {}
+
+        self.rollbacks = 0
+        self.frames_resimulated = 0
+        self.deepest_rollback = 0
+        self.stalls = 0
+
+    def add_input(self, player, frame, bits):
+        """Record a confirmed input; schedules a rollback if it contradicts a guess"""
+        if frame <= self.confirmed[player] or frame in self.inputs[player]:
+            return
+        self.inputs[player][frame] = bits
+        while self.confirmed[player] + 1 in self.inputs[player]:
+            self.confirmed[player] += 1
+
+        guess = self.predicted[player].pop(frame, None)
+        if guess is not None and guess != bits:
+            if self.rollback_from is None or frame < self.rollback_from:
+                self.rollback_from = frame
+
+    def input_for(self, player):
+        frame = self.sim_frame
+        bits = self.inputs[player].get(frame)
+        if bits is None:
+            # Predict that the player is still holding whatever they last held
+            last = min(self.confirmed[player], frame - 1)
+            bits = self.inputs[player].get(last, 0)
+            self.predicted[player][frame] = bits
+        return bits
+
+    def can_advance(self):
+        # Never run more than max_rollback frames past anyone's confirmed input
+        return all(self.frame - (confirmed + 1) < self.max_rollback for confirmed in self.confirmed)
+
+    def save(self, frame):
+        self.snapshots[frame % len(self.snapshots)] = (frame, self.game.save_state())
+
+    def simulate(self, frame):
+        self.sim_frame = frame
+        self.game.step()
+
+    def rollback(self, frame):
+        """Restore the snapshot taken before frame and re-simulate up to the present"""
+        saved_frame, state = self.snapshots[frame % len(self.snapshots)]
+        if saved_frame != frame:
+            raise RuntimeError(f"No snapshot for frame {frame}; rollback window exceeded")
+        self.game.load_state(state)
+        depth = self.frame - frame
+        for resim_frame in range(frame, self.frame):
+            for guesses in self.predicted:
+                guesses.pop(resim_frame, None)
+            if resim_frame != frame:
+                self.save(resim_frame)
+            self.simulate(resim_frame)
+        self.rollbacks += 1
+        self.frames_resimulated += depth
+        self.deepest_rollback = max(self.deepest_rollback, depth)
+
+    def advance(self):
+        """Apply any pending rollback and simulate one new frame; False if we must wait for input"""
+        if self.rollback_from is not None:
+            self.rollback(self.rollback_from)
+            self.rollback_from = None
+        self.record_checksums()
+        if not self.can_advance():
+            self.stalls += 1
+            return False
+
+        self.save(self.frame)
+        self.simulate(self.frame)
+        self.frame += 1
+
+        # Confirmed inputs older than the rollback window are only needed as the prediction source
+        stale = self.frame - len(self.snapshots) - 1
+        for player in range(self.num_players):
+            self.inputs[player].pop(stale, None)
+        return True
+
+    def record_checksums(self):
+        # A snapshot only counts once every input before it is confirmed
+        settled = min(min(self.confirmed) + 1, self.frame)
+        for frame, state in filter(None, self.snapshots):
+            if frame <= settled and frame % CHECKSUM_INTERVAL == 0 and frame not in self.checksums:
+                self.checksums[frame] = bytes.fromhex(state_digest(state))
+
+    def report(self):
+        average = self.frames_resimulated / self.rollbacks if self.rollbacks else 0
+        return (f"{self.frame} frames, {self.rollbacks} rollbacks (avg depth {average:.1f}, "
+                f"max {self.deepest_rollback}), {self.frames_resimulated} frames re-simulated, "
+                f"{self.stalls} stalls")
+
+class RollbackPeer:
+    """One side of a two-player rollback match over UDP"""
+
+    def __init__(self, slot, local_address, remote_address, input_provider, seed,
+                 render=False, conditions=None, input_delay=INPUT_DELAY):
+        self.slot = slot
+        self.remote_slot = 1 - slot
+        self.remote_address = remote_address
+        self.input_provider = input_provider
+        self.input_delay = input_delay
+        self.render = render
+
+        self.game = make_game(render, seed)
+        self.game.init_game(2, reset_scores=True)
+        self.session = RollbackSession(self.game, 2)
+        self.endpoint = Endpoint(local_address, conditions)
+
+        # The first input_delay frames have no local input; treat them as idle
+        self.local_inputs = {frame: 0 for frame in range(input_delay)}  # Frame -> bits, until the peer has them
+        for frame in self.local_inputs:
+            self.session.add_input(slot, frame, 0)
+        self.remote_frame = 0
+        self.remote_advantage = 0
+        self.peer_expects = 0  # First of our frames the peer has not confirmed yet
+        self.remote_checksums = {}
+        self.desyncs = 0
+        self.waits = 0
+        self.waited = False
+
+    def handle_packets(self):
+        for data, _ in self.endpoint.receive():
+            if data[0] == MSG_INPUTS and len(data) >= INPUTS_HEADER.size:
+                _, remote_frame, advantage, expects, first, count = INPUTS_HEADER.unpack_from(data)
+                self.remote_frame = max(self.remote_frame, remote_frame)
+                self.remote_advantage = advantage
+                self.peer_expects = max(self.peer_expects, expects)
+                for i, bits in enumerate(data[INPUTS_HEADER.size:INPUTS_HEADER.size + count]):
+                    self.session.add_input(self.remote_slot, first + i, bits)
+            elif data[0] == MSG_CHECKSUM and len(data) == CHECKSUM.size:
+                _, frame, digest = CHECKSUM.unpack(data)
+                self.remote_checksums[frame] = digest
+
+    def send_inputs(self):
+        for frame in [f for f in self.local_inputs if f < self.peer_expects]:
+            del self.local_inputs[frame]
+        frames = sorted(self.local_inputs)[-MAX_INPUTS_PER_PACKET:]
+        first = frames[0] if frames else self.session.frame
+        advantage = max(-32768, min(32767, self.session.frame - self.remote_frame))
+        header = INPUTS_HEADER.pack(MSG_INPUTS, self.session.frame, advantage,
+                                    self.session.confirmed[self.remote_slot] + 1, first, len(frames))
+        self.endpoint.send(header + bytes(self.local_inputs[f] for f in frames), self.remote_address)
+
+    def check_desyncs(self):
+        for frame, digest in list(self.session.checksums.items()):
+            if frame in self.remote_checksums:
+                if self.remote_checksums.pop(frame) != digest:
+                    self.desyncs += 1
+                    print(f"P{self.slot + 1}: desync detected at frame {frame}")
+                del self.session.checksums[frame]
+            elif frame < self.session.frame - CHECKSUM_INTERVAL * 10:
+                del self.session.checksums[frame]  # The peer never answered; give up on this one
+            elif self.session.frame % 10 == 0:
+                # Resent periodically until the peer's matching checksum arrives, in case of loss
+                self.endpoint.send(CHECKSUM.pack(MSG_CHECKSUM, frame, digest), self.remote_address)
+
+    def tick(self):
+        self.handle_packets()
+
+        # If we are further ahead of the peer than it is of us, wait a frame so both sides roll back less
+        # Never wait twice in a row, so a peer that stops sending cannot freeze us here
+        ahead = self.session.frame - self.remote_frame - self.remote_advantage
+        self.waited = ahead > 2 and not self.waited
+        if self.waited:
+            self.waits += 1
+            self.send_inputs()
+            self.endpoint.flush()
+            return
+
+        if self.session.can_advance():
+            frame = self.session.frame + self.input_delay
+            bits = pack_actions(self.input_provider.poll(self.game, self.slot))
+            self.local_inputs[frame] = bits
+            self.session.add_input(self.slot, frame, bits)
+        self.session.advance()
+
+        self.send_inputs()
+        self.check_desyncs()
+        self.endpoint.flush()
+
+    def run(self):
+        import pygame
+        from dreamrunner.keyboard import KeyboardInput
+        clock = pygame.time.Clock()
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                    self.input_provider.handle_event(event, time.perf_counter())
+            self.tick()
+            self.game.draw()
+            pygame.display.flip()
+            if isinstance(self.input_provider, KeyboardInput):
+                self.input_provider.shown(time.perf_counter())
+            clock.tick(FPS)
+        print(self.report())
+        if isinstance(self.input_provider, KeyboardInput) and self.input_provider.latency.count:
+            print(self.input_provider.latency.report("Key press to display"))
+
+    def report(self):
+        return f"P{self.slot + 1}: {self.session.report()}, {self.waits} sync waits, {self.desyncs} desyncs"
+
+def run_loopback(seconds=10.0, latency_ms=60, jitter_ms=15, loss=0.05, seed=0):
+    """Two peers over loopback through a simulated network, checking they never desync"""
+    scripts = random_scripts(seed, 2, int(seconds * FPS) * 2)
+    peers = []
+    for slot in range(2):
+        conditions = NetworkConditions(latency_ms, jitter_ms, loss, seed + slot)
+        peers.append(RollbackPeer(slot, ("127.0.0.1", 0), None, scripts[slot], seed, conditions=conditions))
+    peers[0].remote_address = peers[1].endpoint.address
+    peers[1].remote_address = peers[0].endpoint.address
+
+    interval = 1 / FPS
+    start = next_tick = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for peer in peers:
+            peer.tick()
+        next_tick += interval
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    for peer in peers:
+        print(peer.report())
+        peer.endpoint.close()
+
+def run_stress(num_players=3, frames=1200, depth=MAX_ROLLBACK, seed=0, render=False):
+    """Force a depth-frame rollback on every frame and measure how much of the budget it uses"""
+    game = make_game(render, seed)
+    game.init_game(num_players, reset_scores=True)
+    if render:
+        import pygame
+    session = RollbackSession(game, num_players, max_rollback=depth)
+    scripts = random_scripts(seed, num_players, frames + depth)
+    for player, script in enumerate(scripts):
+        for frame, actions in enumerate(script.script):
+            session.add_input(player, frame, pack_actions(actions))
+
+    frame_times = []
+    draw_times = []
+    over_budget = 0
+    for _ in range(frames):
+        rolled_back = session.frame >= depth
+        start = time.perf_counter()
+        if rolled_back:
+            session.rollback_from = session.frame - depth  # Pretend the oldest guess was wrong
+        session.advance()
+        frame_time = time.perf_counter() - start
+        draw_time = 0.0
+        if render:
+            start = time.perf_counter()
+            game.draw()
+            pygame.display.flip()
+            draw_time = time.perf_counter() - start
+            draw_times.append(draw_time)
+        # Only frames that really rolled back count towards the worst case
+        if rolled_back:
+            frame_times.append(frame_time)
+            over_budget += frame_time + draw_time > FRAME_BUDGET
+
+    # Save and restore on their own, for reference
+    samples = 500
+    start = time.perf_counter()
+    for _ in range(samples):
+        state = game.save_state()
+    save_cost = (time.perf_counter() - start) / samples
+    start = time.perf_counter()
+    for _ in range(samples):
+        game.load_state(state)
+    restore_cost = (time.perf_counter() - start) / samples
+
+    def percentile(times, q):
+        return times[min(len(times) - 1, int(q * len(times)))] if times else 0.0
+
+    frame_times.sort()
+    draw_times.sort()
+    p99 = percentile(frame_times, 0.99)
+    draw_p99 = percentile(draw_times, 0.99)
+    # Each rolled-back frame restores once and re-simulates depth frames plus the new one, so the
+    # affordable depth comes from the measured p99 frame rather than from average operation costs
+    per_frame = p99 / (depth + 1)
+    affordable = max(int((FRAME_BUDGET - draw_p99) / per_frame) - 1, 0) if per_frame else 0
+    print(f"Stress: {num_players} players, rollback of {depth} frames on every one of {len(frame_times)} frames")
+    print(f"  save {save_cost * 1e6:.1f} us, restore {restore_cost * 1e6:.1f} us")
+    print(f"  frame time: p50 {percentile(frame_times, 0.5) * 1000:.3f} ms, p95 {percentile(frame_times, 0.95) * 1000:.3f} ms, "
+          f"p99 {p99 * 1000:.3f} ms, max {percentile(frame_times, 1.0) * 1000:.3f} ms")
+    if draw_times:
+        print(f"  draw: p99 {draw_p99 * 1000:.3f} ms per frame")
+    print(f"  {over_budget} of {len(frame_times)} frames went over the {FRAME_BUDGET * 1000:.1f} ms budget")
+    print(f"  at p99 cost ({per_frame * 1e6:.0f} us per re-simulated frame) a {FRAME_BUDGET * 1000:.1f} ms frame "
+          f"can absorb rollbacks of about {affordable} frames")
+
+def main():
+    parser = argparse.ArgumentParser(description="Dream Runner rollback netcode")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    peer_parser = subcommands.add_parser("peer", help="play a two-player rollback match against a remote peer")
+    peer_parser.add_argument("--slot", type=int, choices=[0, 1], required=True)
+    peer_parser.add_argument("--port", type=int, default=7000)
+    peer_parser.add_argument("--remote", required=True, help="peer HOST:PORT")
+    peer_parser.add_argument("--seed", type=int, required=True, help="match seed, the same on both peers")
+    peer_parser.add_argument("--controls", type=int, default=1, choices=[1, 2, 3])
+
+    loopback_parser = subcommands.add_parser("loopback", help="two scripted peers over a simulated network")
+    loopback_parser.add_argument("--seconds", type=float, default=10.0)
+    loopback_parser.add_argument("--latency", type=float, default=60, help="one-way latency in ms")
+    loopback_parser.add_argument("--jitter", type=float, default=15, help="latency jitter in ms")
+    loopback_parser.add_argument("--loss", type=float, default=0.05, help="packet loss probability")
+    loopback_parser.add_argument("--seed", type=int, default=0)
+
+    stress_parser = subcommands.add_parser("stress", help="force worst-case rollbacks every frame")
+    stress_parser.add_argument("--players", type=int, default=3, choices=[2, 3])
+    stress_parser.add_argument("--frames", type=int, default=1200)
+    stress_parser.add_argument("--depth", type=int, default=MAX_ROLLBACK)
+    stress_parser.add_argument("--render", action="store_true", help="include drawing in the frame")
+    stress_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "peer":
+        from dreamrunner.keyboard import PLAYER_CONTROLS, KeyboardInput
+        keyboard = KeyboardInput(PLAYER_CONTROLS[args.controls - 1])
+        peer = RollbackPeer(args.slot, ("0.0.0.0", args.port), parse_address(args.remote), keyboard,
+                            args.seed, render=True)
+        peer.run()
+    elif args.command == "loopback":
+        run_loopback(args.seconds, args.latency, args.jitter, args.loss, args.seed)
+    else:
+        run_stress(args.players, args.frames, args.depth, args.seed, args.render)
+
+if __name__ == "__main__":
+    main()
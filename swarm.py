@@ -0,0 +1,513 @@
+"""Struct-of-arrays player physics for party matches with many players.
+
+SwarmGame keeps every player's position, velocity, timers and cooldowns in NumPy
+arrays and advances them all with vectorized operations. It follows Player.update
+exactly, including the order in which attacks from lower-numbered players land, so a
+seeded match gives the same states, and records the same telemetry, as the scalar Match.
+
+It is not a faster way to run a match. A tick costs about a hundred NumPy calls whatever
+the player count, and at the 64 players a Match allows that only draws level with the
+scalar update when players just move; brawling, and every smaller match, is slower.
+It stays as a checked second implementation of Player.update.
+
+    python swarm.py verify --players 8 --frames 3600
+    python swarm.py bench --players 2 8 16 32 64
+"""
+import argparse
+import operator
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from dreamrunner import ACTIONS, HEIGHT, WIDTH, Match, Player, Telemetry, random_scripts
+from dreamrunner.constants import PUNCH_RANGE, TAG_RANGE, THROW_RANGE
+from dreamrunner.geometry import first_platform_hit
+from dreamrunner.telemetry import DEATH, DEATH_FELL, DEATH_HOLE, HIT, NO_PLAYER
+from dreamrunner.telemetry import PUNCH as PUNCH_MOVE, TAG as TAG_MOVE, THROW as THROW_MOVE
+
+# Player tuning, read from a default Player so both paths share one source
+_DEFAULTS = Player(0, 0)
+PLAYER_WIDTH = _DEFAULTS.width
+PLAYER_HEIGHT = _DEFAULTS.height
+SPEED = _DEFAULTS.speed
+JUMP_POWER = _DEFAULTS.jump_power
+GRAVITY = _DEFAULTS.gravity
+DEATH_ANIMATION_DURATION = _DEFAULTS.death_animation_duration
+STUN_DURATION = _DEFAULTS.stun_duration
+TAG_COOLDOWN = _DEFAULTS.tag_cooldown_duration
+PUNCH_COOLDOWN = _DEFAULTS.punch_cooldown_duration
+THROW_COOLDOWN = _DEFAULTS.throw_cooldown_duration
+del _DEFAULTS
+
+PUNCH_FORCE = 12
+THROW_FORCE_X = 15
+THROW_FORCE_Y = -12
+
+LEFT, RIGHT, JUMP, TAG, PUNCH, THROW = range(len(ACTIONS))
+action_row = operator.itemgetter(*ACTIONS)
+# Every combination of buttons as a row of ACTION_BITS, looked up by its action_row
+ACTION_BITS = np.array([[bool(code & (1 << i)) for i in range(len(ACTIONS))] for code in range(1 << len(ACTIONS))])
+ACTION_CODES = {tuple(row): code for code, row in enumerate(ACTION_BITS.tolist())}
+
+# Player fields the simulation reads, with the dtype of their array; cooldowns share one array
+FIELD_TYPES = {'x': np.float64, 'y': np.float64, 'vel_x': np.float64, 'vel_y': np.float64,
+               'on_ground': np.bool_, 'is_dead': np.bool_, 'death_timer': np.int64,
+               'is_stunned': np.bool_, 'stun_timer': np.int64}
+COOLDOWNS = ('tag_cooldown', 'punch_cooldown', 'throw_cooldown')
+FIELDS = tuple(FIELD_TYPES) + COOLDOWNS
+
+class FrameTelemetry:
+    """Stands in for a Telemetry during a SwarmGame tick and holds its events back until flush().
+
+    The vectorized update finds attacks and deaths out of player order, so flush() passes
+    them on in the order Player.update records them: player by player, each player's
+    attacks before its death.
+    """
+
+    def __init__(self, telemetry):
+        self.telemetry = telemetry
+        self.events = []  # (player, is a death, Telemetry method, arguments)
+
+    def record(self, kind, player=NO_PLAYER, target=NO_PLAYER, detail=0):
+        self.events.append((player, kind == DEATH, self.telemetry.record, (kind, player, target, detail)))
+
+    def attempt(self, player, move):
+        self.events.append((player, False, self.telemetry.attempt, (player, move)))
+
+    def flush(self):
+        self.events.sort(key=lambda event: event[:2])
+        for _, _, method, args in self.events:
+            method(*args)
+        self.events.clear()
+
+class PlayerArrays:
+    """Every simulated Player field as one contiguous array, indexed by player"""
+
+    def __init__(self, players):
+        self.count = len(players)
+        self.players = players
+        for name, dtype in FIELD_TYPES.items():
+            setattr(self, name, np.array([getattr(player, name) for player in players], dtype=dtype))
+        # The three cooldowns tick together, so they share one (players, 3) array
+        self.cooldowns = np.array([[getattr(player, name) for name in COOLDOWNS] for player in players],
+                                  dtype=np.int64).reshape(-1, 3)
+        self.tag_cooldown, self.punch_cooldown, self.throw_cooldown = self.cooldowns.T
+        self.rows = np.arange(self.count)
+        self.fell = np.zeros(self.count, dtype=bool)  # Who went into a hole on the last collide()
+        self.telemetry = None  # Optional FrameTelemetry told about attacks and deaths
+        self.terrain_version = None
+
+    def read(self):
+        """Reload every array from the Player objects"""
+        for name in FIELDS:
+            getattr(self, name)[:] = [getattr(player, name) for player in self.players]
+
+    def write(self):
+        """Copy every array back into the Player objects"""
+        for name in FIELDS:
+            for player, value in zip(self.players, getattr(self, name).tolist()):
+                setattr(player, name, value)
+
+    def cache_terrain(self, terrain):
+        """The terrain's surface index as arrays, rebuilt when the terrain changes.
+
+        Region r of TerrainSystem.surfaces_at becomes row r of region_holes, (top, bottom) of
+        each hole, and region_platforms, (top, bottom) of each uncut platform, padded with
+        rows that overlap nothing. One extra empty region stands in for dead players.
+        """
+        if self.terrain_version == terrain.geometry_version:
+            return
+        terrain.surfaces_at(0, PLAYER_WIDTH)  # Builds the index for this geometry
+        breaks, regions = terrain.surface_breaks, terrain.surface_regions + (((), ()),)
+        self.breaks = np.array(breaks, dtype=np.float64)
+        self.padded_breaks = np.append(self.breaks, np.inf)  # Lets breaks[i] == x be tested for every i
+        self.regions = regions
+        self.empty_region = len(regions) - 1
+        padding = (np.inf, -np.inf)
+        hole_count = max(len(holes) for holes, _ in regions) or 1
+        platform_count = max(len(platforms) for _, platforms in regions) or 1
+        self.region_holes = np.array([holes + (padding,) * (hole_count - len(holes)) for holes, _ in regions],
+                                     dtype=np.float64)
+        self.region_platforms = np.array(
+            [tuple((top, bottom) for _, top, _, bottom in platforms) + (padding,) * (platform_count - len(platforms))
+             for _, platforms in regions], dtype=np.float64)
+        self.terrain_version = terrain.geometry_version
+
+    def copy_fields(self):
+        """Every field as a Python list, for the scalar code that settles attacks"""
+        return {name: getattr(self, name).tolist() for name in FIELDS}
+
+    def update(self, terrain, actions):
+        """Advance all players one frame; actions is a (players, 6) bool array"""
+        self.cache_terrain(terrain)
+        was_dead = self.is_dead.copy()
+        if terrain.is_morphing or not actions[:, TAG:].any():
+            attackers = ()
+        else:
+            attackers = self.attack_candidates(actions)
+        before = self.copy_fields() if len(attackers) else None
+
+        # Move everyone as if nobody attacked, then repair the few players whose frame an attack changed
+        start = self.advance(actions, terrain.is_morphing)
+        resimulated = self.resolve_attacks(attackers, before, start, actions, terrain) if len(attackers) else ()
+
+        died = np.flatnonzero(self.is_dead > was_dead).tolist()
+        for index in died:
+            if index not in resimulated:
+                self.die(index)
+        if self.telemetry:
+            self.telemetry.flush()
+        return was_dead & (self.death_timer >= DEATH_ANIMATION_DURATION), died
+
+    def die(self, index):
+        # collide() only flags the death; the random spin is drawn once the frame is settled
+        if self.telemetry:
+            self.telemetry.record(DEATH, index, detail=DEATH_HOLE if self.fell[index] else DEATH_FELL)
+        self.death_timer[index] = 0
+        self.vel_x[index] = self.players[index].rng.randint(-5, 5)
+        self.vel_y[index] = -8
+
+    def attack_candidates(self, actions):
+        """Players who will press an attack with its cooldown ready this frame"""
+        ready = ~self.is_dead & ~(self.is_stunned & (self.stun_timer + 1 < STUN_DURATION))
+        wants = (actions[:, TAG:] & (self.cooldowns <= 1)).any(axis=1)
+        return np.flatnonzero(ready & wants)
+
+    def resolve_attacks(self, attackers, before, start, actions, terrain):
+        """Apply attacks in player order on top of the attack-free frame.
+
+        Player.update runs attacker k after earlier players have moved and before later
+        ones have, so k sees earlier players' new state and later players' old state.
+        Hits on later players change their whole frame, which is re-simulated from `before`.
+        start holds the x and y arrays from before the move. Returns the re-simulated players.
+        """
+        # Anyone an attacker could reach, judging by either the old or the new position
+        start_x, start_y = start
+        ax, ay = start_x[attackers, None], start_y[attackers, None]
+        reach = (TAG_RANGE + 1) ** 2
+        near = ((((start_x - ax) ** 2 + (start_y - ay) ** 2) <= reach) |
+                (((self.x - ax) ** 2 + (self.y - ay) ** 2) <= reach))
+        near[np.arange(len(attackers)), attackers] = False
+        has_near = near.any(axis=1).tolist()
+        before['moved'] = (self.x.tolist(), self.y.tolist())  # Where players stand after the move
+
+        dirty = []
+        moved = []  # Re-simulated players, whose new position the prefilter never saw
+        for row, attacker in enumerate(attackers.tolist()):
+            # Earlier players hit this frame may have moved within reach, settled or not.
+            # With telemetry on, every attacker goes through attack() so its attempts are recorded
+            if not self.telemetry and not has_near[row] and min(moved + dirty, default=attacker) >= attacker:
+                continue
+            settle = [index for index in dirty if index <= attacker]
+            if settle:
+                self.resimulate(settle, before, actions, terrain)
+                dirty = [index for index in dirty if index > attacker]
+                moved = sorted(set(moved + settle))
+            if self.is_stunned[attacker]:
+                continue  # Tagged earlier this frame
+            targets = sorted(set(np.flatnonzero(near[row]).tolist() + [i for i in moved if i < attacker]))
+            self.attack(attacker, targets, actions[attacker], before, dirty)
+
+        if dirty:
+            self.resimulate(dirty, before, actions, terrain)
+        return set(moved + dirty)
+
+    def attack(self, attacker, targets, wants, before, dirty):
+        """Player.try_tag/try_punch/try_throw from attacker against the given players"""
+        ax, ay = before['x'][attacker], before['y'][attacker]
+        moved_x, moved_y = before['moved']
+        seen = []
+        for index in targets:
+            # Earlier players have finished their frame; later ones haven't started it
+            if index < attacker:
+                if self.is_dead[index]:
+                    continue
+                x, y, stunned = moved_x[index], moved_y[index], self.is_stunned[index]
+            else:
+                if before['is_dead'][index]:
+                    continue
+                x, y, stunned = before['x'][index], before['y'][index], before['is_stunned'][index]
+            seen.append((index, x, y, stunned, (ax - x) ** 2 + (ay - y) ** 2))
+
+        def field(index, name):
+            if index < attacker:
+                return getattr(self, name)
+            if index not in dirty:
+                dirty.append(index)
+            return before[name]
+
+        telemetry = self.telemetry
+        if wants[TAG] and self.tag_cooldown[attacker] == 0:
+            if telemetry:
+                telemetry.attempt(attacker, TAG_MOVE)
+            for index, x, y, stunned, distance_sq in seen:
+                if distance_sq <= TAG_RANGE ** 2 and not stunned:
+                    field(index, 'is_stunned')[index] = True
+                    field(index, 'stun_timer')[index] = 0
+                    self.tag_cooldown[attacker] = TAG_COOLDOWN
+                    if telemetry:
+                        telemetry.record(HIT, attacker, index, TAG_MOVE)
+
+        if wants[PUNCH] and self.punch_cooldown[attacker] == 0:
+            if telemetry:
+                telemetry.attempt(attacker, PUNCH_MOVE)
+            for index, x, y, stunned, distance_sq in seen:
+                if distance_sq <= PUNCH_RANGE ** 2:
+                    dx = x - ax
+                    dy = y - ay
+                    distance = distance_sq ** 0.5
+                    if distance > 0:
+                        dx /= distance
+                        dy /= distance
+                    field(index, 'vel_x')[index] += dx * PUNCH_FORCE
+                    field(index, 'vel_y')[index] += dy * PUNCH_FORCE - 3
+                    self.punch_cooldown[attacker] = PUNCH_COOLDOWN
+                    if telemetry:
+                        telemetry.record(HIT, attacker, index, PUNCH_MOVE)
+
+        if wants[THROW] and self.throw_cooldown[attacker] == 0:
+            if telemetry:
+                telemetry.attempt(attacker, THROW_MOVE)
+            for index, x, y, stunned, distance_sq in seen:
+                if distance_sq <= THROW_RANGE ** 2:
+                    dx = WIDTH // 2 - x
+                    dy = HEIGHT // 2 - y
+                    center_distance = (dx ** 2 + dy ** 2) ** 0.5
+                    if center_distance > 0:
+                        dx /= center_distance
+                        dy /= center_distance
+                    field(index, 'vel_x')[index] = dx * THROW_FORCE_X
+                    field(index, 'vel_y')[index] = dy * THROW_FORCE_X + THROW_FORCE_Y
+                    field(index, 'on_ground')[index] = False
+                    self.throw_cooldown[attacker] = THROW_COOLDOWN
+                    if telemetry:
+                        telemetry.record(HIT, attacker, index, THROW_MOVE)
+
+    def resimulate(self, indices, before, actions, terrain):
+        """Redo the frame for players whose starting state an earlier attacker changed.
+
+        Only a handful of players per frame, so this runs the scalar Player.update on them
+        (with attacks masked out, since those were already applied).
+        """
+        moved_x, moved_y = before['moved']
+        for index in sorted(indices):
+            player = self.players[index]
+            for name in FIELDS:
+                setattr(player, name, before[name][index])
+            moves = dict(zip(ACTIONS, actions[index, :TAG].tolist() + [False] * 3))
+            player.update(terrain, moves, ())
+            for name in FIELDS:
+                getattr(self, name)[index] = getattr(player, name)
+            moved_x[index], moved_y[index] = player.x, player.y
+
+    def advance(self, actions, morphing):
+        """Player.update without attacks for every player"""
+        x, y, vel_x, vel_y = self.x, self.y, self.vel_x, self.vel_y
+        on_ground, is_dead, death_timer = self.on_ground, self.is_dead, self.death_timer
+        is_stunned, stun_timer, cooldowns = self.is_stunned, self.stun_timer, self.cooldowns
+        dead = is_dead.copy()
+        alive = ~dead
+
+        # Stun timer and cooldowns; the dead only count their death animation
+        death_timer += dead
+        stunned = alive & is_stunned
+        stun_timer += stunned
+        recovered = stunned & (stun_timer >= STUN_DURATION)
+        is_stunned ^= recovered
+        np.copyto(stun_timer, 0, where=recovered)
+        cooldowns -= alive[:, None] & (cooldowns > 0)
+
+        # Input and friction: full control, coasting, or stunned/morphing drift
+        controlled = np.zeros_like(alive) if morphing else alive & ~is_stunned
+        vel_x *= np.where(controlled, 0.8, np.where(alive, 0.9, 1.0))
+        np.copyto(vel_x, SPEED, where=controlled & actions[:, RIGHT])
+        np.copyto(vel_x, -SPEED, where=controlled & actions[:, LEFT])
+        jumping = controlled & actions[:, JUMP] & on_ground
+        np.copyto(vel_y, JUMP_POWER, where=jumping)
+
+        vel_y += np.where(dead, GRAVITY * 0.5, GRAVITY)
+        start_x, start_y = x.copy(), y.copy()
+        x += np.where(alive, vel_x, 0.0)
+        y += vel_y
+        np.maximum(x, 0.0, out=x)
+        np.minimum(x, float(WIDTH - PLAYER_WIDTH), out=x)
+        on_ground &= dead
+        self.collide(alive, start_x, start_y)
+        return start_x, start_y
+
+    def collide(self, alive, start_x, start_y):
+        """Vectorized Player.check_terrain_collision for the players in the alive mask"""
+        x, y, vel_y, on_ground = self.x, self.y, self.vel_y, self.on_ground
+        # TerrainSystem.surfaces_at for everyone: breakpoints get their own region, gaps the even ones
+        index = self.breaks.searchsorted(x)
+        region = 2 * index + (self.padded_breaks[index] == x)
+        np.copyto(region, self.empty_region, where=~alive)
+        holes = self.region_holes[region]
+        platforms = self.region_platforms[region]
+        platform_top, platform_bottom = platforms[:, :, 0], platforms[:, :, 1]
+
+        # first_platform_hit's time of impact for every platform; only the few players whose
+        # time lands in [0, 1) can hit anything, and those run first_platform_hit itself
+        dy = (y - start_y)[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            toi = np.where(dy > 0, platform_top - (start_y + PLAYER_HEIGHT)[:, None],
+                           platform_bottom - start_y[:, None]) / dy
+        crossing = np.flatnonzero(((toi >= 0) & (toi < 1)).any(axis=1))
+        swept = np.zeros(self.count, dtype=bool)
+        if len(crossing):
+            start_xs, start_ys, xs, ys = start_x.tolist(), start_y.tolist(), x.tolist(), y.tolist()
+            regions = region.tolist()
+            for i in crossing.tolist():
+                hit = first_platform_hit(self.regions[regions[i]][1], start_xs[i], start_ys[i], xs[i], ys[i],
+                                         PLAYER_WIDTH, PLAYER_HEIGHT)
+                if hit is not None:
+                    _, normal, (_, top, _, bottom) = hit
+                    y[i] = top - PLAYER_HEIGHT if normal[1] < 0 else bottom
+                    on_ground[i] = normal[1] < 0
+                    vel_y[i] = 0.0
+                    swept[i] = True
+
+        # pygame.Rect truncates float coordinates toward zero
+        top = np.trunc(y)[:, None]
+        bottom = top + PLAYER_HEIGHT
+        # Player also requires y + height >= hole.y, but overlapping a hole with a truncated rect implies it
+        fell = self.fell = ((top < holes[:, :, 1]) & (bottom > holes[:, :, 0])).any(axis=1)
+        solid = (top < platform_bottom) & (bottom > platform_top)
+        # Only the first solid platform matters: it zeroes vel_y, so later ones change nothing
+        first = solid.argmax(axis=1)
+        resting = solid.any(axis=1) & ~fell & ~swept
+        falling = resting & (vel_y > 0)
+        rising = resting & (vel_y < 0)
+        np.copyto(y, platform_top[self.rows, first] - PLAYER_HEIGHT, where=falling)
+        np.copyto(y, platform_bottom[self.rows, first], where=rising)
+        np.copyto(vel_y, 0.0, where=falling | rising)
+        on_ground |= falling
+        self.is_dead |= alive & (fell | (y > HEIGHT))
+
+class SwarmGame(Match):
+    """Match whose players are simulated together in PlayerArrays"""
+
+    def init_game(self, num_players, reset_scores=False):
+        super().init_game(num_players, reset_scores)
+        self.arrays = PlayerArrays(self.players)
+        if self.telemetry:
+            self.route_telemetry()
+
+    def attach_telemetry(self, telemetry):
+        super().attach_telemetry(telemetry)
+        if self.players:
+            self.route_telemetry()
+
+    def route_telemetry(self):
+        """Send attack and death events, from the arrays and from re-simulated Players, through one FrameTelemetry"""
+        frame_telemetry = FrameTelemetry(self.telemetry)
+        self.arrays.telemetry = frame_telemetry
+        for player in self.players:
+            player.telemetry = frame_telemetry
+
+    def update_players(self, actions):
+        bits = ACTION_BITS[[ACTION_CODES[action_row(entry)] for entry in actions]]
+        finished, died = self.arrays.update(self.terrain, bits)
+        # Match.update counts survivors from the Player objects
+        for index in died:
+            self.players[index].is_dead = True
+        return finished.tolist()
+
+    def sync_players(self):
+        """Copy the arrays back into the Player objects used for snapshots"""
+        self.arrays.write()
+
+    def state(self):
+        self.sync_players()
+        return super().state()
+
+    def save_state(self):
+        self.sync_players()
+        return super().save_state()
+
+    def load_state(self, saved):
+        super().load_state(saved)
+        self.arrays.read()
+
+    def player_positions(self):
+        return list(zip(self.arrays.x.tolist(), self.arrays.y.tolist()))
+
+def make_game(game_class, num_players, seed, frames):
+    game = game_class(inputs=random_scripts(seed, num_players, frames), seed=seed)
+    game.init_game(num_players, reset_scores=True)
+    return game
+
+def verify(num_players, frames, seed=0):
+    """Run the scalar and vectorized paths side by side; first frame whose states or telemetry differ, or None"""
+    games = [make_game(Match, num_players, seed, frames), make_game(SwarmGame, num_players, seed, frames)]
+    telemetries = [Telemetry(clock=lambda: 0.0) for _ in games]  # A fixed clock, so events compare exactly
+    for game, telemetry in zip(games, telemetries):
+        game.attach_telemetry(telemetry)
+    for frame in range(frames):
+        for game in games:
+            game.run_headless(rounds=1, max_frames=1)
+        scalar, vector = games
+        if scalar.state() != vector.state():
+            return frame
+        if telemetries[0].drain() != telemetries[1].drain():
+            return frame
+    return None
+
+def benchmark(player_counts, frames, seed=0):
+    """Median per-tick cost of Match.update_players for the scalar and vectorized paths.
+
+    "moving" players only run and jump; "brawling" players also mash tag, punch and
+    throw, which the vectorized path resolves one attacker at a time. Medians, because
+    a tick the OS preempts costs milliseconds and would decide a mean on its own.
+    """
+    print(f"{'players':>8} {'workload':>9} {'scalar us':>10} {'vector us':>10} {'speedup':>8}")
+    for num_players in player_counts:
+        for workload in ("moving", "brawling"):
+            results = []
+            for game_class in (Match, SwarmGame):
+                game = make_game(game_class, num_players, seed, frames)
+                actions = [[script.script[frame] for script in game.inputs] for frame in range(frames)]
+                if workload == "moving":
+                    actions = [[dict(entry, tag=False, punch=False, throw=False) for entry in frame_actions]
+                               for frame_actions in actions]
+                saved = game.save_state()
+                ticks = []
+                for frame in range(frames):
+                    if frame % 120 == 0:
+                        game.load_state(saved)  # Keep everyone alive instead of timing death animations
+                    start = time.perf_counter()
+                    game.update_players(actions[frame])
+                    ticks.append(time.perf_counter() - start)
+                results.append(statistics.median(ticks) * 1e6)
+            print(f"{num_players:>8} {workload:>9} {results[0]:>10.1f} {results[1]:>10.1f} "
+                  f"{results[0] / results[1]:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized player physics for party matches")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    verify_parser = subcommands.add_parser("verify", help="check the vectorized path against the scalar one")
+    verify_parser.add_argument("--players", type=int, nargs="+", default=[2, 3, 8, 64])
+    verify_parser.add_argument("--frames", type=int, default=3600)
+    verify_parser.add_argument("--seed", type=int, default=0)
+    bench_parser = subcommands.add_parser("bench", help="per-tick player update cost as the player count grows")
+    bench_parser.add_argument("--players", type=int, nargs="+", default=[2, 3, 8, 16, 32, 64])
+    bench_parser.add_argument("--frames", type=int, default=1200)
+    bench_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        failed = False
+        for num_players in args.players:
+            frame = verify(num_players, args.frames, args.seed)
+            result = "match on every frame" if frame is None else f"diverge at frame {frame}"
+            print(f"{num_players} players, seed {args.seed}: scalar and vectorized {result}")
+            failed = failed or frame is not None
+        if failed:
+            sys.exit(1)
+    else:
+        benchmark(args.players, args.frames, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Summarize telemetry files written by `python main.py --telemetry DIR`.
+
+Reports attack attempts and hits per move (one punch or throw can hit several
+players), deaths by cause, per-player totals, round results and morphs. Events are
+counted a whole column at a time rather than decoded one by one.
+
+    python telemetry_report.py telemetry/
+    python telemetry_report.py telemetry/telemetry-20261018-*.drt --json summary.json
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from itertools import compress
+
+from dreamrunner import FPS
+from dreamrunner.telemetry import (ATTEMPT, CAUSE_NAMES, DEATH, HIT, MORPH, MOVE_NAMES, NO_PLAYER, ROUND,
+                                   read_telemetry, telemetry_files)
+
+class TelemetrySummary:
+    """Event counts added up across any number of telemetry files"""
+
+    def __init__(self):
+        self.files = 0
+        self.events = 0
+        self.dropped = 0
+        self.sessions = set()
+        self.first_event = None  # Unix time
+        self.last_event = None
+        self.by_kind_detail = Counter()  # (kind, detail) -> events
+        self.by_kind_player = Counter()  # (kind, player) -> events
+        self.round_ticks = 0
+
+    def add(self, started_at, columns, dropped):
+        self.files += 1
+        self.dropped += dropped
+        self.sessions.add(started_at)
+        kinds = columns["kind"]
+        if not kinds:
+            return
+        self.events += len(kinds)
+        first = started_at + columns["ms"][0] / 1000
+        last = started_at + columns["ms"][-1] / 1000
+        self.first_event = first if self.first_event is None else min(self.first_event, first)
+        self.last_event = last if self.last_event is None else max(self.last_event, last)
+        self.by_kind_detail.update(zip(kinds, columns["detail"]))
+        self.by_kind_player.update(zip(kinds, columns["player"]))
+        self.round_ticks += sum(compress(columns["tick"], [kind == ROUND for kind in kinds]))
+
+    def kind_total(self, kind):
+        return sum(count for (k, _), count in self.by_kind_detail.items() if k == kind)
+
+    def players(self):
+        return sorted({player for (_, player) in self.by_kind_player if player != NO_PLAYER})
+
+    def to_dict(self):
+        rounds = self.kind_total(ROUND)
+        return {
+            "files": self.files,
+            "sessions": len(self.sessions),
+            "events": self.events,
+            "dropped": self.dropped,
+            "hours": (self.last_event - self.first_event) / 3600 if self.events else 0.0,
+            "moves": {name: {"attempts": self.by_kind_detail[ATTEMPT, move], "hits": self.by_kind_detail[HIT, move]}
+                      for move, name in enumerate(MOVE_NAMES)},
+            "deaths": {name: self.by_kind_detail[DEATH, cause] for cause, name in enumerate(CAUSE_NAMES)},
+            "players": {f"P{player + 1}": {"attempts": self.by_kind_player[ATTEMPT, player],
+                                           "hits": self.by_kind_player[HIT, player],
+                                           "deaths": self.by_kind_player[DEATH, player],
+                                           "round_wins": self.by_kind_player[ROUND, player]}
+                        for player in self.players()},
+            "rounds": rounds,
+            "ties": self.by_kind_player[ROUND, NO_PLAYER],
+            "mean_round_seconds": self.round_ticks / rounds / FPS if rounds else 0.0,
+            "morphs": self.kind_total(MORPH),
+        }
+
+    def report(self):
+        summary = self.to_dict()
+        print(f"{summary['files']} files, {summary['sessions']} sessions, {summary['events']:,} events "
+              f"over {summary['hours']:.1f} h ({summary['dropped']} dropped)")
+        if self.events:
+            print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(self.first_event))} to "
+                  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(self.last_event))}")
+
+        print(f"\n{'move':<10} {'attempts':>9} {'hits':>9} {'hits/try':>9}")
+        for name, counts in summary["moves"].items():
+            rate = counts["hits"] / counts["attempts"] if counts["attempts"] else 0.0
+            print(f"{name:<10} {counts['attempts']:>9,} {counts['hits']:>9,} {rate:>9.2f}")
+
+        deaths = sum(summary["deaths"].values())
+        print(f"\n{'death cause':<16} {'deaths':>9}")
+        for name, count in summary["deaths"].items():
+            share = count / deaths if deaths else 0.0
+            print(f"{name:<16} {count:>9,} {share:>7.1%}")
+
+        print(f"\n{'player':<10} {'attempts':>9} {'hits':>9} {'deaths':>9} {'wins':>9}")
+        for name, counts in summary["players"].items():
+            print(f"{name:<10} {counts['attempts']:>9,} {counts['hits']:>9,} {counts['deaths']:>9,} "
+                  f"{counts['round_wins']:>9,}")
+
+        rounds = summary["rounds"]
+        print(f"\n{rounds:,} rounds ({summary['ties']:,} ties), {summary['mean_round_seconds']:.1f}s on average, "
+              f"{summary['morphs']:,} morphs" + (f" ({summary['morphs'] / rounds:.1f} per round)" if rounds else ""))
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize Dream Runner telemetry files")
+    parser.add_argument("paths", nargs="+", help="telemetry files or directories holding them")
+    parser.add_argument("--json", metavar="FILE", help="save the summary as JSON")
+    args = parser.parse_args()
+
+    summary = TelemetrySummary()
+    for path in args.paths:
+        for file_path in telemetry_files(path) if os.path.isdir(path) else [path]:
+            try:
+                summary.add(*read_telemetry(file_path))
+            except (OSError, ValueError) as e:
+                parser.error(str(e))
+    summary.report()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary.to_dict(), f, indent=2)
+        print(f"Saved summary to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import batchenv
+
+@pytest.mark.parametrize("num_envs,num_players", [(2, 2), (3, 3)])
+def test_batch_matches_scalar(num_envs, num_players):
+    assert batchenv.verify(num_envs, num_players, 800, seed=1) is None
+
+def test_telemetry_is_refused():
+    env = batchenv.BatchEnv(1, 2, 0)
+    with pytest.raises(NotImplementedError):
+        env.attach_telemetry(None)
@@ -0,0 +1,7 @@
+import pytest
+
+from dreamrunner.match import verify_collision
+
+@pytest.mark.parametrize("seed", [3, 11])
+def test_surface_index_matches_scan(seed):
+    assert verify_collision(seed, terrains=16, probes=60) is None
@@ -0,0 +1,17 @@
+import pytest
+
+from dreamrunner import Match, random_scripts
+from dreamrunner.match import verify_determinism
+
+@pytest.mark.parametrize("seed,num_players", [(3, 2), (7, 3)])
+def test_seeded_matches_repeat(seed, num_players):
+    assert verify_determinism(seed, num_players, frames=1200) is None
+
+def test_seed_changes_the_match():
+    hashes = []
+    for seed in (1, 2):
+        game = Match(inputs=random_scripts(seed, 2, 300), seed=seed)
+        game.init_game(2, reset_scores=True)
+        game.run_headless(rounds=1, max_frames=300)
+        hashes.append(game.state_hash())
+    assert hashes[0] != hashes[1]
@@ -0,0 +1,47 @@
+import pytest
+
+from dreamrunner import Match, Replay, ReplayPlayer, ReplayRecorder, random_scripts
+
+FRAMES = 3000
+RESTART_FRAME = 1700
+
+@pytest.fixture(scope="module")
+def recording():
+    """Encoded replay of a seeded 3-player match restarted once, and the state hash after every frame"""
+    game = Match(inputs=random_scripts(5, 3, FRAMES), seed=5)
+    game.init_game(3, reset_scores=True)
+    game.recorder = ReplayRecorder(game.seed, 3, game.round_index)
+    hashes = []
+    for frame in range(FRAMES):
+        if frame == RESTART_FRAME:
+            game.recorder.mark_restart()
+            game.restart(reset_scores=False)
+        game.step()
+        hashes.append(game.state_hash())
+    return game.recorder.encode(), hashes
+
+def test_decode_round_trip(recording):
+    data, _ = recording
+    replay = Replay.decode(data)
+    assert (replay.num_players, replay.frame_count) == (3, FRAMES)
+    assert replay.restarts == {RESTART_FRAME}
+
+def test_play_matches_recording(recording):
+    data, hashes = recording
+    player = ReplayPlayer(Replay.decode(data))
+    player.play(0)
+    assert player.frame == FRAMES
+    assert player.game.state_hash() == hashes[-1]
+
+@pytest.mark.parametrize("targets", [(2500, 700), (RESTART_FRAME, 1200, 2999), (1, FRAMES)])
+def test_seek_matches_recording(recording, targets):
+    data, hashes = recording
+    player = ReplayPlayer(Replay.decode(data), keyframe_interval=300)
+    player.play(0)  # Leaves keyframes behind, so seeks restore one and simulate forward
+    for target in targets:
+        player.seek(target)
+        assert player.game.state_hash() == hashes[target - 1]
+
+def test_decode_rejects_other_files():
+    with pytest.raises(ValueError):
+        Replay.decode(b"NOPE" + bytes(64))
@@ -0,0 +1,9 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import swarm
+
+@pytest.mark.parametrize("num_players", [2, 3, 8])
+def test_vectorized_path_matches_scalar(num_players):
+    assert swarm.verify(num_players, 600, seed=2) is None
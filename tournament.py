@@ -0,0 +1,194 @@
+"""Self-play tournaments between bots, one headless match per pool task.
+
+Matches cycle through every assignment of the chosen bots to player slots, so each
+bot plays each slot equally often and mirror matches (one bot in every slot) are
+included. Round wins are then totalled per bot, per slot and per bot and slot. With
+every slot using the same bot, only spawn positions and slot order differ, so a slot
+that wins clearly more or less than its fair share points at unfairness in init_game
+or in the order players are updated.
+
+    python tournament.py --bots chaser keeper random --players 3 --matches 2000
+    python tournament.py --bots chaser --players 2 --matches 500 --json slots.json
+"""
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import time
+
+from bots import BOTS, load_bot
+from dreamrunner import FPS, MAX_PLAYERS, Match, make_rng
+from dreamrunner.constants import MAX_ROUND_TICKS
+
+Z_95 = 1.96
+
+def lineups(bots, num_players):
+    """Every assignment of bots to player slots"""
+    return list(itertools.product(bots, repeat=num_players))
+
+def match_jobs(bots, num_players, matches, rounds, seed):
+    assignments = lineups(bots, num_players)
+    for index in range(matches):
+        match_seed = make_rng(seed, 'tournament', index).randrange(2 ** 32)
+        yield index, assignments[index % len(assignments)], match_seed, rounds
+
+def play_match(job):
+    """Play one match; returns (lineup, round wins per slot, ties, timeouts, frames)"""
+    index, lineup, seed, rounds = job
+    bots = [load_bot(name)() for name in lineup]
+    for slot, bot in enumerate(bots):
+        if hasattr(bot, 'seed'):
+            bot.seed(seed, slot)
+    game = Match(inputs=bots, seed=seed)
+    game.init_game(len(lineup), reset_scores=True)
+    ties = timeouts = frames = 0
+    for _ in range(rounds):
+        # Match.update ends a round that reaches max_round_ticks as a tie
+        while not game.game_over:
+            game.update()
+            frames += 1
+        if game.winner == "Tie":
+            if game.score >= game.max_round_ticks:
+                timeouts += 1
+            else:
+                ties += 1
+        game.next_round()
+    return lineup, list(game.player_scores), ties, timeouts, frames
+
+class Tally:
+    """Round wins out of rounds played for one bot, slot or bot-and-slot pairing"""
+
+    def __init__(self):
+        self.wins = 0
+        self.rounds = 0
+
+    def add(self, wins, rounds):
+        self.wins += wins
+        self.rounds += rounds
+
+    def rate(self):
+        return self.wins / self.rounds if self.rounds else 0.0
+
+    def margin(self):
+        """Half-width of the 95% normal-approximation interval around rate()"""
+        p = self.rate()
+        return Z_95 * math.sqrt(p * (1 - p) / self.rounds) if self.rounds else 0.0
+
+    def to_dict(self):
+        return {"wins": self.wins, "rounds": self.rounds, "rate": self.rate(), "margin": self.margin()}
+
+class TournamentResults:
+    def __init__(self, bots, num_players, rounds):
+        self.num_players = num_players
+        self.rounds = rounds
+        self.matches = 0
+        self.ties = 0
+        self.timeouts = 0
+        self.frames = 0
+        self.by_bot = {bot: Tally() for bot in bots}
+        self.by_slot = [Tally() for _ in range(num_players)]
+        self.by_bot_slot = {(bot, slot): Tally() for bot in bots for slot in range(num_players)}
+
+    def add(self, lineup, wins, ties, timeouts, frames):
+        self.matches += 1
+        self.ties += ties
+        self.timeouts += timeouts
+        self.frames += frames
+        for slot, (bot, slot_wins) in enumerate(zip(lineup, wins)):
+            self.by_bot[bot].add(slot_wins, self.rounds)
+            self.by_slot[slot].add(slot_wins, self.rounds)
+            self.by_bot_slot[bot, slot].add(slot_wins, self.rounds)
+
+    def fair_share(self):
+        """Win rate every slot would have if slots were equal, after ties and timeouts"""
+        total_rounds = self.matches * self.rounds
+        decided = total_rounds - self.ties - self.timeouts
+        return decided / total_rounds / self.num_players if total_rounds else 0.0
+
+    def unfair_slots(self):
+        """Slots whose win rate is outside the 95% interval around the fair share"""
+        fair = self.fair_share()
+        rounds = self.matches * self.rounds
+        margin = Z_95 * math.sqrt(fair * (1 - fair) / rounds) if rounds else 0.0
+        return [slot for slot, tally in enumerate(self.by_slot) if abs(tally.rate() - fair) > margin]
+
+    def report(self):
+        rounds = self.matches * self.rounds
+        print(f"\n{self.matches} matches, {rounds} rounds: {self.ties} ties, {self.timeouts} timeouts "
+              f"(rounds over {MAX_ROUND_TICKS // FPS}s)")
+        fair = self.fair_share()
+        print(f"\n{'bot':<10} {'win rate':>14}")
+        for bot, tally in sorted(self.by_bot.items(), key=lambda item: -item[1].rate()):
+            print(f"{bot:<10} {tally.rate():>7.1%} ±{tally.margin():>5.1%}")
+        print(f"\n{'slot':<10} {'win rate':>14}   (fair share {fair:.1%})")
+        unfair = self.unfair_slots()
+        for slot, tally in enumerate(self.by_slot):
+            flag = "  outside 95% interval" if slot in unfair else ""
+            print(f"{'P' + str(slot + 1):<10} {tally.rate():>7.1%} ±{tally.margin():>5.1%}{flag}")
+        print(f"\n{'bot':<10} " + " ".join(f"{'P' + str(slot + 1):>7}" for slot in range(self.num_players)))
+        for bot in self.by_bot:
+            print(f"{bot:<10} " + " ".join(f"{self.by_bot_slot[bot, slot].rate():>7.1%}"
+                                           for slot in range(self.num_players)))
+
+    def to_dict(self):
+        return {
+            "players": self.num_players,
+            "matches": self.matches,
+            "rounds_per_match": self.rounds,
+            "ties": self.ties,
+            "timeouts": self.timeouts,
+            "fair_share": self.fair_share(),
+            "bots": {bot: tally.to_dict() for bot, tally in self.by_bot.items()},
+            "slots": [tally.to_dict() for tally in self.by_slot],
+            "bot_slots": {f"{bot}/P{slot + 1}": tally.to_dict() for (bot, slot), tally in self.by_bot_slot.items()},
+            "unfair_slots": [slot + 1 for slot in self.unfair_slots()],
+        }
+
+def run_tournament(bots, num_players=3, matches=1000, rounds=5, seed=0, workers=None, progress=True):
+    """Play matches across a process pool and return the aggregated TournamentResults"""
+    results = TournamentResults(bots, num_players, rounds)
+    jobs = match_jobs(bots, num_players, matches, rounds, seed)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    # Workers start fresh; they import only the simulation core, which loads no pygame
+    pool = multiprocessing.get_context("spawn").Pool(workers)
+    # One match per task keeps the workers evenly loaded when match lengths vary
+    for outcome in pool.imap_unordered(play_match, jobs, chunksize=1):
+        results.add(*outcome)
+        if progress and results.matches % max(1, matches // 10) == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{results.matches}/{matches} matches, {results.frames / elapsed:,.0f} ticks/s "
+                  f"on {workers} workers")
+    # Every match is done, so let the workers exit on their own
+    pool.close()
+    pool.join()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot self-play tournaments for Dream Runner")
+    parser.add_argument("--bots", nargs="+", default=list(BOTS),
+                        help=f"bot names ({', '.join(BOTS)}) or module:ClassName")
+    parser.add_argument("--players", type=int, default=3, choices=range(2, MAX_PLAYERS + 1), metavar="N")
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per match")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--json", metavar="FILE", help="save the aggregated results as JSON")
+    args = parser.parse_args()
+    for name in args.bots:
+        try:
+            load_bot(name)
+        except (ValueError, ImportError, AttributeError) as e:
+            parser.error(str(e))
+
+    results = run_tournament(args.bots, args.players, args.matches, args.rounds, args.seed, args.workers)
+    results.report()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results.to_dict(), f, indent=2)
+        print(f"Saved results to {args.json}")
+
+if __name__ == "__main__":
+    main()